@@ -0,0 +1,144 @@
+"""
+响应序列化基准测试
+在一份接近生产规模的一周排班上比较各编码路径的耗时和体积：
+
+- 请求体解析：标准库 json 与 orjson（三张 List[List[Any]] 基础数据表）
+- 响应编码：FastAPI 默认的 jsonable_encoder + json.dumps，与协商编码的 JSON / MessagePack
+- 压缩：gzip 与 brotli
+- 端到端：/scheduling/week 在不同 Accept / Accept-Encoding 下的 p50 / p99
+
+用法（在 src/backend 目录下）：
+    python -m benchmarks.serialization_benchmark --workers 3000 --positions 120 --weeks 1
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+os.environ.setdefault("EMPLOYEE_STORE_PATH", ":memory:")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from models import WeeklySchedulingResponse
+from router import encoding
+
+
+def build_request(workers: int, positions: int, weeks: int, seed: int = 0) -> Dict[str, Any]:
+    """生成一周排班请求：一个产品、positions 个岗位、workers 名员工的技能矩阵"""
+    rng = random.Random(seed)
+    codes = [f"GW{i:03d}" for i in range(positions)]
+    teams = ["东冷A", "东冷B", "底板A", "底板B", "总装A", "总装B"]
+    sku_data = [[f"列{i}" for i in range(18)]] + [
+        ["HL-20GP", "20尺标准箱", "", "总装", code] + [""] * 11 + [rng.randint(2, 6), "HL"]
+        for code in codes
+    ]
+    position_data = [[f"列{i}" for i in range(13)]] + [
+        ["", "", "总装", "", "", code] + [""] * 6 + [3] for code in codes
+    ]
+    skill_data = [["姓名", "工号", "班组"] + codes] + [
+        [f"员工{w:05d}", f"{100000 + w}", rng.choice(teams)]
+        + [rng.choice([0, 0, 2, 3, 4]) for _ in codes]
+        for w in range(workers)
+    ]
+    return {
+        "start_date": "2025/01/06",
+        "product_code": "HL-20GP",
+        "sku_data": sku_data,
+        "position_data": position_data,
+        "skill_data": skill_data,
+        "weeks": weeks,
+        "use_employee_status": False
+    }
+
+
+def timeit(fn: Callable[[], Any], repeat: int) -> List[float]:
+    """多次执行，返回每次耗时（毫秒）"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def report(name: str, samples: List[float], size: int = None):
+    size_text = f"{size / 1024:10.1f} KiB" if size is not None else " " * 14
+    print(f"  {name:<36}{statistics.median(samples):9.1f} ms  p99 {percentile(samples, 0.99):9.1f} ms{size_text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="响应序列化基准测试")
+    parser.add_argument("--workers", type=int, default=3000)
+    parser.add_argument("--positions", type=int, default=120)
+    parser.add_argument("--weeks", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--e2e-repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    from main import app
+    client = TestClient(app)
+
+    request = build_request(args.workers, args.positions, args.weeks)
+    body = json.dumps(request, ensure_ascii=False).encode("utf-8")
+    print(f"请求体 {len(body) / 1024:.1f} KiB（{args.workers} 人 × {args.positions} 岗位，{args.weeks} 周）")
+    print(f"可选依赖: orjson={encoding.orjson is not None} msgpack={encoding.msgpack is not None} "
+          f"brotli={encoding.brotli is not None}")
+
+    print("请求体解析")
+    report("json.loads", timeit(lambda: json.loads(body), args.repeat))
+    report("decode_json", timeit(lambda: encoding.decode_json(body), args.repeat))
+
+    headers = {"content-type": "application/json", "accept-encoding": "identity"}
+    response = client.post("/scheduling/week", content=body, headers=headers)
+    response.raise_for_status()
+    schedule = WeeklySchedulingResponse.model_validate(response.json())
+
+    print("响应编码")
+    legacy = json.dumps(jsonable_encoder(schedule), ensure_ascii=False).encode("utf-8")
+    report("jsonable_encoder + json.dumps",
+           timeit(lambda: json.dumps(jsonable_encoder(schedule), ensure_ascii=False).encode("utf-8"), args.repeat),
+           len(legacy))
+    encoded = encoding.encode_json(schedule)
+    report("encode_json", timeit(lambda: encoding.encode_json(schedule), args.repeat), len(encoded))
+    if encoding.msgpack is not None:
+        packed = encoding.encode_msgpack(schedule)
+        report("encode_msgpack", timeit(lambda: encoding.encode_msgpack(schedule), args.repeat), len(packed))
+
+    print("压缩（JSON 响应体）")
+    report("gzip", timeit(lambda: encoding.compress(encoded, "gzip"), args.repeat),
+           len(encoding.compress(encoded, "gzip")))
+    if encoding.brotli is not None:
+        report("brotli", timeit(lambda: encoding.compress(encoded, "br"), args.repeat),
+               len(encoding.compress(encoded, "br")))
+
+    print("端到端 /scheduling/week（含排班计算）")
+    variants = [("json", "application/json", "identity"), ("json + gzip", "application/json", "gzip")]
+    if encoding.brotli is not None:
+        variants.append(("json + br", "application/json", "br"))
+    if encoding.msgpack is not None:
+        variants.append(("msgpack", "application/msgpack", "identity"))
+        variants.append(("msgpack + gzip", "application/msgpack", "gzip"))
+    for name, accept, accept_encoding in variants:
+        variant_headers = {"content-type": "application/json", "accept": accept, "accept-encoding": accept_encoding}
+        sizes = []
+
+        def call():
+            with client.stream("POST", "/scheduling/week", content=body, headers=variant_headers) as r:
+                r.read()
+                sizes.append(r.num_bytes_downloaded)
+
+        report(name, timeit(call, args.e2e_repeat), sizes[-1])
+
+
+if __name__ == "__main__":
+    main()
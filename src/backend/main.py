@@ -3,12 +3,14 @@ FastAPI主服务
 提供排班和排产的API接口
 """
 
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
-
-from models import EmployeeStatusRecord
 from tools import SchedulingEngine, ProductionSchedulingEngine
+from tools.executor import EngineExecutor
+from tools.parallel import init_shared_pool, shutdown_shared_pool
+from storage import DatasetStore, EmployeeStatusStore
 
 # 导入路由模块
 from router import base, scheduling, production, employee, utils
@@ -32,16 +34,33 @@ app.add_middleware(
 scheduling_engine = SchedulingEngine()
 production_engine = ProductionSchedulingEngine()
 
-# 全局变量存储员工状态记录（实际应用中应使用数据库）
-employee_status_records: List[EmployeeStatusRecord] = []
+# 引擎执行器：CPU密集型的引擎调用在线程池/进程池中执行，不阻塞事件循环
+# ENGINE_EXECUTOR_MODE: thread | process；ENGINE_EXECUTOR_WORKERS: 并发数；ENGINE_EXECUTOR_MAX_QUEUE: 最大排队数
+engine_executor = EngineExecutor(
+    engines={"scheduling": scheduling_engine, "production": production_engine},
+    mode=os.getenv("ENGINE_EXECUTOR_MODE", "thread"),
+    max_workers=int(os.getenv("ENGINE_EXECUTOR_WORKERS", "4")),
+    max_queue=int(os.getenv("ENGINE_EXECUTOR_MAX_QUEUE", "32"))
+)
+
+# 方案评估、排产排班集成等并行计算共用的进程池（按需创建）；PARALLEL_MAX_WORKERS: 最大进程数，默认且不超过CPU核数
+init_shared_pool(int(os.getenv("PARALLEL_MAX_WORKERS", str(os.cpu_count() or 1))))
+
+# 已解析数据集的LRU缓存，排班接口可通过dataset_id引用
+dataset_store = DatasetStore(max_datasets=8)
+
+# 员工状态记录存储（SQLite）；EMPLOYEE_STORE_PATH: 数据库文件路径，":memory:" 表示不持久化
+employee_store = EmployeeStatusStore(os.getenv("EMPLOYEE_STORE_PATH", "data/employee_status.sqlite3"))
 
 # 初始化各个路由模块的引擎
+base.init_scheduling_engine(scheduling_engine)
+base.init_dataset_store(dataset_store)
+base.init_engine_executor(engine_executor)
 scheduling.init_scheduling_engine(scheduling_engine)
+scheduling.init_employee_store(employee_store)
 production.init_production_engine(production_engine)
 utils.init_scheduling_engine(scheduling_engine)
-
-# 设置员工状态记录到员工模块
-employee.set_employee_records(employee_status_records)
+employee.init_employee_store(employee_store)
 
 # 注册路由
 app.include_router(base.router, tags=["基础功能"])
@@ -52,6 +71,13 @@ app.include_router(employee.workforce_router, tags=["人员分析"])
 app.include_router(utils.router, tags=["工具算法"])
 app.include_router(utils.data_router, tags=["数据验证"])
 
+@app.on_event("shutdown")
+def shutdown_engine_executor():
+    """关闭引擎执行器、共享进程池和员工状态存储"""
+    engine_executor.shutdown(wait=False)
+    shutdown_shared_pool(wait=False)
+    employee_store.close()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -28,8 +28,13 @@ from .scheduling import (
     PerformanceMetrics,
     SchedulingRequest,
     WeeklySchedulingRequest,
+    RosterRequest,
+    LeaveBatchRequest,
     SchedulingResponse,
-    WeeklySchedulingResponse
+    WeeklySchedulingResponse,
+    RosterDay,
+    PositionGroupDiff,
+    LeaveBatchResponse
 )
 
 # 排产相关模型
@@ -86,8 +91,13 @@ __all__ = [
     "PerformanceMetrics",
     "SchedulingRequest",
     "WeeklySchedulingRequest",
+    "RosterRequest",
+    "LeaveBatchRequest",
     "SchedulingResponse",
     "WeeklySchedulingResponse",
+    "RosterDay",
+    "PositionGroupDiff",
+    "LeaveBatchResponse",
     
     # 排产相关模型
     "CustomerOrder",
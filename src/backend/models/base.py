@@ -37,6 +37,7 @@ class SkillMatrixData(BaseModel):
 # 文件上传响应
 class FileUploadResponse(BaseModel):
     message: str
+    dataset_id: str
     sku_rows: int
     position_rows: int
     skill_rows: int
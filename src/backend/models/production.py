@@ -3,9 +3,9 @@
 包含生产计划、产能优化、订单管理等相关的数据模型
 """
 
-from typing import List, Dict, Optional, Any
-from pydantic import BaseModel
-from .scheduling import SchedulingResponse
+from typing import List, Dict, Optional, Any, Literal
+from pydantic import BaseModel, Field
+from .scheduling import SchedulingResponse, SolverMode
 
 # 客户订单模型
 class CustomerOrder(BaseModel):
@@ -61,6 +61,13 @@ class MultiPlanProductionRequest(BaseModel):
         "capacity_decrease_saving": 30.0,  # 产能减少每单位节省
         "delay_penalty": 200.0  # 延误每天每单位罚金
     }
+    evaluation_workers: int = Field(0, ge=0)  # 并行评估方案的进程数（不超过共享进程池大小），0或1为串行
+    plan_mode: Literal["preset", "search"] = "preset"  # 'preset' 预置六种方案 | 'search' 搜索 Pareto 方案
+    search_time_budget: float = Field(2.0, gt=0, le=60)  # 搜索时间预算（秒）
+    search_max_plans: int = Field(10, gt=0, le=100)  # 返回的搜索方案数上限
+    search_levels: Optional[List[int]] = None  # 可选产能档位，默认取基准产能±浮动范围内的配置档位
+    search_seed: int = 0
+    score_weights: Optional[Dict[str, float]] = None  # 推荐方案评分权重（cost/completion/utilization），默认 0.4/0.3/0.3
 
 # 多方案排产响应
 class MultiPlanProductionResponse(BaseModel):
@@ -73,8 +80,13 @@ class MultiPlanProductionResponse(BaseModel):
 class ProductionToSchedulingRequest(BaseModel):
     selected_plan_id: str
     production_schedule: Dict[str, List[ProductionScheduleResult]]  # 日期 -> 排产结果
-    position_data: List[List[Any]]
-    skill_data: List[List[Any]]
+    sku_data: List[List[Any]] = []  # 产品工艺路线
+    position_data: List[List[Any]] = []
+    skill_data: List[List[Any]] = []
+    dataset_id: Optional[str] = None  # 使用服务端缓存的数据集
+    solver: SolverMode = "greedy"
+    scheduling_workers: int = Field(0, ge=0)  # >1 时各天在共享进程池中并行排班（进程数不超过进程池大小）
+    reference_quantity: Optional[int] = Field(None, gt=0)  # SKU表需求人数对应的日产量；指定时各天岗位需求按排产数量换算，否则当天生产的产品按SKU表需求人数计
     
 class ProductionToSchedulingResponse(BaseModel):
     daily_schedules: Dict[str, SchedulingResponse]  # 日期 -> 排班结果
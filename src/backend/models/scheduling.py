@@ -3,8 +3,8 @@
 包含排班算法、岗位管理、性能分析等相关的数据模型
 """
 
-from typing import List, Dict, Optional, Any
-from pydantic import BaseModel
+from typing import List, Dict, Optional, Any, Literal
+from pydantic import BaseModel, Field
 from .base import SchedulingResult
 
 class PositionGroup(BaseModel):
@@ -51,15 +51,21 @@ class TrainingPlan(BaseModel):
 class LeaveInfo(BaseModel):
     工号: str
     姓名: str
-    请假日期: str
+    请假日期: str  # 开始日期，支持 2025/01/06 或 2025-01-06
     请假类型: str
+    结束日期: Optional[str] = None  # 连续请假的最后一天，为空时只请 请假日期 当天
+    请假时长: Optional[float] = None
+    影响岗位: List[str] = []  # 为空时按排班结果中该员工所在岗位确定
+    紧急程度: Optional[str] = None
 
 class AdjustmentSuggestion(BaseModel):
-    类型: str
-    岗位编码: str
-    建议内容: str
-    影响评估: Dict[str, Any]
+    调整类型: str  # '班组内调整' | '跨班组调整' | '加班补偿'
+    原岗位: str
+    调整人员: List[Dict[str, Any]]
+    效率影响: Dict[str, Any]
+    制造周期影响: Dict[str, Any]
     实施建议: str
+    优先级: int
 
 class TeamWorkload(BaseModel):
     班组: str
@@ -75,20 +81,65 @@ class PerformanceMetrics(BaseModel):
     工时利用率: Dict[str, Any]
 
 # API 请求模型
+# 提供 dataset_id 时使用服务端缓存的数据集，无需再传三张数据表
+# 取值受限的字段在请求校验阶段检查，不合法时返回 422
+
+# 排班求解模式：'greedy' 贪心 | 'optimal' 全局最优指派
+SolverMode = Literal["greedy", "optimal"]
+
+# 单次请求最多排班的周数
+MAX_SCHEDULING_WEEKS = 12
+
 class SchedulingRequest(BaseModel):
     target_date: str
-    product_code: str
-    sku_data: List[List[Any]]
-    position_data: List[List[Any]]
-    skill_data: List[List[Any]]
+    product_code: str = ""
+    product_mix: Optional[Dict[str, int]] = None  # 当天产品组合（产成品编码 -> 生产数量），提供时忽略 product_code
+    mix_mode: Literal["sum", "shared"] = "sum"  # 'sum' 各产品分别配置人员 | 'shared' 各产品分时共用岗位（取最大需求）
+    reference_quantity: Optional[int] = Field(None, gt=0)  # SKU表需求人数对应的日产量；指定时产品组合的岗位需求按生产数量换算，否则按SKU表需求人数计
+    sku_data: List[List[Any]] = []
+    position_data: List[List[Any]] = []
+    skill_data: List[List[Any]] = []
+    dataset_id: Optional[str] = None
     weekly_assigned_workers: Optional[List[str]] = None
+    solver: SolverMode = "greedy"
+    leaves: List[LeaveInfo] = []  # 请假信息，当天请假的员工不参与排班
+    use_employee_status: bool = False  # 为 True 时排除员工状态记录中当天请假/休息/辞职的员工
 
 class WeeklySchedulingRequest(BaseModel):
     start_date: str
     product_code: str
-    sku_data: List[List[Any]]
-    position_data: List[List[Any]]
-    skill_data: List[List[Any]]
+    sku_data: List[List[Any]] = []
+    position_data: List[List[Any]] = []
+    skill_data: List[List[Any]] = []
+    dataset_id: Optional[str] = None
+    solver: SolverMode = "greedy"
+    weeks: int = Field(1, ge=1, le=MAX_SCHEDULING_WEEKS)  # 排班周数，从 start_date 所在周的周一开始
+    leaves: List[LeaveInfo] = []  # 请假信息，请假当天的员工不参与排班
+    use_employee_status: bool = False  # 为 True 时排除员工状态记录中请假/休息/辞职的员工
+
+class RosterRequest(BaseModel):
+    start_date: str
+    product_code: str
+    sku_data: List[List[Any]] = []
+    position_data: List[List[Any]] = []
+    skill_data: List[List[Any]] = []
+    dataset_id: Optional[str] = None
+    solver: SolverMode = "greedy"
+    horizon: Literal["week", "month"] = "week"  # 'week' 从 start_date 所在周起排 weeks 周 | 'month' 排 start_date 所在自然月
+    weeks: int = Field(4, ge=1, le=MAX_SCHEDULING_WEEKS)
+    replan_from: Optional[str] = None  # 只重排该日期及之后的日期
+    carry_assigned_workers: List[str] = []  # replan_from 所在周此前已排班的员工（取自此前各天的 assigned_workers）
+    leaves: List[LeaveInfo] = []  # 请假信息，请假当天的员工不参与排班
+    use_employee_status: bool = False  # 为 True 时排除员工状态记录中请假/休息/辞职的员工
+
+class LeaveBatchRequest(BaseModel):
+    current_date: str
+    leaves: List[LeaveInfo]
+    groups: List[PositionGroup]  # 当天已有的排班（岗位组）
+    skill_data: List[List[Any]] = []
+    dataset_id: Optional[str] = None  # 提供时使用数据集中的技能矩阵
+    excluded_workers: List[str] = []  # 不可调入的员工（如本周其他日期已排班的员工）
+    use_employee_status: bool = False  # 为 True 时同时考虑员工状态记录中当天请假/休息/辞职的员工
 
 # API 响应模型
 class SchedulingResponse(BaseModel):
@@ -99,3 +150,25 @@ class SchedulingResponse(BaseModel):
 class WeeklySchedulingResponse(BaseModel):
     weekly_schedule: Dict[str, SchedulingResponse]
     summary: Dict[str, Any]
+
+class RosterDay(BaseModel):
+    date: str
+    week_start: str
+    schedule: SchedulingResponse
+    assigned_workers: List[str]  # 当天新排班的员工，重排时用于计算 carry_assigned_workers
+
+class PositionGroupDiff(BaseModel):
+    岗位编码: str
+    班组: str
+    需求人数: int
+    原已排人数: int
+    已排人数: int
+    移除人员: List[SchedulingResult]
+    新增人员: List[SchedulingResult]
+    缺口: int
+
+class LeaveBatchResponse(BaseModel):
+    groups: List[PositionGroup]  # 修补后的全部岗位组（未受影响的岗位原样返回）
+    diff: List[PositionGroupDiff]  # 受影响岗位的变更明细
+    adjustment_suggestions: List[AdjustmentSuggestion]
+    summary: Dict[str, Any]
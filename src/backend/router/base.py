@@ -6,29 +6,75 @@
 from fastapi import APIRouter, File, UploadFile, HTTPException
 from typing import List, Any
 import pandas as pd
-import io
 from datetime import datetime
 
-router = APIRouter()
+from storage import DatasetStore, compute_dataset_id
+from tools import SchedulingEngine, ParsedDataset
+from tools.executor import EngineExecutor, EngineBusyError, EngineSlot
+from tools.ingest import frame_to_rows
+from .encoding import EncodedRoute
 
-async def process_excel_file(file: UploadFile) -> List[List[Any]]:
-    """处理上传的Excel文件"""
+router = APIRouter(route_class=EncodedRoute)
+
+# 排班算法引擎、数据集存储和引擎执行器 - 将在主应用中注入
+scheduling_engine: SchedulingEngine = None
+dataset_store: DatasetStore = None
+engine_executor: EngineExecutor = None
+
+def init_scheduling_engine(engine: SchedulingEngine):
+    """初始化排班引擎"""
+    global scheduling_engine
+    scheduling_engine = engine
+
+def init_dataset_store(store: DatasetStore):
+    """初始化数据集存储"""
+    global dataset_store
+    dataset_store = store
+
+def init_engine_executor(executor: EngineExecutor):
+    """初始化引擎执行器"""
+    global engine_executor
+    engine_executor = executor
+
+async def run_engine(engine_name: str, method: str, *args, **kwargs) -> Any:
+    """在引擎执行器中调用引擎方法，排队已满时返回503"""
+    if engine_executor is None:
+        raise RuntimeError("引擎执行器未初始化")
     try:
-        contents = await file.read()
-        df = pd.read_excel(io.BytesIO(contents))
-        
-        # 转换为列表格式
-        data = []
-        # 添加列标题
-        data.append(df.columns.tolist())
-        # 添加数据行
-        for _, row in df.iterrows():
-            data.append(row.tolist())
-        
-        return data
+        return await engine_executor.run(engine_name, method, *args, **kwargs)
+    except EngineBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+async def acquire_engine_slot() -> EngineSlot:
+    """为流式响应占用一个引擎执行器名额（流结束时释放），排队已满时返回503"""
+    if engine_executor is None:
+        raise RuntimeError("引擎执行器未初始化")
+    try:
+        return await engine_executor.acquire_slot()
+    except EngineBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+def resolve_dataset(dataset_id: str) -> ParsedDataset:
+    """根据数据集ID获取已解析的数据集"""
+    dataset = dataset_store.get(dataset_id) if dataset_store else None
+    if dataset is None:
+        raise HTTPException(status_code=404, detail=f"数据集 {dataset_id} 不存在或已过期，请重新上传")
+    return dataset
+
+async def parse_excel_contents(contents: List[bytes]) -> List[pd.DataFrame]:
+    """在引擎执行器中解析Excel文件内容，避免阻塞事件循环"""
+    try:
+        return await run_engine("scheduling", "read_excel_frames", contents)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"文件处理失败: {str(e)}")
 
+async def process_excel_file(file: UploadFile) -> List[List[Any]]:
+    """处理上传的Excel文件"""
+    frames = await parse_excel_contents([await file.read()])
+    return frame_to_rows(frames[0])
+
 @router.get("/")
 async def root():
     """健康检查"""
@@ -43,35 +89,75 @@ async def health_check():
         "services": {
             "scheduling_engine": "ready",
             "production_engine": "ready"
-        }
+        },
+        "executor": engine_executor.metrics() if engine_executor else None
     }
 
 @router.post("/upload/excel")
 async def upload_excel_files(
     sku_file: UploadFile = File(...),
     position_file: UploadFile = File(...),
-    skill_file: UploadFile = File(...)
+    skill_file: UploadFile = File(...),
+    include_rows: bool = True
 ):
-    """上传并处理Excel文件"""
+    """上传并处理Excel文件，返回可供排班接口引用的数据集ID"""
     try:
         # 验证文件类型
         for file in [sku_file, position_file, skill_file]:
             if not file.filename.endswith(('.xlsx', '.xls')):
                 raise HTTPException(status_code=400, detail=f"文件 {file.filename} 不是Excel格式")
         
-        # 处理文件
-        sku_data = await process_excel_file(sku_file)
-        position_data = await process_excel_file(position_file)
-        skill_data = await process_excel_file(skill_file)
+        contents = [await file.read() for file in [sku_file, position_file, skill_file]]
+        dataset_id = compute_dataset_id(contents)
+        dataset = dataset_store.get(dataset_id)
+        
+        # 相同内容已缓存且不需要返回原始数据时，跳过Excel解析
+        if dataset is not None and not include_rows:
+            summary = dataset.summary()
+            return {
+                "message": "数据集已存在，直接复用",
+                "dataset_id": dataset_id,
+                "sku_rows": summary["sku_records"],
+                "position_rows": summary["position_records"],
+                "skill_rows": summary["skill_records"],
+                "sku_data": [],
+                "position_data": [],
+                "skill_data": []
+            }
+        
+        # 处理文件（列式解析，数据集直接由DataFrame构建）
+        sku_frame, position_frame, skill_frame = await parse_excel_contents(contents)
+        
+        if dataset is None:
+            dataset = await run_engine(
+                "scheduling", "build_dataset_from_frames",
+                sku_frame, position_frame, skill_frame, dataset_id=dataset_id
+            )
+            dataset_store.put(dataset)
         
         return {
             "message": "文件上传成功",
-            "sku_rows": len(sku_data),
-            "position_rows": len(position_data),
-            "skill_rows": len(skill_data),
-            "sku_data": sku_data,
-            "position_data": position_data,
-            "skill_data": skill_data
+            "dataset_id": dataset_id,
+            "sku_rows": len(sku_frame) + 1,
+            "position_rows": len(position_frame) + 1,
+            "skill_rows": len(skill_frame) + 1,
+            "sku_data": frame_to_rows(sku_frame) if include_rows else [],
+            "position_data": frame_to_rows(position_frame) if include_rows else [],
+            "skill_data": frame_to_rows(skill_frame) if include_rows else []
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"文件上传失败: {str(e)}")
+
+@router.get("/datasets/{dataset_id}")
+async def get_dataset_info(dataset_id: str):
+    """查询服务端缓存的数据集"""
+    return resolve_dataset(dataset_id).summary()
+
+@router.delete("/datasets/{dataset_id}")
+async def delete_dataset(dataset_id: str):
+    """删除服务端缓存的数据集"""
+    if not dataset_store.remove(dataset_id):
+        raise HTTPException(status_code=404, detail=f"数据集 {dataset_id} 不存在")
+    return {"success": True, "message": "数据集删除成功"}
@@ -4,7 +4,7 @@
 """
 
 from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime, date
 import uuid
 
@@ -13,21 +13,32 @@ from models import (
     EmployeeStatusType, ShiftType, ShiftAdjustmentSuggestion, CurrentWorkforceStatus,
     TeamEfficiencyAnalysis, WorkforceAnalysisResponse, PositionGroup
 )
+from storage import EmployeeStatusStore
+from tools.availability import AvailabilityIndex
+from .encoding import EncodedRoute
 
 # 创建路由器
-router = APIRouter(prefix="/employee-status", tags=["员工管理"])
+router = APIRouter(prefix="/employee-status", tags=["员工管理"], route_class=EncodedRoute)
 
-# 全局变量存储员工状态记录（实际应用中应使用数据库）
-employee_status_records: List[EmployeeStatusRecord] = []
+# 列表接口分页：传入分页参数时的默认每页条数和上限
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
 
-def get_employee_records():
-    """获取员工状态记录"""
-    return employee_status_records
+# 员工状态记录存储 - 将在主应用中注入
+employee_store: EmployeeStatusStore = None
+
+def init_employee_store(store: EmployeeStatusStore):
+    """初始化员工状态存储"""
+    global employee_store
+    employee_store = store
+
+def get_employee_records() -> List[EmployeeStatusRecord]:
+    """获取全部员工状态记录"""
+    return employee_store.all()
 
 def set_employee_records(records: List[EmployeeStatusRecord]):
-    """设置员工状态记录"""
-    global employee_status_records
-    employee_status_records = records
+    """设置员工状态记录（覆盖已有记录）"""
+    employee_store.replace_all(records)
 
 @router.post("/add")
 async def add_employee_status(request: EmployeeStatusRequest):
@@ -48,7 +59,7 @@ async def add_employee_status(request: EmployeeStatusRequest):
             created_by="系统管理员"
         )
         
-        employee_status_records.append(record)
+        employee_store.add(record)
         
         return {
             "success": True,
@@ -63,50 +74,70 @@ async def get_employee_status_list(
     status_type: Optional[str] = None,
     shift_type: Optional[str] = None,
     team: Optional[str] = None,
-    employee_id: Optional[str] = None
+    employee_id: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    page: Optional[int] = None,
+    page_size: Optional[int] = None
 ):
-    """获取员工状态记录列表"""
+    """获取员工状态记录列表
+
+    start_date/end_date 筛选有效期与该区间有交集的记录；结果按创建时间倒序排列，统计信息覆盖全部筛选结果。
+    未传 page/page_size 时返回全部记录；传入任一分页参数时分页返回（page 默认 1，page_size 默认 100）。
+    """
     try:
-        # 过滤记录
-        filtered_records = employee_status_records.copy()
-        
-        if status_type and status_type != "全部":
-            filtered_records = [r for r in filtered_records if r.status_type == status_type]
-        
-        if shift_type and shift_type != "全部":
-            filtered_records = [r for r in filtered_records if r.shift_type == shift_type]
-            
-        if team and team != "全部":
-            filtered_records = [r for r in filtered_records if r.team == team]
-            
-        if employee_id:
-            filtered_records = [r for r in filtered_records if employee_id.lower() in r.employee_id.lower()]
-        
-        # 按创建时间倒序排列
-        filtered_records.sort(key=lambda x: x.created_at or "", reverse=True)
-        
-        # 计算统计信息
-        total_records = len(filtered_records)
-        leave_count = len([r for r in filtered_records if r.status_type == EmployeeStatusType.LEAVE])
-        resignation_count = len([r for r in filtered_records if r.status_type == EmployeeStatusType.RESIGNATION])
-        rest_count = len([r for r in filtered_records if r.status_type == EmployeeStatusType.REST])
-        
-        day_shift_count = len([r for r in filtered_records if r.shift_type == ShiftType.DAY_SHIFT])
-        night_shift_count = len([r for r in filtered_records if r.shift_type == ShiftType.NIGHT_SHIFT])
+        paged = page is not None or page_size is not None
+        page = 1 if page is None else page
+        page_size = DEFAULT_PAGE_SIZE if page_size is None else page_size
+        if page < 1 or page_size < 1 or page_size > MAX_PAGE_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"分页参数无效：page >= 1，1 <= page_size <= {MAX_PAGE_SIZE}"
+            )
+        
+        filters = {
+            "status_type": status_type,
+            "shift_type": shift_type,
+            "team": team,
+            "employee_id": employee_id,
+            "start_date": start_date,
+            "end_date": end_date
+        }
+        if paged:
+            filtered_records = employee_store.query(offset=(page - 1) * page_size, limit=page_size, **filters)
+        else:
+            filtered_records = employee_store.query(**filters)
+        
+        # 计算统计信息（一次分组查询）
+        status_counts: Dict[str, int] = {}
+        shift_counts: Dict[str, int] = {}
+        total_records = 0
+        for row in employee_store.grouped_counts(("status_type", "shift_type"), **filters):
+            status_counts[row["status_type"]] = status_counts.get(row["status_type"], 0) + row["count"]
+            shift_counts[row["shift_type"]] = shift_counts.get(row["shift_type"], 0) + row["count"]
+            total_records += row["count"]
         
         # 获取筛选选项
-        all_teams = list(set([r.team for r in employee_status_records if r.team]))
+        all_teams = employee_store.teams()
         all_status_types = [e.value for e in EmployeeStatusType]
         all_shift_types = [e.value for e in ShiftType]
         
         summary = {
             "total_records": total_records,
-            "leave_count": leave_count,
-            "resignation_count": resignation_count,
-            "rest_count": rest_count,
-            "day_shift_count": day_shift_count,
-            "night_shift_count": night_shift_count
+            "leave_count": status_counts.get(EmployeeStatusType.LEAVE.value, 0),
+            "resignation_count": status_counts.get(EmployeeStatusType.RESIGNATION.value, 0),
+            "rest_count": status_counts.get(EmployeeStatusType.REST.value, 0),
+            "day_shift_count": shift_counts.get(ShiftType.DAY_SHIFT.value, 0),
+            "night_shift_count": shift_counts.get(ShiftType.NIGHT_SHIFT.value, 0),
         }
+        if paged:
+            summary.update(
+                page=page,
+                page_size=page_size,
+                total_pages=(total_records + page_size - 1) // page_size
+            )
+        else:
+            summary.update(page=1, page_size=total_records, total_pages=1 if total_records else 0)
         
         filter_options = {
             "teams": all_teams,
@@ -119,6 +150,8 @@ async def get_employee_status_list(
             summary=summary,
             filter_options=filter_options
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取员工状态记录失败: {str(e)}")
 
@@ -126,13 +159,7 @@ async def get_employee_status_list(
 async def delete_employee_status(record_id: str):
     """删除员工状态记录"""
     try:
-        global employee_status_records
-        
-        # 查找并删除记录
-        original_count = len(employee_status_records)
-        employee_status_records = [r for r in employee_status_records if r.id != record_id]
-        
-        if len(employee_status_records) == original_count:
+        if not employee_store.delete(record_id):
             raise HTTPException(status_code=404, detail="未找到指定的员工状态记录")
         
         return {
@@ -178,7 +205,7 @@ async def get_available_employees():
 
 
 # 创建人员分析路由器
-workforce_router = APIRouter(prefix="/workforce", tags=["人员分析"])
+workforce_router = APIRouter(prefix="/workforce", tags=["人员分析"], route_class=EncodedRoute)
 
 @workforce_router.post("/analysis", response_model=WorkforceAnalysisResponse)
 async def analyze_workforce_status(
@@ -191,8 +218,13 @@ async def analyze_workforce_status(
         if not target_date:
             target_date = datetime.now().strftime("%Y-%m-%d")
         
-        # 使用传入的员工状态记录，如果没有则使用全局变量
-        records_to_use = employee_status_records_input if employee_status_records_input else employee_status_records
+        # 使用传入的员工状态记录，如果没有则使用已保存的记录；只统计目标日期当天生效的记录
+        if employee_status_records_input:
+            records_to_use = AvailabilityIndex.build(
+                status_records=employee_status_records_input
+            ).records_on(target_date)
+        else:
+            records_to_use = employee_store.query(start_date=target_date, end_date=target_date)
         
         # 分析当前人员状态
         current_status = _analyze_current_workforce_status(position_groups, records_to_use, target_date)
@@ -223,8 +255,9 @@ async def analyze_workforce_status(
 async def get_quick_workforce_status():
     """获取人员状态快速概览"""
     try:
-        # 基于实际的员工状态记录计算快速状态
-        if not employee_status_records:
+        # 基于实际的员工状态记录计算快速状态（按班组、班次、状态一次分组统计）
+        grouped_counts = employee_store.grouped_counts(("team", "shift_type", "status_type"))
+        if not grouped_counts:
             return {
                 "总体状况": {
                     "总人数": 0,
@@ -241,11 +274,13 @@ async def get_quick_workforce_status():
         # 统计各班组的状况
         team_stats = {}
         total_employees = 0
+        status_totals: Dict[str, int] = {}
         
-        # 从员工状态记录中统计
-        for record in employee_status_records:
-            team = record.team
-            shift = record.shift_type.value if hasattr(record.shift_type, 'value') else record.shift_type
+        for row in grouped_counts:
+            team = row["team"]
+            shift = row["shift_type"]
+            status = row["status_type"]
+            count = row["count"]
             
             if team not in team_stats:
                 team_stats[team] = {
@@ -258,19 +293,19 @@ async def get_quick_workforce_status():
             
             # 增加总数
             if shift == "白班":
-                team_stats[team]["白班总数"] += 1
+                team_stats[team]["白班总数"] += count
             else:
-                team_stats[team]["夜班总数"] += 1
+                team_stats[team]["夜班总数"] += count
             
-            total_employees += 1
+            total_employees += count
+            status_totals[status] = status_totals.get(status, 0) + count
             
             # 如果是请假、辞职或休息，则减少在岗人数
-            status = record.status_type.value if hasattr(record.status_type, 'value') else record.status_type
             if status not in ["请假", "辞职", "休息"]:
                 if shift == "白班":
-                    team_stats[team]["白班在岗"] += 1
+                    team_stats[team]["白班在岗"] += count
                 else:
-                    team_stats[team]["夜班在岗"] += 1
+                    team_stats[team]["夜班在岗"] += count
         
         # 假设有一些基础员工（如果没有记录的话）
         if not team_stats:
@@ -308,10 +343,8 @@ async def get_quick_workforce_status():
         
         # 检查紧急情况
         emergency_situations = []
-        leave_count = len([r for r in employee_status_records if 
-                          (r.status_type.value if hasattr(r.status_type, 'value') else r.status_type) == "请假"])
-        resignation_count = len([r for r in employee_status_records if 
-                               (r.status_type.value if hasattr(r.status_type, 'value') else r.status_type) == "辞职"])
+        leave_count = status_totals.get("请假", 0)
+        resignation_count = status_totals.get("辞职", 0)
         
         if attendance_rate < 0.7:
             emergency_situations.append("整体出勤率偏低")
@@ -0,0 +1,258 @@
+"""
+响应编码模块
+按 Accept 头协商响应编码（JSON 或 MessagePack），较大的响应体按 Accept-Encoding 压缩（brotli 优先，其次 gzip），
+JSON 请求体用 orjson 解析。
+
+端点返回值不再经过 FastAPI 的 jsonable_encoder：pydantic 模型直接由 pydantic-core 序列化，
+其他对象用 orjson 编码。orjson、msgpack、brotli 已列入 requirements.txt，未安装时分别回退到标准库 json、
+只返回 JSON、只使用 gzip。
+"""
+
+import functools
+import gzip
+import inspect
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from fastapi import Request
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import Response, StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # 可选依赖
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:  # 可选依赖
+    brotli = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+# 小于该大小的响应体不压缩（压缩收益抵不过开销）
+COMPRESS_MIN_BYTES = 16 * 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 5
+
+
+# ---- 编解码 ----
+
+def _to_builtin(obj: Any) -> Any:
+    """编码器无法直接处理的对象 -> 内置类型（orjson/json/msgpack 的 default 钩子）"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(by_alias=True)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return str(obj)
+
+
+def encode_json(content: Any) -> bytes:
+    """编码为 UTF-8 JSON（中文不转义）"""
+    if isinstance(content, BaseModel):
+        return content.model_dump_json(by_alias=True).encode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(
+            content, default=_to_builtin, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(content, ensure_ascii=False, default=_to_builtin).encode("utf-8")
+
+
+def decode_json(body: bytes) -> Any:
+    """解析 JSON 请求体（解析失败时抛出 json.JSONDecodeError 或其子类）"""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def encode_msgpack(content: Any) -> bytes:
+    """编码为 MessagePack（需要安装 msgpack）"""
+    if msgpack is None:
+        raise RuntimeError("未安装 msgpack，无法使用 MessagePack 编码")
+    if isinstance(content, BaseModel):
+        content = content.model_dump(mode="json", by_alias=True)
+    return msgpack.packb(content, default=_to_builtin, use_bin_type=True)
+
+
+# ---- 协商 ----
+
+def _parse_quality(header: Optional[str]) -> Dict[str, float]:
+    """解析 Accept / Accept-Encoding 头：取值 -> q 值"""
+    qualities: Dict[str, float] = {}
+    for part in (header or "").split(","):
+        value, *params = [p.strip() for p in part.split(";")]
+        if not value:
+            continue
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        qualities[value.lower()] = quality
+    return qualities
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """按 Accept 头选择响应格式：msgpack 可用且客户端对它的偏好不低于 JSON 时返回 MessagePack，否则返回 JSON"""
+    if msgpack is None:
+        return JSON_MEDIA_TYPE
+    qualities = _parse_quality(accept)
+    msgpack_quality = max((qualities.get(m, 0.0) for m in MSGPACK_MEDIA_TYPES), default=0.0)
+    json_quality = qualities.get(JSON_MEDIA_TYPE, qualities.get("application/*", qualities.get("*/*", 0.0)))
+    return MSGPACK_MEDIA_TYPE if msgpack_quality > 0 and msgpack_quality >= json_quality else JSON_MEDIA_TYPE
+
+
+def negotiate_content_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """按 Accept-Encoding 头选择压缩算法：br（已安装 brotli 时）优先，其次 gzip，都不接受时不压缩"""
+    qualities = _parse_quality(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def _append_vary(response: Response, value: str):
+    vary = response.headers.get("vary")
+    if not vary:
+        response.headers["vary"] = value
+    elif value.lower() not in vary.lower():
+        response.headers["vary"] = f"{vary}, {value}"
+
+
+def encode_response(
+    content: Any,
+    accept: Optional[str],
+    status_code: int = 200,
+    background: Any = None
+) -> Response:
+    """按 Accept 头编码端点返回值"""
+    media_type = negotiate_media_type(accept)
+    body = encode_msgpack(content) if media_type == MSGPACK_MEDIA_TYPE else encode_json(content)
+    response = Response(body, status_code=status_code, media_type=media_type, background=background)
+    _append_vary(response, "Accept")
+    return response
+
+
+def compress_response(response: Response, accept_encoding: Optional[str]) -> Response:
+    """响应体较大且客户端接受压缩时压缩响应体（流式响应和已编码的响应不处理）"""
+    if isinstance(response, StreamingResponse) or "content-encoding" in response.headers:
+        return response
+    body = getattr(response, "body", b"")
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+    encoding = negotiate_content_encoding(accept_encoding)
+    if encoding is None:
+        return response
+
+    response.body = compress(body, encoding)
+    response.headers["content-encoding"] = encoding
+    response.headers["content-length"] = str(len(response.body))
+    _append_vary(response, "Accept-Encoding")
+    return response
+
+
+# ---- 路由集成 ----
+
+class _PendingResponse(Response):
+    """端点返回值的占位响应：FastAPI 对 Response 不再做序列化，内容留到路由处理函数中按请求头编码"""
+
+    def __init__(self, content: Any):
+        super().__init__()
+        self.content = content
+
+
+def _wrap_endpoint(endpoint: Callable, response_model: Any) -> Callable:
+    """包装端点，把返回值交给 _PendingResponse
+
+    声明了 response_model 而返回值不是该模型实例（如返回 dict）时保持原样，仍由 FastAPI 校验和序列化。
+    """
+    if getattr(endpoint, "__encoded_endpoint__", False):
+        return endpoint
+    if isinstance(response_model, DefaultPlaceholder):
+        response_model = None
+
+    def pending(result: Any) -> Any:
+        if isinstance(result, Response):
+            return result
+        if response_model is not None and not (
+            isinstance(response_model, type) and isinstance(result, response_model)
+        ):
+            return result
+        return _PendingResponse(result)
+
+    @functools.wraps(endpoint)
+    async def encoded_endpoint(*args, **kwargs):
+        return pending(await endpoint(*args, **kwargs))
+
+    encoded_endpoint.__encoded_endpoint__ = True
+    return encoded_endpoint
+
+
+class EncodedRequest(Request):
+    """JSON 请求体用 orjson 解析（大体积的 List[List[Any]] 表格数据解析更快）"""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = decode_json(await self.body())
+        return self._json
+
+
+class EncodedRoute(APIRoute):
+    """按请求头协商编码和压缩响应的路由（用作 APIRouter 的 route_class）
+
+    只包装异步端点；同步端点和流式端点仍走 FastAPI 默认的序列化，较大的非流式响应同样会被压缩。
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs: Any):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _wrap_endpoint(endpoint, kwargs.get("response_model"))
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        status_code = self.status_code or 200
+
+        async def encoded_route_handler(request: Request) -> Response:
+            response = await handler(EncodedRequest(request.scope, request.receive))
+            if isinstance(response, _PendingResponse):
+                response = encode_response(
+                    response.content, request.headers.get("accept"), status_code, response.background
+                )
+            return compress_response(response, request.headers.get("accept-encoding"))
+
+        return encoded_route_handler
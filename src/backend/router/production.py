@@ -3,18 +3,21 @@
 包含排产相关的所有API接口
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, Header, HTTPException
+from typing import List, Dict, Any, Optional, Iterator
 from datetime import datetime
 
 from models import (
     MultiPlanProductionResponse, MultiPlanProductionRequest, ProductionToSchedulingRequest,
-    CustomerOrder, CapacityPlan, ProductionScheduleResult
+    CustomerOrder, CapacityPlan, ProductionScheduleResult, SchedulingResponse
 )
-from tools import ProductionSchedulingEngine
+from tools import ProductionSchedulingEngine, ParsedDataset
+from .base import acquire_engine_slot, resolve_dataset, run_engine
+from .encoding import EncodedRoute
+from .streaming import negotiate_stream_format, stream_response
 
 # 创建路由器
-router = APIRouter(prefix="/production", tags=["排产管理"])
+router = APIRouter(prefix="/production", tags=["排产管理"], route_class=EncodedRoute)
 
 # 排产算法引擎 - 将在主应用中注入
 production_engine: ProductionSchedulingEngine = None
@@ -28,19 +31,108 @@ def init_production_engine(engine: ProductionSchedulingEngine):
 async def multi_plan_production_scheduling(request: MultiPlanProductionRequest):
     """多方案排产优化"""
     try:
-        result = production_engine.multi_plan_production_scheduling(request)
+        result = await run_engine("production", "multi_plan_production_scheduling", request)
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"多方案排产失败: {str(e)}")
 
+def _iter_multi_plan_lines(request: MultiPlanProductionRequest) -> Iterator[Dict[str, Any]]:
+    """逐个输出方案排产结果行，最后输出推荐方案和对比指标汇总行"""
+    for index, (kind, payload) in enumerate(production_engine.iter_multi_plan_production(request)):
+        if kind == "plan":
+            yield {"type": "plan", "index": index, "plan": payload.model_dump()}
+        else:
+            yield {"type": "summary", **payload}
+
+@router.post("/multi-plan/stream")
+async def multi_plan_production_scheduling_stream(
+    request: MultiPlanProductionRequest,
+    format: Optional[str] = None,
+    accept: Optional[str] = Header(None)
+):
+    """多方案排产优化，每评估完一个方案立即流式返回
+
+    format=ndjson|sse（未指定时按 Accept 头协商，默认 NDJSON）。
+    每行（事件）一个对象：type="plan" 为单个方案的排产结果（按评估顺序，基准方案在前），
+    最后一个 type="summary" 为推荐方案ID和对比指标（与 /multi-plan 一致）。
+    """
+    try:
+        stream_format = negotiate_stream_format(format, accept)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # 方案评估在输出期间进行，占用一个引擎执行器名额直到输出结束
+    slot = await acquire_engine_slot()
+    return stream_response(
+        _iter_multi_plan_lines(request), stream_format, error_prefix="多方案排产失败", slot=slot
+    )
+
 @router.post("/integrate-scheduling")
 async def integrate_production_to_scheduling(request: ProductionToSchedulingRequest):
     """排产结果集成到排班"""
     try:
-        result = production_engine.integrate_production_to_scheduling(request)
+        dataset = resolve_dataset(request.dataset_id) if request.dataset_id else None
+        result = await run_engine(
+            "production", "integrate_production_to_scheduling", request, dataset=dataset
+        )
         return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"排产排班集成失败: {str(e)}")
+
+def _iter_integration_lines(
+    request: ProductionToSchedulingRequest,
+    dataset: Optional[ParsedDataset]
+) -> Iterator[Dict[str, Any]]:
+    """逐日输出集成排班结果行，最后输出汇总行"""
+    successful_days = 0
+    for date, schedule, error in production_engine.iter_integrated_schedules(request, dataset):
+        if error is not None:
+            yield {"type": "day_error", "date": date, "detail": error}
+            continue
+        successful_days += 1
+        yield {"type": "day", "date": date, "schedule": SchedulingResponse(**schedule).model_dump()}
+    
+    total_days = len(request.production_schedule)
+    yield {
+        "type": "summary",
+        "integration_metrics": {
+            "total_production_days": total_days,
+            "total_scheduling_days": successful_days,
+            "integration_success_rate": successful_days / total_days if total_days else 0
+        }
+    }
+
+@router.post("/integrate-scheduling/stream")
+async def integrate_production_to_scheduling_stream(
+    request: ProductionToSchedulingRequest,
+    format: Optional[str] = None,
+    accept: Optional[str] = Header(None)
+):
+    """排产结果集成到排班，以 NDJSON 或 SSE 流式逐日返回
+
+    format=ndjson|sse（未指定时按 Accept 头协商，默认 NDJSON）。
+    每行（事件）一个对象：type="day" 为单日排班结果，type="day_error" 为该日排班失败，最后一行 type="summary" 为汇总。
+    """
+    try:
+        try:
+            stream_format = negotiate_stream_format(format, accept)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        dataset = resolve_dataset(request.dataset_id) if request.dataset_id else None
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"排产排班集成失败: {str(e)}")
+    
+    # 逐日排班在输出期间进行，占用一个引擎执行器名额直到输出结束
+    slot = await acquire_engine_slot()
+    return stream_response(
+        _iter_integration_lines(request, dataset), stream_format, error_prefix="排产排班集成失败", slot=slot
+    )
 
 @router.post("/capacity-plans")
 async def generate_capacity_plans(
@@ -52,7 +144,8 @@ async def generate_capacity_plans(
     """生成产能方案"""
     try:
         working_dates = production_engine.get_working_dates(start_date, weeks)
-        capacity_plans = production_engine.generate_capacity_plans(
+        capacity_plans = await run_engine(
+            "production", "generate_capacity_plans",
             working_dates, baseline_capacity, capacity_variation
         )
         return {
@@ -60,6 +153,8 @@ async def generate_capacity_plans(
             "capacity_plans": [plan.dict() for plan in capacity_plans],
             "total_plans": len(capacity_plans)
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"产能方案生成失败: {str(e)}")
 
@@ -92,7 +187,7 @@ async def schedule_production(
             start_date=datetime.now().strftime("%Y-%m-%d")
         )
         
-        result = production_engine.multi_plan_production_scheduling(request)
+        result = await run_engine("production", "multi_plan_production_scheduling", request)
         
         # 返回兼容格式
         return {
@@ -101,6 +196,8 @@ async def schedule_production(
             "metrics": result.baseline_plan.metrics,
             "multi_plan_result": result.dict()
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"生产排程失败: {str(e)}")
 
@@ -273,9 +370,14 @@ async def get_changeover_time_config():
 async def calculate_work_center_schedule(
     orders: List[Dict[str, Any]],
     capacity_plan: Dict[str, Any],
-    sku_data: List[List[Any]] = None
+    sku_data: List[List[Any]] = None,
+    sequencing: str = "priority",
+    sequencing_window_days: int = 7,
+    timing: str = "capacity",
+    buffer_minutes: int = 30
 ):
-    """按工作中心计算排产计划"""
+    """按工作中心计算排产计划（sequencing="changeover" 时按箱型成批排序以减少转产，
+    timing="timeline" 时按节拍和转产分钟数在时间轴上排产，timing="flow_shop" 时按工艺路线跨工作中心排产）"""
     try:
         # 转换订单格式
         customer_orders = []
@@ -301,21 +403,63 @@ async def calculate_work_center_schedule(
             cost_coefficient=capacity_plan.get("cost_coefficient", 1.0)
         )
         
-        # 执行按工作中心排产
-        work_center_schedules = production_engine.calculate_work_center_schedule(
-            customer_orders, 
-            capacity_plan_obj, 
-            sku_data
-        )
+        summary = {
+            "total_production_days": len(capacity_plan_obj.daily_capacities),
+            "total_orders": len(customer_orders),
+            "sequencing": sequencing,
+            "timing": timing
+        }
         
-        return {
+        # 流水车间模式：按工艺路线跨工作中心排产
+        if timing == "flow_shop":
+            flow_shop = await run_engine(
+                "production", "calculate_flow_shop_schedule",
+                customer_orders,
+                capacity_plan_obj,
+                sku_data,
+                buffer_minutes=buffer_minutes,
+                sequencing=sequencing,
+                sequencing_window_days=sequencing_window_days
+            )
+            work_center_schedules = flow_shop["work_center_schedules"]
+            summary.update({
+                "bottleneck": flow_shop["bottleneck"],
+                "makespan_minutes": flow_shop["makespan_minutes"],
+                "completed_orders": flow_shop["completed_orders"],
+                "on_time_orders": flow_shop["on_time_orders"]
+            })
+        else:
+            # 执行按工作中心排产
+            work_center_schedules = await run_engine(
+                "production", "calculate_work_center_schedule",
+                customer_orders, 
+                capacity_plan_obj, 
+                sku_data,
+                sequencing=sequencing,
+                sequencing_window_days=sequencing_window_days,
+                timing=timing
+            )
+        
+        summary.update({
+            "total_work_centers": len(work_center_schedules),
+            "total_changeover_time": sum(
+                schedule.total_changeover_time for schedule in work_center_schedules.values()
+            ),
+            "changeover_saved_minutes": sum(
+                schedule.efficiency_metrics.get("节省转产时间", 0)
+                for schedule in work_center_schedules.values()
+            )
+        })
+        
+        response = {
             "work_center_schedules": work_center_schedules,
-            "summary": {
-                "total_work_centers": len(work_center_schedules),
-                "total_production_days": len(capacity_plan_obj.daily_capacities),
-                "total_orders": len(customer_orders)
-            }
+            "summary": summary
         }
+        if timing == "flow_shop":
+            response["order_completions"] = flow_shop["order_completions"]
+        return response
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"工作中心排产计算失败: {str(e)}")
 
@@ -3,70 +3,135 @@
 包含排班相关的所有API接口
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
-from datetime import datetime
+from fastapi import APIRouter, Header, HTTPException
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+from datetime import datetime, timedelta
 
 from models import (
     SchedulingRequest, SchedulingResponse, WeeklySchedulingRequest, 
     WeeklySchedulingResponse, PositionGroup, LeaveInfo, 
-    AdjustmentSuggestion, TeamWorkload
+    AdjustmentSuggestion, TeamWorkload, RosterRequest, RosterDay,
+    SchedulingResult, LeaveBatchRequest, LeaveBatchResponse
 )
-from tools import SchedulingEngine
+from storage import EmployeeStatusStore
+from tools import SchedulingEngine, ParsedDataset
+from tools.availability import AvailabilityIndex, DateLike, to_ordinal
+from .base import acquire_engine_slot, resolve_dataset, run_engine
+from .encoding import EncodedRoute
+from .streaming import negotiate_stream_format, stream_response
 
 # 创建路由器
-router = APIRouter(prefix="/scheduling", tags=["排班管理"])
+router = APIRouter(prefix="/scheduling", tags=["排班管理"], route_class=EncodedRoute)
 
-# 排班算法引擎 - 将在主应用中注入
+# 排班算法引擎和员工状态存储 - 将在主应用中注入
 scheduling_engine: SchedulingEngine = None
+employee_store: EmployeeStatusStore = None
 
 def init_scheduling_engine(engine: SchedulingEngine):
     """初始化排班引擎"""
     global scheduling_engine
     scheduling_engine = engine
 
+def init_employee_store(store: EmployeeStatusStore):
+    """初始化员工状态存储"""
+    global employee_store
+    employee_store = store
+
+def build_availability(
+    leaves: List[LeaveInfo],
+    use_employee_status: bool,
+    start_date: DateLike,
+    end_date: DateLike
+) -> Optional[AvailabilityIndex]:
+    """由请求中的请假信息和排班周期内生效的员工状态记录构建人员可用性索引，无记录时返回 None"""
+    try:
+        start_day = datetime.fromordinal(to_ordinal(start_date)).strftime("%Y-%m-%d")
+        end_day = datetime.fromordinal(to_ordinal(end_date)).strftime("%Y-%m-%d")
+        status_records = []
+        if use_employee_status and employee_store is not None:
+            status_records = employee_store.query(start_date=start_day, end_date=end_day)
+        if not leaves and not status_records:
+            return None
+        return AvailabilityIndex.build(leaves, status_records)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"日期格式无效: {str(e)}")
+
+def build_scheduling_response(
+    results: List[SchedulingResult],
+    groups: List[PositionGroup]
+) -> SchedulingResponse:
+    """组装单日排班响应（附带性能指标）"""
+    position_matching = scheduling_engine.calculate_position_matching(groups)
+    work_hour_efficiency = scheduling_engine.calculate_work_hour_efficiency(groups)
+    
+    performance_metrics = {
+        "人岗匹配度": position_matching,
+        "工时利用率": work_hour_efficiency
+    }
+    
+    return SchedulingResponse(
+        results=results,
+        groups=groups,
+        performance_metrics=performance_metrics
+    )
+
 @router.post("/day", response_model=SchedulingResponse)
 async def perform_day_scheduling(request: SchedulingRequest):
-    """执行单日排班"""
+    """执行单日排班（提供 product_mix 时一次排多个产品）"""
     try:
+        if not request.product_code and not request.product_mix:
+            raise HTTPException(status_code=400, detail="需要提供 product_code 或 product_mix")
+        
+        dataset = resolve_dataset(request.dataset_id) if request.dataset_id else None
+        availability = build_availability(
+            request.leaves, request.use_employee_status, request.target_date, request.target_date
+        )
+        
         # 执行排班算法
-        results, groups = scheduling_engine.perform_day_scheduling(
+        results, groups = await run_engine(
+            "scheduling", "perform_day_scheduling",
             target_date=request.target_date,
             product_code=request.product_code,
             sku_data=request.sku_data,
             position_data=request.position_data,
             skill_data=request.skill_data,
-            weekly_assigned_workers=request.weekly_assigned_workers
+            weekly_assigned_workers=request.weekly_assigned_workers,
+            dataset=dataset,
+            solver=request.solver,
+            availability=availability,
+            product_mix=request.product_mix,
+            mix_mode=request.mix_mode,
+            reference_quantity=request.reference_quantity
         )
         
-        # 计算性能指标
-        position_matching = scheduling_engine.calculate_position_matching(groups)
-        work_hour_efficiency = scheduling_engine.calculate_work_hour_efficiency(groups)
-        
-        performance_metrics = {
-            "人岗匹配度": position_matching,
-            "工时利用率": work_hour_efficiency
-        }
-        
-        return SchedulingResponse(
-            results=results,
-            groups=groups,
-            performance_metrics=performance_metrics
-        )
+        return build_scheduling_response(results, groups)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"排班失败: {str(e)}")
 
 @router.post("/week", response_model=WeeklySchedulingResponse)
 async def perform_weekly_scheduling(request: WeeklySchedulingRequest):
-    """执行一周排班"""
+    """执行一周排班（weeks>1 时连续排多周）"""
     try:
+        dataset = resolve_dataset(request.dataset_id) if request.dataset_id else None
+        horizon_dates = scheduling_engine.get_horizon_dates(request.start_date, request.weeks)
+        availability = build_availability(
+            request.leaves, request.use_employee_status, horizon_dates[0], horizon_dates[-1]
+        )
+        
         # 执行一周排班
-        weekly_schedule = scheduling_engine.generate_weekly_schedule(
+        weekly_schedule = await run_engine(
+            "scheduling", "generate_weekly_schedule",
             start_date=request.start_date,
             product_code=request.product_code,
             sku_data=request.sku_data,
             position_data=request.position_data,
-            skill_data=request.skill_data
+            skill_data=request.skill_data,
+            dataset=dataset,
+            solver=request.solver,
+            weeks=request.weeks,
+            availability=availability
         )
         
         # 转换为响应格式
@@ -75,20 +140,7 @@ async def perform_weekly_scheduling(request: WeeklySchedulingRequest):
         total_positions = 0
         
         for date_str, (results, groups) in weekly_schedule.items():
-            # 计算性能指标
-            position_matching = scheduling_engine.calculate_position_matching(groups)
-            work_hour_efficiency = scheduling_engine.calculate_work_hour_efficiency(groups)
-            
-            performance_metrics = {
-                "人岗匹配度": position_matching,
-                "工时利用率": work_hour_efficiency
-            }
-            
-            response_schedule[date_str] = SchedulingResponse(
-                results=results,
-                groups=groups,
-                performance_metrics=performance_metrics
-            )
+            response_schedule[date_str] = build_scheduling_response(results, groups)
             
             total_results += len(results)
             total_positions += len(groups)
@@ -104,8 +156,135 @@ async def perform_weekly_scheduling(request: WeeklySchedulingRequest):
             weekly_schedule=response_schedule,
             summary=summary
         )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"一周排班失败: {str(e)}")
+
+def _iter_roster_lines(
+    request: RosterRequest,
+    dataset: ParsedDataset,
+    availability: Optional[AvailabilityIndex] = None
+) -> Iterator[Dict[str, Any]]:
+    """逐日生成排班结果行，最后输出汇总行"""
+    total_days = 0
+    total_results = 0
+    total_positions = 0
+    
+    for date_str, results, groups in scheduling_engine.iter_roster(
+        start_date=request.start_date,
+        product_code=request.product_code,
+        dataset=dataset,
+        weeks=request.weeks,
+        horizon=request.horizon,
+        solver=request.solver,
+        replan_from=request.replan_from,
+        carry_assigned_workers=request.carry_assigned_workers,
+        availability=availability
+    ):
+        date = datetime.strptime(date_str, "%Y/%m/%d")
+        day = RosterDay(
+            date=date_str,
+            week_start=(date - timedelta(days=date.weekday())).strftime("%Y/%m/%d"),
+            schedule=build_scheduling_response(results, groups),
+            assigned_workers=[result.工号 for result in results if result.工号]
+        )
+        
+        total_days += 1
+        total_results += len(results)
+        total_positions += len(groups)
+        yield {"type": "day", **day.model_dump()}
+    
+    yield {
+        "type": "summary",
+        "dataset_id": dataset.dataset_id,
+        "total_days": total_days,
+        "total_results": total_results,
+        "total_positions": total_positions,
+        "avg_daily_results": total_results / total_days if total_days else 0
+    }
+
+async def _prepare_roster(
+    request: RosterRequest,
+    format: Optional[str],
+    accept: Optional[str]
+) -> Tuple[str, ParsedDataset, AvailabilityIndex]:
+    """校验周期排班请求，在开始输出前解析数据并构建整个周期的可用性索引，返回 (流式格式, 数据集, 可用性索引)"""
+    try:
+        stream_format = negotiate_stream_format(format, accept)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        datetime.strptime(request.start_date, "%Y/%m/%d")
+        if request.replan_from:
+            datetime.strptime(request.replan_from, "%Y/%m/%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="日期格式应为 YYYY/MM/DD")
+    
+    # 数据在开始输出前解析一次，整个周期共享
+    if request.dataset_id:
+        dataset = resolve_dataset(request.dataset_id)
+    else:
+        dataset = await run_engine(
+            "scheduling", "build_dataset",
+            request.sku_data, request.position_data, request.skill_data
+        )
+    
+    horizon_dates = scheduling_engine.get_horizon_dates(request.start_date, request.weeks, request.horizon)
+    availability = build_availability(
+        request.leaves, request.use_employee_status, horizon_dates[0], horizon_dates[-1]
+    )
+    return stream_format, dataset, availability
+
+@router.post("/week/stream")
+async def perform_weekly_scheduling_stream(
+    request: WeeklySchedulingRequest,
+    format: Optional[str] = None,
+    accept: Optional[str] = Header(None)
+):
+    """一周排班（weeks>1 时连续排多周），每排完一天立即流式返回
+
+    format=ndjson|sse（未指定时按 Accept 头协商，默认 NDJSON）。
+    每行（事件）一个对象：type="day" 为单日排班结果，最后一个 type="summary" 为汇总（与 /week 的 summary 一致）。
+    """
+    roster_request = RosterRequest(**request.model_dump(), horizon="week")
+    try:
+        stream_format, dataset, availability = await _prepare_roster(roster_request, format, accept)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"一周排班失败: {str(e)}")
+    
+    # 逐日计算在输出期间进行，占用一个引擎执行器名额直到输出结束
+    slot = await acquire_engine_slot()
+    return stream_response(
+        _iter_roster_lines(roster_request, dataset, availability), stream_format, error_prefix="一周排班失败", slot=slot
+    )
+
+@router.post("/roster")
+async def generate_roster(
+    request: RosterRequest,
+    format: Optional[str] = None,
+    accept: Optional[str] = Header(None)
+):
+    """按排班周期（多周或整月）生成排班，以 NDJSON 或 SSE 流式逐日返回
+
+    format=ndjson|sse（未指定时按 Accept 头协商，默认 NDJSON）。
+    每行（事件）一个对象：type="day" 为单日排班结果，最后一个 type="summary" 为汇总。
+    输入变化时可通过 replan_from + carry_assigned_workers 只重排周期尾部。
+    """
+    try:
+        stream_format, dataset, availability = await _prepare_roster(request, format, accept)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"周期排班失败: {str(e)}")
+    
+    # 逐日计算在输出期间进行，占用一个引擎执行器名额直到输出结束
+    slot = await acquire_engine_slot()
+    return stream_response(
+        _iter_roster_lines(request, dataset, availability), stream_format, error_prefix="周期排班失败", slot=slot
+    )
 
 @router.post("/performance")
 async def calculate_performance_metrics(
@@ -127,16 +306,21 @@ async def calculate_performance_metrics(
 async def calculate_team_workloads(
     groups: List[PositionGroup],
     leaves: List[LeaveInfo],
-    skill_data: List[List[Any]],
-    current_date: str
+    current_date: str,
+    skill_data: List[List[Any]] = None,
+    dataset_id: Optional[str] = None
 ):
     """计算班组负荷情况"""
     try:
         # 处理技能矩阵数据
-        skill_matrix = scheduling_engine.process_skill_matrix(skill_data)
+        if dataset_id:
+            skill_matrix = resolve_dataset(dataset_id).skill_matrix
+        else:
+            skill_matrix = await run_engine("scheduling", "process_skill_matrix", skill_data)
         
         # 计算班组负荷
-        workloads = scheduling_engine.calculate_team_workloads(
+        workloads = await run_engine(
+            "scheduling", "calculate_team_workloads",
             groups=groups,
             leaves=leaves,
             skill_matrix=skill_matrix,
@@ -144,6 +328,8 @@ async def calculate_team_workloads(
         )
         
         return {"team_workloads": workloads}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"班组负荷计算失败: {str(e)}")
 
@@ -158,11 +344,12 @@ async def submit_leave_request(request_data: dict):
         current_date = request_data.get("current_date", "")
         
         # 处理技能矩阵数据
-        skill_matrix = scheduling_engine.process_skill_matrix(skill_data)
+        skill_matrix = await run_engine("scheduling", "process_skill_matrix", skill_data)
         
         # 计算班组负荷（将单个请假信息包装成列表）
         leaves = [leave_info]
-        workloads = scheduling_engine.calculate_team_workloads(
+        workloads = await run_engine(
+            "scheduling", "calculate_team_workloads",
             groups=groups,
             leaves=leaves,
             skill_matrix=skill_matrix,
@@ -170,7 +357,8 @@ async def submit_leave_request(request_data: dict):
         )
         
         # 生成调整建议
-        suggestions = scheduling_engine.generate_adjustment_suggestions(
+        suggestions = await run_engine(
+            "scheduling", "generate_adjustment_suggestions",
             groups=groups,
             leaves=leaves,
             workloads=workloads,
@@ -186,9 +374,50 @@ async def submit_leave_request(request_data: dict):
             "adjustment_suggestions": suggestions,
             "analysis_date": current_date
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"请假申请处理失败: {str(e)}")
 
+@router.post("/leave/batch", response_model=LeaveBatchResponse)
+async def submit_leave_batch(request: LeaveBatchRequest):
+    """批量提交请假并增量修补当天排班
+
+    一次确定全部受影响的岗位，只修改这些岗位组（移除不可用员工、从空闲员工中补位），
+    返回修补后的排班和变更明细，不重新计算全部班组负荷和调整建议。
+    """
+    try:
+        if not request.skill_data and not request.dataset_id:
+            raise HTTPException(status_code=400, detail="需要提供 skill_data 或 dataset_id")
+        if request.dataset_id:
+            skill_matrix = resolve_dataset(request.dataset_id).skill_matrix
+        else:
+            skill_matrix = await run_engine("scheduling", "process_skill_matrix", request.skill_data)
+        
+        availability = build_availability(
+            request.leaves, request.use_employee_status, request.current_date, request.current_date
+        )
+        patch = await run_engine(
+            "scheduling", "patch_day_schedule",
+            groups=request.groups,
+            leaves=request.leaves,
+            skill_matrix=skill_matrix,
+            current_date=request.current_date,
+            excluded_workers=request.excluded_workers,
+            availability=availability
+        )
+        
+        return LeaveBatchResponse(
+            groups=patch["groups"],
+            diff=patch["diff"],
+            adjustment_suggestions=patch["suggestions"],
+            summary={**patch["summary"], "analysis_date": request.current_date}
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"批量请假处理失败: {str(e)}")
+
 @router.post("/adjustment/suggestions")
 async def generate_adjustment_suggestions(
     request_data: dict
@@ -202,10 +431,11 @@ async def generate_adjustment_suggestions(
         current_date = request_data.get("current_date", "")
         
         # 处理技能矩阵数据
-        skill_matrix = scheduling_engine.process_skill_matrix(skill_data)
+        skill_matrix = await run_engine("scheduling", "process_skill_matrix", skill_data)
         
         # 计算班组负荷
-        workloads = scheduling_engine.calculate_team_workloads(
+        workloads = await run_engine(
+            "scheduling", "calculate_team_workloads",
             groups=groups,
             leaves=leaves,
             skill_matrix=skill_matrix,
@@ -213,7 +443,8 @@ async def generate_adjustment_suggestions(
         )
         
         # 生成调整建议
-        suggestions = scheduling_engine.generate_adjustment_suggestions(
+        suggestions = await run_engine(
+            "scheduling", "generate_adjustment_suggestions",
             groups=groups,
             leaves=leaves,
             workloads=workloads,
@@ -226,6 +457,8 @@ async def generate_adjustment_suggestions(
             "adjustment_suggestions": suggestions,
             "analysis_date": current_date
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"生成调整建议失败: {str(e)}")
 
@@ -255,14 +488,18 @@ async def analyze_leave_impact(
 ):
     """分析请假对排班的影响"""
     try:
-        skill_matrix = scheduling_engine.process_skill_matrix(skill_data)
-        impact_analysis = scheduling_engine.analyze_leave_impact(groups, leave_info, skill_matrix)
+        skill_matrix = await run_engine("scheduling", "process_skill_matrix", skill_data)
+        impact_analysis = await run_engine(
+            "scheduling", "analyze_leave_impact", groups, leave_info, skill_matrix
+        )
         
         return {
             "impact_analysis": impact_analysis,
             "leave_info": leave_info,
             "analysis_time": datetime.now().isoformat()
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"请假影响分析失败: {str(e)}")
 
@@ -0,0 +1,126 @@
+"""
+流式响应工具
+把逐条生成的结果编码为 NDJSON（每行一个 JSON 对象）或 SSE（server-sent events），边计算边返回
+"""
+
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from tools.executor import EngineSlot
+from .encoding import encode_json
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+STREAM_FORMATS = ("ndjson", "sse")
+
+
+def encode_ndjson_line(item: Dict[str, Any]) -> bytes:
+    """编码为一行 NDJSON"""
+    return encode_json(item) + b"\n"
+
+
+def encode_sse_event(item: Dict[str, Any]) -> bytes:
+    """编码为一条 SSE 事件，事件名取 item["type"]，数据为整个 JSON 对象（单行）"""
+    event = item.get("type", "message")
+    return f"event: {event}\ndata: ".encode("utf-8") + encode_json(item) + b"\n\n"
+
+
+def negotiate_stream_format(format: Optional[str] = None, accept: Optional[str] = None) -> str:
+    """确定流式格式：优先使用显式指定的 format，否则 Accept 含 text/event-stream 时使用 SSE，默认 NDJSON"""
+    if format:
+        if format not in STREAM_FORMATS:
+            raise ValueError(f"不支持的流式格式: {format}")
+        return format
+    if accept and SSE_MEDIA_TYPE in accept:
+        return "sse"
+    return "ndjson"
+
+
+def _iter_encoded(
+    items: Iterable[Dict[str, Any]],
+    error_prefix: str,
+    encode,
+    slot: Optional[EngineSlot] = None
+) -> Iterator[bytes]:
+    try:
+        for item in items:
+            yield encode(item)
+    except Exception as e:
+        if slot is not None:
+            slot.failed = True
+        # 响应头已发送，无法再返回错误状态码，以错误行（事件）结束输出
+        yield encode({"type": "error", "detail": f"{error_prefix}: {str(e)}"})
+
+
+class _SlotStreamingResponse(StreamingResponse):
+    """整个输出期间占用引擎执行器名额的流式响应，输出结束、出错或客户端断开时释放"""
+
+    def __init__(self, content: Iterator[bytes], slot: EngineSlot, **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self.slot = slot
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.slot.release()
+
+
+def _streaming_response(
+    chunks: Iterator[bytes],
+    media_type: str,
+    slot: Optional[EngineSlot] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    if slot is None:
+        return StreamingResponse(chunks, media_type=media_type, headers=headers)
+    return _SlotStreamingResponse(chunks, slot, media_type=media_type, headers=headers)
+
+
+def _iter_lines(
+    items: Iterable[Dict[str, Any]],
+    error_prefix: str,
+    slot: Optional[EngineSlot] = None
+) -> Iterator[bytes]:
+    return _iter_encoded(items, error_prefix, encode_ndjson_line, slot)
+
+
+def ndjson_response(
+    items: Iterable[Dict[str, Any]],
+    error_prefix: str = "处理失败",
+    slot: Optional[EngineSlot] = None
+) -> StreamingResponse:
+    """NDJSON 流式响应（同步生成器在线程池中执行，不阻塞事件循环）
+
+    传入 slot 时整个输出期间占用该引擎执行器名额，结束后释放。
+    """
+    return _streaming_response(_iter_lines(items, error_prefix, slot), NDJSON_MEDIA_TYPE, slot)
+
+
+def sse_response(
+    items: Iterable[Dict[str, Any]],
+    error_prefix: str = "处理失败",
+    slot: Optional[EngineSlot] = None
+) -> StreamingResponse:
+    """SSE 流式响应（关闭代理缓冲，事件到达即推送给浏览器）"""
+    return _streaming_response(
+        _iter_encoded(items, error_prefix, encode_sse_event, slot),
+        SSE_MEDIA_TYPE,
+        slot,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def stream_response(
+    items: Iterable[Dict[str, Any]],
+    stream_format: str = "ndjson",
+    error_prefix: str = "处理失败",
+    slot: Optional[EngineSlot] = None
+) -> StreamingResponse:
+    """按格式返回 NDJSON 或 SSE 流式响应"""
+    if stream_format == "sse":
+        return sse_response(items, error_prefix, slot)
+    return ndjson_response(items, error_prefix, slot)
@@ -7,12 +7,13 @@ from fastapi import APIRouter, HTTPException
 from typing import List, Any
 
 from tools import SchedulingEngine
+from .encoding import EncodedRoute
 
 # 创建路由器
-router = APIRouter(prefix="/algorithms", tags=["工具算法"])
+router = APIRouter(prefix="/algorithms", tags=["工具算法"], route_class=EncodedRoute)
 
 # 数据验证路由器
-data_router = APIRouter(prefix="/data", tags=["数据验证"])
+data_router = APIRouter(prefix="/data", tags=["数据验证"], route_class=EncodedRoute)
 
 # 排班算法引擎 - 将在主应用中注入
 scheduling_engine: SchedulingEngine = None
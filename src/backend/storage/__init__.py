@@ -0,0 +1,14 @@
+"""
+存储模块
+提供数据集、员工状态记录等服务端数据的存储
+"""
+
+from .dataset_store import DatasetStore, compute_dataset_id
+from .employee_store import EmployeeStatusStore, normalize_day
+
+__all__ = [
+    "DatasetStore",
+    "compute_dataset_id",
+    "EmployeeStatusStore",
+    "normalize_day"
+]
@@ -0,0 +1,59 @@
+"""
+数据集存储模块
+按内容哈希缓存已解析的数据集，排班接口可通过数据集ID引用，无需重复上传和解析
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from tools.dataset import ParsedDataset
+
+
+def compute_dataset_id(contents: Iterable[bytes]) -> str:
+    """根据文件内容计算数据集ID"""
+    digest = hashlib.sha256()
+    for content in contents:
+        # 写入长度前缀，避免不同文件切分方式得到相同哈希
+        digest.update(len(content).to_bytes(8, "big"))
+        digest.update(content)
+    return digest.hexdigest()[:32]
+
+
+class DatasetStore:
+    """有容量上限的LRU数据集存储"""
+
+    def __init__(self, max_datasets: int = 8):
+        self.max_datasets = max_datasets
+        self._datasets: "OrderedDict[str, ParsedDataset]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, dataset_id: str) -> Optional[ParsedDataset]:
+        """获取数据集，命中时刷新其LRU位置"""
+        with self._lock:
+            dataset = self._datasets.get(dataset_id)
+            if dataset is not None:
+                self._datasets.move_to_end(dataset_id)
+            return dataset
+
+    def put(self, dataset: ParsedDataset) -> None:
+        """存入数据集，超出容量时淘汰最久未使用的数据集"""
+        with self._lock:
+            self._datasets[dataset.dataset_id] = dataset
+            self._datasets.move_to_end(dataset.dataset_id)
+            while len(self._datasets) > self.max_datasets:
+                self._datasets.popitem(last=False)
+
+    def remove(self, dataset_id: str) -> bool:
+        """删除数据集"""
+        with self._lock:
+            return self._datasets.pop(dataset_id, None) is not None
+
+    def __contains__(self, dataset_id: str) -> bool:
+        with self._lock:
+            return dataset_id in self._datasets
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._datasets)
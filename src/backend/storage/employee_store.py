@@ -0,0 +1,224 @@
+"""
+员工状态存储模块
+基于 SQLite 持久化员工状态记录（请假/辞职/休息），按班组、状态、班次、工号和日期区间建立索引，
+筛选、分页和分组统计都在一条SQL中完成，服务重启后数据不丢失
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from models import EmployeeStatusRecord
+
+# 未填写结束日期（如辞职）的记录视为一直有效
+OPEN_END_DATE = "9999-12-31"
+
+_COLUMNS = (
+    "id", "employee_id", "employee_name", "team", "status_type", "shift_type",
+    "start_date", "end_date", "reason", "created_at", "created_by"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS employee_status (
+    id TEXT PRIMARY KEY,
+    employee_id TEXT NOT NULL,
+    employee_name TEXT NOT NULL,
+    team TEXT NOT NULL,
+    status_type TEXT NOT NULL,
+    shift_type TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT,
+    reason TEXT,
+    created_at TEXT,
+    created_by TEXT,
+    start_day TEXT NOT NULL,
+    end_day TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_employee_status_team ON employee_status (team, shift_type);
+CREATE INDEX IF NOT EXISTS idx_employee_status_status ON employee_status (status_type);
+CREATE INDEX IF NOT EXISTS idx_employee_status_shift ON employee_status (shift_type);
+CREATE INDEX IF NOT EXISTS idx_employee_status_employee ON employee_status (employee_id);
+CREATE INDEX IF NOT EXISTS idx_employee_status_days ON employee_status (start_day, end_day);
+CREATE INDEX IF NOT EXISTS idx_employee_status_created ON employee_status (created_at);
+"""
+
+
+def normalize_day(value: Optional[str], default: str = "") -> str:
+    """日期统一为 YYYY-MM-DD，兼容 2025/1/6、2025-01-06 等写法，用于区间比较"""
+    if not value:
+        return default
+    text = str(value).strip().split(" ")[0].replace("/", "-")
+    parts = text.split("-")
+    if len(parts) != 3 or not all(p.isdigit() for p in parts):
+        return text
+    return f"{int(parts[0]):04d}-{int(parts[1]):02d}-{int(parts[2]):02d}"
+
+
+def _enum_value(value: Any) -> Any:
+    return value.value if hasattr(value, "value") else value
+
+
+class EmployeeStatusStore:
+    """员工状态记录的 SQLite 存储
+
+    path 为数据库文件路径，":memory:" 表示仅在内存中保存（进程退出即丢失）。
+    连接在线程间共享，读写由一把锁串行化。
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        if path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    # ---- 写入 ----
+
+    def _row_values(self, record: EmployeeStatusRecord) -> Tuple[Any, ...]:
+        values = [_enum_value(getattr(record, column)) for column in _COLUMNS]
+        return (
+            *values,
+            normalize_day(record.start_date),
+            normalize_day(record.end_date, OPEN_END_DATE)
+        )
+
+    def add(self, record: EmployeeStatusRecord) -> EmployeeStatusRecord:
+        """新增记录（id 相同时覆盖）"""
+        self.add_many([record])
+        return record
+
+    def _insert_many(self, records: Sequence[EmployeeStatusRecord]):
+        """写入记录（调用方持有锁并负责事务）"""
+        placeholders = ", ".join("?" * (len(_COLUMNS) + 2))
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO employee_status ({', '.join(_COLUMNS)}, start_day, end_day) "
+            f"VALUES ({placeholders})",
+            [self._row_values(record) for record in records]
+        )
+
+    def add_many(self, records: Sequence[EmployeeStatusRecord]) -> int:
+        """批量新增记录，在一个事务中写入"""
+        with self._lock, self._conn:
+            self._insert_many(records)
+        return len(records)
+
+    def delete(self, record_id: str) -> bool:
+        """删除记录，返回是否存在该记录"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM employee_status WHERE id = ?", (record_id,))
+        return cursor.rowcount > 0
+
+    def replace_all(self, records: Sequence[EmployeeStatusRecord]):
+        """清空后写入全部记录（同一事务中完成，写入失败时保留原有记录）"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM employee_status")
+            self._insert_many(records)
+
+    # ---- 查询 ----
+
+    @staticmethod
+    def _where(
+        status_type: Optional[str] = None,
+        shift_type: Optional[str] = None,
+        team: Optional[str] = None,
+        employee_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Tuple[str, List[Any]]:
+        """筛选条件 -> WHERE 子句；“全部”或空值表示不筛选，日期区间按与记录有效期有交集筛选"""
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (("status_type", status_type), ("shift_type", shift_type), ("team", team)):
+            value = _enum_value(value)
+            if value and value != "全部":
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if employee_id:
+            # 工号模糊匹配（不区分大小写）
+            clauses.append("employee_id LIKE ? ESCAPE '\\'")
+            escaped = employee_id.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if start_date:
+            clauses.append("end_day >= ?")
+            params.append(normalize_day(start_date))
+        if end_date:
+            clauses.append("start_day <= ?")
+            params.append(normalize_day(end_date))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _to_record(self, row: sqlite3.Row) -> EmployeeStatusRecord:
+        return EmployeeStatusRecord(**{column: row[column] for column in _COLUMNS})
+
+    def query(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        **filters: Optional[str]
+    ) -> List[EmployeeStatusRecord]:
+        """按筛选条件查询记录（按创建时间倒序），支持分页"""
+        where, params = self._where(**filters)
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM employee_status{where} ORDER BY created_at DESC, rowid DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, max(offset, 0)]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def iter_records(self, batch_size: int = 1000, **filters: Optional[str]) -> Iterator[EmployeeStatusRecord]:
+        """分批遍历记录，避免一次性加载全部数据"""
+        offset = 0
+        while True:
+            batch = self.query(offset=offset, limit=batch_size, **filters)
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            offset += batch_size
+
+    def all(self) -> List[EmployeeStatusRecord]:
+        return self.query()
+
+    def grouped_counts(
+        self,
+        group_by: Sequence[str] = ("status_type", "shift_type"),
+        **filters: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """按指定列分组计数（一条 GROUP BY 查询），返回 [{列: 值, ..., "count": 数量}]"""
+        invalid = [column for column in group_by if column not in ("team", "status_type", "shift_type", "employee_id")]
+        if invalid:
+            raise ValueError(f"不支持的分组字段: {invalid}")
+        where, params = self._where(**filters)
+        columns = ", ".join(group_by)
+        sql = f"SELECT {columns}, COUNT(*) AS count FROM employee_status{where}"
+        if group_by:
+            sql += f" GROUP BY {columns}"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows if row["count"]]
+
+    def teams(self) -> List[str]:
+        """全部班组（走班组索引）"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT team FROM employee_status WHERE team != '' ORDER BY team"
+            ).fetchall()
+        return [row["team"] for row in rows]
+
+    def count(self, **filters: Optional[str]) -> int:
+        where, params = self._where(**filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM employee_status{where}", params).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
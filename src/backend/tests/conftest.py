@@ -0,0 +1,12 @@
+"""
+测试公共配置：把后端目录加入导入路径，员工状态存储使用内存数据库
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+os.environ.setdefault("EMPLOYEE_STORE_PATH", ":memory:")
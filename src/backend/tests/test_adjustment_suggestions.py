@@ -0,0 +1,61 @@
+"""请假调整建议的候选人员筛选"""
+
+from models import LeaveInfo, PositionGroup, SchedulingResult, TeamWorkload
+from tools import SchedulingEngine
+from tools.skill_matrix import SkillMatrix
+
+import numpy as np
+
+DATE = "2025/01/08"
+
+
+def _group(code, level, demand, assigned_ids):
+    workers = [
+        SchedulingResult(岗位编码=code, 姓名=w, 工号=w, 技能等级=level, 班组="A", 工作中心="总装", 日期=DATE)
+        for w in assigned_ids
+    ]
+    return PositionGroup(
+        岗位编码=code, 岗位名称=code, 工作中心="总装", 班组="A", 技能等级=f"{level}级",
+        需求人数=demand, 已排人数=len(workers), 员工列表=workers
+    )
+
+
+def _suggested_workers(required_level):
+    # W1: P1=1（不在技能等级分布中）, P2=3；W2: P1=2；W3: P1=0, P2=3
+    matrix = SkillMatrix(
+        worker_ids=["W1", "W2", "W3", "X"],
+        names=["W1", "W2", "W3", "X"],
+        teams=["B", "B", "B", "A"],
+        position_codes=["P1", "P2"],
+        levels=np.array([[1, 3], [2, 0], [0, 3], [3, 0]])
+    )
+    # 缺口3人，候选人数不足缺口，全部符合条件的员工都会被建议
+    groups = [_group("P1", required_level, 3, ["X"])]
+    leaves = [LeaveInfo(工号="X", 姓名="X", 请假日期=DATE, 请假类型="事假")]
+    engine = SchedulingEngine()
+    workloads = engine.calculate_team_workloads(groups, leaves, matrix, DATE)
+    suggestions = engine.generate_adjustment_suggestions(groups, leaves, workloads, matrix, DATE)
+    return {
+        person["工号"]: person["技能等级"]
+        for suggestion in suggestions if suggestion.调整类型 != "加班补偿"
+        for person in suggestion.调整人员
+    }
+
+
+def test_level_one_workers_do_not_qualify_for_level_two():
+    assert _suggested_workers(required_level=2) == {"W2": 2}
+
+
+def test_candidates_for_level_one_include_unlisted_skill():
+    matrix = SkillMatrix(
+        worker_ids=["W3", "X"], names=["W3", "X"], teams=["B", "A"],
+        position_codes=["P1", "P2"], levels=np.array([[0, 3], [3, 0]])
+    )
+    groups = [_group("P1", 1, 1, ["X"])]
+    leaves = [LeaveInfo(工号="X", 姓名="X", 请假日期=DATE, 请假类型="事假")]
+    engine = SchedulingEngine()
+    workloads = engine.calculate_team_workloads(groups, leaves, matrix, DATE)
+    suggestions = engine.generate_adjustment_suggestions(groups, leaves, workloads, matrix, DATE)
+
+    people = [p for s in suggestions if s.调整类型 != "加班补偿" for p in s.调整人员]
+    assert [(p["工号"], p["技能等级"]) for p in people] == [("W3", 0)]
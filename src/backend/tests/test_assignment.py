@@ -0,0 +1,64 @@
+"""单日最优指派：全局匹配、排除名单和技能要求"""
+
+import numpy as np
+
+from models import PositionData
+from tools import SchedulingEngine
+from tools.assignment import solve_day_assignment
+from tools.skill_index import SchedulingIndex
+from tools.skill_matrix import SkillMatrix
+
+
+def _index():
+    # W1 会 P1、P2；W2 只会 P1；W3 会 P1 但技能不足；W4 会 P1 且技能过高
+    matrix = SkillMatrix(
+        worker_ids=["W1", "W2", "W3", "W4"],
+        names=["W1", "W2", "W3", "W4"],
+        teams=["A", "A", "A", "A"],
+        position_codes=["P1", "P2"],
+        levels=np.array([[3, 3], [3, 0], [1, 0], [5, 0]])
+    )
+    positions = [
+        PositionData(工作中心="总装", 岗位编码="P1", 岗位技能等级=3),
+        PositionData(工作中心="总装", 岗位编码="P2", 岗位技能等级=3),
+    ]
+    return SchedulingIndex(positions, matrix)
+
+
+def _ids(index, selections):
+    return {code: [index.skill_matrix.worker_ids[row] for row, _ in rows] for code, rows in selections.items()}
+
+
+def test_optimal_keeps_scarce_worker_for_position_only_they_can_fill():
+    index = _index()
+    demand = {"P1": 1, "P2": 1}
+
+    greedy = SchedulingEngine()._select_workers_greedy(demand, index, {"W3", "W4"})
+    assigned = {"W3", "W4"}
+    optimal = solve_day_assignment(demand, index, assigned)
+
+    assert _ids(index, greedy)["P2"] == []
+    assert _ids(index, optimal) == {"P1": ["W2"], "P2": ["W1"]}
+    assert assigned == {"W1", "W2", "W3", "W4"}
+
+
+def test_excluded_workers_are_not_assigned():
+    index = _index()
+    selections = solve_day_assignment({"P1": 2, "P2": 1}, index, {"W1"})
+
+    assert _ids(index, selections) == {"P1": ["W4", "W2"], "P2": []}
+
+
+def test_under_skilled_worker_used_only_as_last_resort():
+    index = _index()
+    selections = solve_day_assignment({"P1": 3}, index, {"W1"})
+    assert sorted(_ids(index, selections)["P1"]) == ["W2", "W3", "W4"]
+
+    selections = solve_day_assignment({"P1": 1}, index, {"W1", "W2"})
+    # 技能过高者优先于技能不足者
+    assert _ids(index, selections)["P1"] == ["W4"]
+
+
+def test_unknown_positions_ignored():
+    index = _index()
+    assert solve_day_assignment({"P9": 2}, index, set()) == {}
@@ -0,0 +1,89 @@
+"""人员可用性区间树：与逐条扫描的结果一致"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from models import EmployeeStatusRecord, LeaveInfo
+from tools import AvailabilityIndex
+from tools.availability import to_ordinal
+
+BASE = date(2025, 1, 1)
+
+
+@pytest.fixture(scope="module")
+def intervals():
+    rng = random.Random(7)
+    items = []
+    for i in range(300):
+        start = BASE + timedelta(days=rng.randint(0, 90))
+        end = None if i % 50 == 0 else start + timedelta(days=rng.randint(0, 20))
+        items.append((start, end, f"W{rng.randint(0, 80)}", i))
+    return items
+
+
+def _covers(item, day):
+    start, end, _, _ = item
+    return start <= day and (end is None or day <= end)
+
+
+def test_stab_queries_match_linear_scan(intervals):
+    index = AvailabilityIndex(intervals)
+    assert len(index) == len(intervals)
+    for offset in range(-3, 120, 3):
+        day = BASE + timedelta(days=offset)
+        expected = [item for item in intervals if _covers(item, day)]
+        assert index.unavailable_on(day) == {item[2] for item in expected}
+        assert sorted(index.records_on(day)) == sorted(item[3] for item in expected)
+        for worker_id in ("W0", "W7", "W40", "W99"):
+            assert index.is_unavailable(worker_id, day) == any(item[2] == worker_id for item in expected)
+
+
+def test_range_query_matches_daily_queries(intervals):
+    index = AvailabilityIndex(intervals)
+    between = index.unavailable_between("2025/02/01", "2025-02-20")
+    assert len(between) == 20
+    for key, workers in between.items():
+        assert workers == index.unavailable_on(key)
+    assert index.unavailable_between("2025-02-20", "2025-02-01") == {}
+
+
+def test_build_from_leaves_and_status_records():
+    leaves = [
+        LeaveInfo(工号="A", 姓名="A", 请假日期="2025/1/6", 请假类型="事假"),
+        LeaveInfo(工号="B", 姓名="B", 请假日期="2025-01-06", 请假类型="年假", 结束日期="2025-01-08"),
+    ]
+    records = [EmployeeStatusRecord(
+        id="r", employee_id="C", employee_name="C", team="A", status_type="辞职", shift_type="白班",
+        start_date="2025-01-07", end_date=None, created_at="2025-01-01 00:00:00"
+    )]
+    index = AvailabilityIndex.build(leaves, records)
+    assert index.unavailable_on("2025/01/06") == {"A", "B"}
+    assert index.unavailable_on("2025-01-08 09:30:00") == {"B", "C"}
+    assert index.unavailable_on("2030-06-01") == {"C"}
+    assert not index.is_unavailable("A", "2025/01/07")
+
+
+def test_reversed_interval_and_date_formats():
+    index = AvailabilityIndex([("2025-01-10", "2025-01-05", "X", None)])
+    assert index.is_unavailable("X", "2025/1/7")
+    assert to_ordinal("2025/01/07") == to_ordinal("2025-1-7") == date(2025, 1, 7).toordinal()
+    assert AvailabilityIndex().unavailable_on("2025-01-07") == set()
+
+
+def test_employee_status_only_used_when_requested(monkeypatch):
+    from router import scheduling
+    from storage import EmployeeStatusStore
+
+    store = EmployeeStatusStore()
+    store.add(EmployeeStatusRecord(
+        id="r", employee_id="C", employee_name="C", team="A", status_type="请假", shift_type="白班",
+        start_date="2025-01-06", end_date="2025-01-08", created_at="2025-01-01 00:00:00"
+    ))
+    monkeypatch.setattr(scheduling, "employee_store", store)
+
+    assert scheduling.build_availability([], False, "2025/01/07", "2025/01/07") is None
+    index = scheduling.build_availability([], True, "2025/01/07", "2025/01/07")
+    assert index.unavailable_on("2025/01/07") == {"C"}
+    store.close()
@@ -0,0 +1,43 @@
+"""产能填充：跳过已满日期，结果与逐日扫描一致"""
+
+import random
+
+from tools.capacity_fill import CapacityFiller
+
+
+def _naive_fill(remaining, quantity):
+    allocations = []
+    for i, free in enumerate(remaining):
+        if quantity <= 0:
+            break
+        amount = min(quantity, free)
+        if amount > 0:
+            allocations.append((i, amount))
+            remaining[i] -= amount
+            quantity -= amount
+    return allocations
+
+
+def test_fill_spans_days_and_skips_full_days():
+    filler = CapacityFiller({"2025-01-08": 50, "2025-01-06": 100, "2025-01-07": 0})
+
+    assert filler.dates == ["2025-01-06", "2025-01-07", "2025-01-08"]
+    assert filler.fill(80) == [(0, 80)]
+    assert filler.fill(40) == [(0, 20), (2, 20)]
+    assert filler.used == [100, 0, 20]
+    # 超出总产能的部分不安排
+    assert filler.fill(100) == [(2, 30)]
+    assert filler.fill(10) == []
+    assert filler.remaining == [0, 0, 0]
+
+
+def test_fill_matches_day_by_day_scan():
+    rng = random.Random(7)
+    for _ in range(50):
+        capacities = {f"2025-01-{day:02d}": rng.choice([0, 0, 30, 100, 180]) for day in range(1, 29)}
+        filler = CapacityFiller(capacities)
+        remaining = [capacities[date] for date in sorted(capacities)]
+        for _ in range(20):
+            quantity = rng.randint(0, 250)
+            assert filler.fill(quantity) == _naive_fill(remaining, quantity)
+        assert filler.remaining == remaining
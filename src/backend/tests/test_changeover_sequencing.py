@@ -0,0 +1,84 @@
+"""转产感知排序和节省转产时间"""
+
+import pytest
+
+from models import CapacityPlan, CustomerOrder
+from tools import ProductionSchedulingEngine
+from tools.changeover_sequencing import sequence_changeover_minutes, sequence_orders
+
+HL, SMALL = "C1B010000036", "C1B010000037"
+
+
+def _orders(products):
+    return [
+        CustomerOrder(
+            order_id=f"O{i}", customer_name="客户", product_code=product, quantity=10,
+            due_date="2025-01-10", order_date="2025-01-01"
+        )
+        for i, product in enumerate(products)
+    ]
+
+
+@pytest.fixture
+def engine():
+    return ProductionSchedulingEngine()
+
+
+def test_sequence_batches_box_types_within_due_window(engine):
+    orders = _orders([HL, SMALL, HL, SMALL])
+    sequenced = sequence_orders(
+        orders, "顶板发泡", engine.get_box_type_for_product, engine.get_changeover_time
+    )
+    assert [o.order_id for o in sequenced] == ["O0", "O2", "O1", "O3"]
+
+    cost = lambda seq: sequence_changeover_minutes(
+        seq, "顶板发泡", engine.get_box_type_for_product, engine.get_changeover_time
+    )
+    assert cost(orders) == 150 + 180 + 150 + 180
+    assert cost(sequenced) == 150 + 180
+
+
+def test_sequence_keeps_priority_segments_in_order(engine):
+    orders = _orders([HL, SMALL, HL])
+    orders[0].priority = 5
+    sequenced = sequence_orders(
+        engine.sort_orders(orders), "顶板发泡", engine.get_box_type_for_product, engine.get_changeover_time
+    )
+    assert sequenced[0].order_id == "O0"
+
+
+@pytest.mark.parametrize("timing", ["capacity", "timeline"])
+@pytest.mark.parametrize("products, saved", [
+    ([HL, SMALL, SMALL, HL], 30),
+    ([SMALL, HL, HL, SMALL], 0),
+])
+def test_changeover_saving_counts_every_box_type_switch(engine, timing, products, saved):
+    # 每天产能20台、每单10台：capacity 模式只在每天第一个计划上计转产，
+    # 节省时间仍按两种顺序各自的箱型切换计算（总装：HL 转产30分钟，20尺小箱无需转产）
+    plan = CapacityPlan(
+        plan_id="p", plan_name="p", daily_capacities={f"2025-01-{6 + d:02d}": 20 for d in range(5)}
+    )
+    schedules = engine.calculate_work_center_schedule(
+        _orders(products), plan, sequencing="changeover", timing=timing
+    )
+    assert schedules["总装"].efficiency_metrics["节省转产时间"] == saved
+
+
+def test_changeover_mode_fills_each_work_center_once(engine, monkeypatch):
+    fills = []
+    original = engine._fill_work_center
+
+    def counting_fill(work_center, wc_orders, capacity_plan, dates):
+        fills.append((work_center, [o.order_id for o in wc_orders]))
+        return original(work_center, wc_orders, capacity_plan, dates)
+
+    monkeypatch.setattr(engine, "_fill_work_center", counting_fill)
+    plan = CapacityPlan(plan_id="p", plan_name="p", daily_capacities={"2025-01-06": 100})
+    orders = _orders([HL, SMALL, HL])
+    schedules = engine.calculate_work_center_schedule(orders, plan, sequencing="changeover")
+
+    assert len(fills) == len(schedules)
+    # 填充的是转产感知排序后的顺序
+    expected = sequence_orders(orders, "总装", engine.get_box_type_for_product, engine.get_changeover_time)
+    assert dict(fills)["总装"] == [o.order_id for o in expected]
+    assert dict(fills)["总装"] != [o.order_id for o in orders]
@@ -0,0 +1,40 @@
+"""产能成本查找表和批量方案成本"""
+
+import numpy as np
+import pytest
+
+from models import CapacityPlan
+from tools import ProductionSchedulingEngine
+from tools.cost_table import LABOR_PRICE, CapacityCostTable
+
+CONFIG = {
+    100: {"能耗": 700, "人效": 4.0},
+    120: {"能耗": 900, "人效": 5.0},
+}
+
+
+def test_lookup_interpolates_and_clamps():
+    table = CapacityCostTable(CONFIG)
+    np.testing.assert_allclose(table.level_costs([110]), [800 + 4.5 * LABOR_PRICE])
+    np.testing.assert_allclose(table.level_costs([50, 500]), table.level_costs([100, 120]))
+
+
+def test_evaluate_sums_per_plan_including_empty_plans():
+    costs = CapacityCostTable(CONFIG).evaluate([[100, 120], [], [110]])
+    np.testing.assert_allclose(costs["energy_cost"], [1600, 0, 800])
+    np.testing.assert_allclose(costs["labor_cost"], [9 * LABOR_PRICE, 0, 4.5 * LABOR_PRICE])
+    np.testing.assert_allclose(costs["total_cost"], costs["energy_cost"] + costs["labor_cost"])
+
+
+def test_engine_cost_table_rebuilt_when_config_replaced():
+    engine = ProductionSchedulingEngine()
+    assert engine._cost_table is None
+    table = engine.cost_table
+    assert engine.cost_table is table
+
+    engine.capacity_config = CONFIG
+    plan = CapacityPlan(plan_id="p", plan_name="p", daily_capacities={"2025-01-06": 110})
+    assert engine.cost_table is not table
+    assert engine.calculate_plan_costs([plan])[0] == pytest.approx({
+        "energy_cost": 800.0, "labor_cost": 4.5 * LABOR_PRICE, "total_cost": 800.0 + 4.5 * LABOR_PRICE
+    })
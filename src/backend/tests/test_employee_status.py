@@ -0,0 +1,93 @@
+"""员工状态存储和列表接口"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models import EmployeeStatusRecord
+from router import employee
+from storage import EmployeeStatusStore
+
+
+def _record(i, start="2025-01-06", end="2025-01-08", status="请假", shift="白班", team="A"):
+    return EmployeeStatusRecord(
+        id=f"r{i}", employee_id=f"E{i:04d}", employee_name=f"员工{i}", team=team,
+        status_type=status, shift_type=shift, start_date=start, end_date=end,
+        created_at=f"2025-01-01 00:{i // 60:02d}:{i % 60:02d}"
+    )
+
+
+@pytest.fixture
+def store():
+    store = EmployeeStatusStore(":memory:")
+    employee.init_employee_store(store)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def client(store):
+    return TestClient(app)
+
+
+def test_date_range_filter_matches_overlapping_records(store):
+    store.add_many([
+        _record(1, "2025-01-01", "2025-01-03"),
+        _record(2, "2025/1/5", "2025/1/9"),
+        _record(3, "2025-01-10", None, status="辞职"),
+    ])
+
+    ids = lambda **f: sorted(r.id for r in store.query(**f))
+    assert ids(start_date="2025-01-04", end_date="2025-01-06") == ["r2"]
+    # 未填结束日期的记录一直有效
+    assert ids(start_date="2030-01-01") == ["r3"]
+    assert store.count(status_type="请假") == 2
+
+
+def test_grouped_counts(store):
+    store.add_many([_record(i, shift="夜班" if i % 3 == 0 else "白班") for i in range(9)])
+    counts = {row["shift_type"]: row["count"] for row in store.grouped_counts(("shift_type",))}
+    assert counts == {"白班": 6, "夜班": 3}
+
+
+def test_list_returns_all_records_without_paging_params(store, client):
+    store.add_many([_record(i) for i in range(150)])
+
+    body = client.get("/employee-status/list").json()
+    assert len(body["records"]) == 150
+    assert body["summary"]["total_records"] == 150
+    assert body["summary"]["total_pages"] == 1
+
+
+def test_list_pages_when_requested(store, client):
+    store.add_many([_record(i) for i in range(150)])
+
+    body = client.get("/employee-status/list", params={"page": 2, "page_size": 100}).json()
+    assert len(body["records"]) == 50
+    assert body["summary"]["total_pages"] == 2
+    # 按创建时间倒序，第2页是最早创建的50条
+    assert body["records"][0]["id"] == "r49"
+
+    body = client.get("/employee-status/list", params={"page": 1}).json()
+    assert len(body["records"]) == 100
+
+    assert client.get("/employee-status/list", params={"page_size": 5000}).status_code == 400
+
+
+def test_replace_all_keeps_records_when_insert_fails(store, monkeypatch):
+    store.add_many([_record(i) for i in range(3)])
+    row_values = store._row_values
+
+    def failing(record):
+        if record.id == "r11":
+            raise ValueError("bad record")
+        return row_values(record)
+
+    monkeypatch.setattr(store, "_row_values", failing)
+    with pytest.raises(ValueError):
+        store.replace_all([_record(10), _record(11)])
+
+    assert sorted(r.id for r in store.all()) == ["r0", "r1", "r2"]
+    monkeypatch.undo()
+    store.replace_all([_record(10)])
+    assert [r.id for r in store.all()] == ["r10"]
@@ -0,0 +1,77 @@
+"""响应编码协商、压缩阈值和端点的 MessagePack / 压缩输出"""
+
+import gzip
+
+import pytest
+from fastapi.responses import Response
+from fastapi.testclient import TestClient
+
+from main import app
+from router import encoding
+
+
+def test_negotiate_media_type():
+    pytest.importorskip("msgpack")
+    assert encoding.negotiate_media_type(None) == encoding.JSON_MEDIA_TYPE
+    assert encoding.negotiate_media_type("*/*") == encoding.JSON_MEDIA_TYPE
+    assert encoding.negotiate_media_type("application/msgpack") == encoding.MSGPACK_MEDIA_TYPE
+    assert encoding.negotiate_media_type("application/x-msgpack, */*;q=0.5") == encoding.MSGPACK_MEDIA_TYPE
+    assert encoding.negotiate_media_type("application/json, application/msgpack;q=0.8") == encoding.JSON_MEDIA_TYPE
+    assert encoding.negotiate_media_type("application/msgpack;q=0") == encoding.JSON_MEDIA_TYPE
+
+
+def test_negotiate_content_encoding(monkeypatch):
+    assert encoding.negotiate_content_encoding(None) is None
+    assert encoding.negotiate_content_encoding("identity") is None
+    assert encoding.negotiate_content_encoding("gzip") == "gzip"
+    assert encoding.negotiate_content_encoding("gzip;q=0, *") in ("br", "gzip")
+    assert encoding.negotiate_content_encoding("gzip;q=0") is None
+
+    monkeypatch.setattr(encoding, "brotli", object())
+    assert encoding.negotiate_content_encoding("gzip, br") == "br"
+    assert encoding.negotiate_content_encoding("gzip, br;q=0.5") == "gzip"
+    monkeypatch.setattr(encoding, "brotli", None)
+    assert encoding.negotiate_content_encoding("br") is None
+    assert encoding.negotiate_content_encoding("gzip, br") == "gzip"
+
+
+def test_compress_response_threshold():
+    small = Response(b"x" * (encoding.COMPRESS_MIN_BYTES - 1))
+    assert encoding.compress_response(small, "gzip").headers.get("content-encoding") is None
+
+    body = b"x" * encoding.COMPRESS_MIN_BYTES
+    large = encoding.compress_response(Response(body), "gzip")
+    assert large.headers["content-encoding"] == "gzip"
+    assert large.headers["content-length"] == str(len(large.body))
+    assert "Accept-Encoding" in large.headers["vary"]
+    assert gzip.decompress(large.body) == body
+
+
+def _multi_plan_request():
+    return {
+        "orders": [
+            {"order_id": f"O{i}", "customer_name": "客户", "product_code": "P1", "quantity": 30,
+             "due_date": "2025-01-10", "order_date": "2025-01-01"}
+            for i in range(60)
+        ],
+        "start_date": "2025-01-06"
+    }
+
+
+def test_endpoint_msgpack_matches_json_and_large_body_compressed():
+    msgpack = pytest.importorskip("msgpack")
+    client = TestClient(app)
+    as_json = client.post("/production/multi-plan", json=_multi_plan_request(),
+                          headers={"Accept-Encoding": "identity"})
+    as_msgpack = client.post("/production/multi-plan", json=_multi_plan_request(),
+                             headers={"Accept": "application/msgpack", "Accept-Encoding": "gzip"})
+
+    assert as_json.status_code == as_msgpack.status_code == 200
+    assert as_json.headers["content-type"].startswith(encoding.JSON_MEDIA_TYPE)
+    assert "content-encoding" not in as_json.headers
+    assert len(as_json.content) >= encoding.COMPRESS_MIN_BYTES
+
+    assert as_msgpack.headers["content-type"] == encoding.MSGPACK_MEDIA_TYPE
+    assert as_msgpack.headers["content-encoding"] == "gzip"
+    assert "Accept" in as_msgpack.headers["vary"]
+    assert msgpack.unpackb(as_msgpack.content, raw=False) == as_json.json()
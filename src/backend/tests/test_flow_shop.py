@@ -0,0 +1,97 @@
+"""多工序流水车间排产：工序先后、工作中心不重叠、完工与阻塞"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import CapacityPlan, CustomerOrder
+from tools import ProductionSchedulingEngine
+
+HL, SMALL = "C1B010000036", "C1B010000037"
+DATES = ["2025-01-06", "2025-01-07", "2025-01-08", "2025-01-09", "2025-01-10", "2025-01-11"]
+
+
+@pytest.fixture
+def engine():
+    return ProductionSchedulingEngine()
+
+
+def _order(i, product, quantity, priority=1, due="2025-01-10"):
+    return CustomerOrder(
+        order_id=f"O{i}", customer_name="客户", product_code=product, quantity=quantity,
+        due_date=due, priority=priority, order_date="2025-01-01"
+    )
+
+
+def _plan(capacity=180, dates=DATES):
+    return CapacityPlan(plan_id="p", plan_name="p", daily_capacities={d: capacity for d in dates})
+
+
+def _moment(date, clock):
+    hours, minutes = (int(part) for part in clock.split(":"))
+    return datetime.strptime(date, "%Y-%m-%d") + timedelta(hours=hours, minutes=minutes)
+
+
+def _spans(result):
+    """工作中心 -> 订单产品 -> [(开始, 结束)]"""
+    spans = {}
+    for work_center, schedule in result["work_center_schedules"].items():
+        for date, plans in schedule.daily_plans.items():
+            for plan in plans:
+                spans.setdefault(work_center, []).append(
+                    (_moment(date, plan.start_time), _moment(date, plan.end_time), plan.product_code)
+                )
+    return spans
+
+
+def test_get_routing_filters_by_sku_and_appends_extra_work_centers(engine):
+    sku_data = [["产品", "", "", "工作中心"], [HL, "", "", "总装"], [HL, "", "", "前框"], [HL, "", "", "包装"]]
+    assert engine.get_routing(HL, sku_data) == [["前框"], ["总装"], ["包装"]]
+    assert engine.get_routing(HL) == engine.routing_config["HL"]
+    assert engine.get_routing("未知产品", sku_data) == [["默认工作中心"]]
+
+
+def test_stages_follow_routing_with_buffer(engine):
+    result = engine.calculate_flow_shop_schedule([_order(0, HL, 60)], _plan(), buffer_minutes=30)
+    spans = _spans(result)
+    routing = engine.get_routing(HL)
+    assert set(spans) == {wc for stage in routing for wc in stage}
+
+    previous_end = None
+    for stage in routing:
+        starts = [min(s for s, _, _ in spans[wc]) for wc in stage]
+        ends = [max(e for _, e, _ in spans[wc]) for wc in stage]
+        if previous_end is not None:
+            # 计划时段不含转产，开始时刻不早于上一工序完工 + 缓冲
+            assert min(starts) >= previous_end + timedelta(minutes=30)
+        previous_end = max(ends)
+
+    completion = result["order_completions"][0]
+    assert completion["completed"] and completion["blocked_work_center"] is None
+    assert completion["finish"] == previous_end.strftime("%Y-%m-%d %H:%M")
+    assert result["completed_orders"] == 1
+
+
+def test_work_centers_never_run_two_orders_at_once(engine):
+    orders = [_order(i, HL if i % 2 else SMALL, 40 + 10 * i, priority=1 + i % 3) for i in range(6)]
+    result = engine.calculate_flow_shop_schedule(orders, _plan(), sequencing="changeover")
+    for work_center, spans in _spans(result).items():
+        spans.sort()
+        for (_, end, _), (start, _, _) in zip(spans, spans[1:]):
+            assert start >= end, work_center
+    assert result["completed_orders"] == len(orders)
+    bottleneck = result["bottleneck"]
+    utilizations = {
+        wc: s.efficiency_metrics["时间利用率"] for wc, s in result["work_center_schedules"].items()
+    }
+    assert bottleneck["时间利用率"] == max(utilizations.values())
+
+
+def test_order_blocked_when_horizon_too_short(engine):
+    result = engine.calculate_flow_shop_schedule([_order(0, HL, 500)], _plan(dates=DATES[:1]))
+    completion = result["order_completions"][0]
+    assert not completion["completed"]
+    assert completion["blocked_work_center"] in engine.routing_config["HL"][0]
+    assert result["makespan_minutes"] == 0
+    # 被阻塞的订单不进入后续工序
+    assert set(result["work_center_schedules"]) == set(engine.routing_config["HL"][0])
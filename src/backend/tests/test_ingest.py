@@ -0,0 +1,69 @@
+"""表格数据导入"""
+
+import io
+
+import pandas as pd
+import pytest
+
+from tools import SchedulingEngine, ingest
+from tools.ingest import frame_from_rows, normalize_frame
+
+
+def _sku_row(product="HL-20GP", position="GW001", headcount=3, box_type="HL"):
+    return [product, "20尺标准箱", "", "总装", position] + [""] * 11 + [headcount, box_type]
+
+
+def test_blank_headers_keep_column_positions():
+    # 上传的SKU表常有多个空白标题单元格
+    headers = ["产成品编码", "", "", "工作中心", "岗位编码"] + [""] * 11 + ["需求人数", "箱型"]
+    tasks = SchedulingEngine().process_sku_data([headers, _sku_row()])
+
+    assert len(tasks) == 1
+    task = tasks[0]
+    assert (task.产成品编码, task.岗位编码, task.需求人数, task.工作中心, task.箱型) == (
+        "HL-20GP", "GW001", 3, "总装", "HL"
+    )
+
+
+def test_duplicate_headers_keep_column_positions():
+    headers = ["列"] * 18
+    tasks = SchedulingEngine().process_sku_data([headers, _sku_row(position="GW002", headcount=5)])
+
+    assert [(t.岗位编码, t.需求人数) for t in tasks] == [("GW002", 5)]
+
+
+def test_position_table_with_blank_headers():
+    headers = [""] * 13
+    row = ["", "", "总装", "", "", "GW001"] + [""] * 6 + [3]
+    positions = SchedulingEngine().process_position_data([headers, row])
+
+    assert [(p.工作中心, p.岗位编码, p.岗位技能等级) for p in positions] == [("总装", "GW001", 3)]
+
+
+def test_normalize_frame_restores_integer_columns_and_none():
+    df = pd.DataFrame([[1.0, None], [None, "a"]], columns=["x", "x"])
+    normalized = normalize_frame(df)
+
+    assert list(normalized.columns) == ["x", "x"]
+    assert normalized.iloc[:, 0].tolist() == [1, None]
+    assert normalized.iloc[:, 1].tolist() == [None, "a"]
+
+
+def test_short_rows_are_dropped():
+    frame = frame_from_rows([["a", "b", "c"], [1, 2, 3], [1]], min_columns=3)
+    assert frame.shape == (1, 3)
+
+
+@pytest.mark.parametrize("engine, module", [("calamine", "python_calamine"), (None, "openpyxl")])
+def test_read_excel_frame_with_each_engine(monkeypatch, engine, module):
+    pytest.importorskip(module)
+    monkeypatch.setattr(ingest, "EXCEL_ENGINE", engine)
+    buffer = io.BytesIO()
+    pd.DataFrame(
+        [["HL", 3, None], ["DC", None, "总装"]], columns=["产品", "人数", "工作中心"]
+    ).to_excel(buffer, index=False)
+
+    frame = ingest.read_excel_frame(buffer.getvalue())
+
+    assert list(frame.columns) == ["产品", "人数", "工作中心"]
+    assert frame.values.tolist() == [["HL", 3, None], ["DC", None, "总装"]]
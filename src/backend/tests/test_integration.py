@@ -0,0 +1,34 @@
+"""排产到排班集成：失败日期记录在集成指标中"""
+
+from models import ProductionScheduleResult, ProductionToSchedulingRequest
+from tools import ProductionSchedulingEngine, SchedulingEngine
+
+
+def _day(date):
+    return [ProductionScheduleResult(
+        order_id="O1", customer_name="客户", product_code="P1", quantity=50,
+        scheduled_date=date, capacity_used=50, completion_date=date, delay_days=0
+    )]
+
+
+def test_failed_days_reported_in_metrics(monkeypatch, capsys):
+    original = SchedulingEngine._assign_positions
+
+    def failing(self, target_date, *args, **kwargs):
+        if target_date == "2025/01/07":
+            raise RuntimeError("无可用员工")
+        return original(self, target_date, *args, **kwargs)
+
+    monkeypatch.setattr(SchedulingEngine, "_assign_positions", failing)
+    request = ProductionToSchedulingRequest(
+        selected_plan_id="baseline",
+        production_schedule={date: _day(date) for date in ("2025-01-06", "2025-01-07")}
+    )
+
+    response = ProductionSchedulingEngine().integrate_production_to_scheduling(request)
+
+    assert list(response.daily_schedules) == ["2025-01-06"]
+    metrics = response.integration_metrics
+    assert metrics["failed_days"] == [{"date": "2025-01-07", "detail": "无可用员工"}]
+    assert metrics["integration_success_rate"] == 0.5
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,78 @@
+"""批量请假后的单日排班增量修补"""
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from main import app
+from models import LeaveInfo, PositionGroup, SchedulingResult
+from tools import SchedulingEngine
+from tools.skill_matrix import SkillMatrix
+
+DATE = "2025/01/08"
+
+
+def _worker(code, worker_id, level=3, team="A"):
+    return SchedulingResult(
+        岗位编码=code, 姓名=worker_id, 工号=worker_id, 技能等级=level, 班组=team, 工作中心="总装", 日期=DATE
+    )
+
+
+def _group(code, demand, worker_ids, level=3):
+    workers = [_worker(code, w, level) for w in worker_ids]
+    return PositionGroup(
+        岗位编码=code, 岗位名称=code, 工作中心="总装", 班组="A", 技能等级=f"{level}级",
+        需求人数=demand, 已排人数=len(workers), 员工列表=workers
+    )
+
+
+def _matrix():
+    # W1-W3 已排班；F1: P1=2 同班组；F2: P1=3 其他班组；F3: P1=4 被排除；F4: P1=1 技能不足
+    return SkillMatrix(
+        worker_ids=["W1", "W2", "W3", "F1", "F2", "F3", "F4"],
+        names=["W1", "W2", "W3", "F1", "F2", "F3", "F4"],
+        teams=["A", "A", "A", "A", "B", "A", "A"],
+        position_codes=["P1", "P2"],
+        levels=np.array([[3, 0], [3, 0], [0, 3], [2, 0], [3, 0], [4, 0], [1, 0]])
+    )
+
+
+def test_patch_replaces_unavailable_workers_only_in_affected_groups():
+    groups = [_group("P1", 2, ["W1", "W2"]), _group("P2", 1, ["W3"])]
+    leaves = [LeaveInfo(工号="W1", 姓名="W1", 请假日期=DATE, 请假类型="事假")]
+
+    patch = SchedulingEngine().patch_day_schedule(
+        groups, leaves, _matrix(), DATE, excluded_workers=["F3"]
+    )
+
+    p1, p2 = patch["groups"]
+    # 满足技能要求者优先于同班组者；F3 被排除，F4 技能等级不足
+    assert [w.工号 for w in p1.员工列表] == ["W2", "F2"]
+    assert p1.已排人数 == 2
+    assert p2 is groups[1]
+    assert groups[0].已排人数 == 2 and [w.工号 for w in groups[0].员工列表] == ["W1", "W2"]
+    assert [d["岗位编码"] for d in patch["diff"]] == ["P1"]
+    assert patch["summary"]["补位人数"] == 1
+    assert patch["summary"]["剩余缺口"] == 0
+
+
+def test_patch_reports_shortage_when_no_candidate():
+    groups = [_group("P1", 2, ["W1", "W2"])]
+    leaves = [LeaveInfo(工号=w, 姓名=w, 请假日期=DATE, 请假类型="事假") for w in ("W1", "W2")]
+
+    patch = SchedulingEngine().patch_day_schedule(
+        groups, leaves, _matrix(), DATE, excluded_workers=["F1", "F2", "F3"]
+    )
+
+    assert patch["groups"][0].员工列表 == []
+    assert patch["diff"][0]["缺口"] == 2
+    assert patch["summary"]["移除人数"] == 2
+
+
+def test_leave_batch_requires_skill_data_or_dataset():
+    response = TestClient(app).post("/scheduling/leave/batch", json={
+        "current_date": DATE,
+        "leaves": [],
+        "groups": [_group("P1", 1, ["W1"]).model_dump()],
+        "use_employee_status": False
+    })
+    assert response.status_code == 400
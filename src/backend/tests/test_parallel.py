@@ -0,0 +1,57 @@
+"""共享进程池：并行度上限、进程池复用和并行评估结果"""
+
+import pytest
+
+from models import CustomerOrder
+from tools import ProductionSchedulingEngine, parallel
+
+
+@pytest.fixture
+def pool_workers(monkeypatch):
+    monkeypatch.setattr(parallel, "max_pool_workers", 2)
+    yield 2
+    parallel.shutdown_shared_pool()
+
+
+def _orders():
+    return [
+        CustomerOrder(
+            order_id=f"O{i}", customer_name=f"客户{i % 3}", product_code=f"P{i % 4}",
+            quantity=60 + 15 * i, due_date=f"2025-01-{8 + i % 10:02d}",
+            priority=1 + i % 5, order_date="2025-01-01"
+        )
+        for i in range(12)
+    ]
+
+
+def test_effective_workers_capped_by_pool_size(pool_workers):
+    assert parallel.effective_workers(64, 10) == 2
+    assert parallel.effective_workers(64, 1) == 1
+    assert parallel.effective_workers(0, 10) == 0
+
+
+def test_init_shared_pool_capped_by_cpu_count(monkeypatch):
+    monkeypatch.setattr(parallel.os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(parallel, "max_pool_workers", 1)
+    parallel.init_shared_pool(64)
+    assert parallel.max_pool_workers == 2
+
+
+def test_parallel_evaluation_matches_serial_and_reuses_pool(pool_workers):
+    engine = ProductionSchedulingEngine()
+    dates = engine.get_working_dates("2025-01-06", weeks=2)
+    plans = engine.generate_capacity_plans(dates, 180, 10)
+    orders = _orders()
+    cost_params = {"production_cost_per_unit": 100.0, "delay_penalty": 200.0}
+
+    serial = engine.evaluate_capacity_plans(orders, plans, cost_params, workers=0)
+    parallel_plans = engine.evaluate_capacity_plans(orders, plans, cost_params, workers=64)
+    pool = parallel.shared_pool()
+    streamed = list(engine.iter_capacity_plan_evaluations(orders, plans, cost_params, workers=64))
+
+    assert parallel.shared_pool() is pool
+    assert [p.plan_id for p in parallel_plans] == [p.plan_id for p in serial]
+    assert [p.weekly_schedule for p in parallel_plans] == [p.weekly_schedule for p in serial]
+    assert [p.weekly_schedule for p in streamed] == [p.weekly_schedule for p in serial]
+    assert [p.metrics["cost_breakdown"] for p in parallel_plans] == [p.metrics["cost_breakdown"] for p in serial]
+    assert [p.total_cost for p in streamed] == [p.total_cost for p in serial]
@@ -0,0 +1,106 @@
+"""产能方案搜索：向量化评估、Pareto 筛选和可复现的局部搜索"""
+
+import random
+
+import numpy as np
+import pytest
+
+from models import CapacityPlan, CustomerOrder
+from tools import ProductionSchedulingEngine
+from tools.plan_search import (
+    CapacityPlanSearch, PlanEvaluator, pareto_mask, resolve_search_levels, select_spread
+)
+
+LEVELS = np.array([120, 150, 180])
+
+
+def _orders(count=15):
+    rng = random.Random(3)
+    return [
+        CustomerOrder(
+            order_id=f"O{i}", customer_name="客户", product_code="P1",
+            quantity=rng.choice([0, 40, 90, 200]), due_date=f"2025-01-{rng.randint(6, 20):02d}",
+            priority=rng.randint(1, 5), order_date="2025-01-01"
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def setup():
+    engine = ProductionSchedulingEngine()
+    dates = engine.get_working_dates("2025-01-06", weeks=2)
+    orders = _orders()
+    evaluator = PlanEvaluator(
+        engine.sort_orders(orders), dates, LEVELS, engine.cost_table.level_costs(LEVELS.tolist())
+    )
+    return engine, dates, orders, evaluator
+
+
+def test_evaluator_matches_day_by_day_schedule(setup):
+    engine, dates, orders, evaluator = setup
+    rng = np.random.default_rng(5)
+    plan_levels = rng.integers(0, len(LEVELS), size=(20, len(dates)))
+    scores = evaluator.evaluate(plan_levels)
+
+    for k, row in enumerate(plan_levels):
+        plan = CapacityPlan(
+            plan_id="p", plan_name="p", daily_capacities=dict(zip(dates, LEVELS[row].tolist()))
+        )
+        result = engine.calculate_production_schedule(orders, plan, {})
+        scheduled = {}
+        late = set()
+        for day_results in result.weekly_schedule.values():
+            for r in day_results:
+                scheduled[r.order_id] = scheduled.get(r.order_id, 0) + r.quantity
+                if r.delay_days > 0:
+                    late.add(r.order_id)
+        on_time = sum(
+            1 for o in orders
+            if o.quantity > 0 and scheduled.get(o.order_id) == o.quantity and o.order_id not in late
+        )
+
+        assert scores["completion_rate"][k] == pytest.approx(result.completion_rate)
+        assert scores["capacity_utilization"][k] == pytest.approx(result.capacity_utilization)
+        assert scores["on_time_rate"][k] == pytest.approx(on_time / len(orders))
+        assert scores["total_cost"][k] == pytest.approx(result.total_cost)
+
+
+def test_pareto_mask_drops_dominated_and_keeps_ties():
+    cost = np.array([100.0, 120.0, 100.0, 90.0, 100.0])
+    on_time = np.array([0.8, 0.8, 0.9, 0.5, 0.9])
+    utilization = np.array([0.9, 0.9, 0.9, 0.9, 0.9])
+    # 1 被 0 支配，0 被 2 支配；2 和 4 完全相同，都保留
+    assert pareto_mask(cost, on_time, utilization).tolist() == [False, False, True, True, True]
+
+
+def test_select_spread_keeps_both_ends():
+    assert select_spread(3, 10).tolist() == [0, 1, 2]
+    assert select_spread(11, 3).tolist() == [0, 5, 10]
+    assert len(select_spread(100, 10)) == 10
+
+
+def test_resolve_search_levels():
+    configured = [150, 100, 200, 120, 180]
+    assert resolve_search_levels(configured, 150, 30) == [120, 150, 180]
+    assert resolve_search_levels(configured, 155, 0) == [150]
+    assert resolve_search_levels(configured, 150, 30, [180, 120, 180]) == [120, 180]
+
+
+def test_search_returns_reproducible_pareto_front(setup):
+    *_, evaluator = setup
+
+    def run():
+        search = CapacityPlanSearch(
+            evaluator, time_budget=60, max_evaluations=3000, batch_size=128, seed=11
+        )
+        return search.run()
+
+    plans, scores = run()
+    again, _ = run()
+
+    np.testing.assert_array_equal(plans, again)
+    assert pareto_mask(scores["total_cost"], scores["on_time_rate"], scores["capacity_utilization"]).all()
+    assert np.all(np.diff(scores["total_cost"]) >= 0)
+    # 最低成本方案不会比全部选最低档位更贵
+    assert scores["total_cost"][0] <= evaluator.evaluate(np.zeros((1, plans.shape[1]), dtype=np.int64))["total_cost"][0]
@@ -0,0 +1,40 @@
+"""请求模型中取值受限的字段：不合法时在请求校验阶段返回422"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+
+ORDERS = [{"order_id": "O1", "customer_name": "客户", "product_code": "P1", "quantity": 100,
+           "due_date": "2025-01-10", "order_date": "2025-01-01"}]
+MULTI_PLAN = {"orders": ORDERS, "start_date": "2025-01-06"}
+INTEGRATION = {"selected_plan_id": "baseline", "production_schedule": {}}
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/scheduling/day", {"target_date": "2025/01/06", "product_code": "P1", "solver": "bogus"}),
+    ("/scheduling/day", {"target_date": "2025/01/06", "product_mix": {"P1": 1}, "mix_mode": "max"}),
+    ("/scheduling/day", {"target_date": "2025/01/06", "product_mix": {"P1": 1}, "reference_quantity": 0}),
+    ("/scheduling/week", {"start_date": "2025/01/06", "product_code": "P1", "weeks": 0}),
+    ("/scheduling/week", {"start_date": "2025/01/06", "product_code": "P1", "weeks": 1000}),
+    ("/scheduling/week/stream", {"start_date": "2025/01/06", "product_code": "P1", "solver": "bogus"}),
+    ("/scheduling/roster", {"start_date": "2025/01/06", "product_code": "P1", "horizon": "year"}),
+    ("/scheduling/roster", {"start_date": "2025/01/06", "product_code": "P1", "weeks": 1000}),
+    ("/production/multi-plan", {**MULTI_PLAN, "plan_mode": "bogus"}),
+    ("/production/multi-plan/stream", {**MULTI_PLAN, "plan_mode": "bogus"}),
+    ("/production/multi-plan", {**MULTI_PLAN, "plan_mode": "search", "search_time_budget": 0}),
+    ("/production/multi-plan", {**MULTI_PLAN, "plan_mode": "search", "search_time_budget": 3600}),
+    ("/production/multi-plan", {**MULTI_PLAN, "plan_mode": "search", "search_max_plans": 0}),
+    ("/production/multi-plan", {**MULTI_PLAN, "evaluation_workers": -1}),
+    ("/production/integrate-scheduling", {**INTEGRATION, "solver": "bogus"}),
+    ("/production/integrate-scheduling/stream", {**INTEGRATION, "solver": "bogus"}),
+    ("/production/integrate-scheduling", {**INTEGRATION, "reference_quantity": -1}),
+])
+def test_invalid_enum_and_range_values_rejected(client, path, body):
+    response = client.post(path, json=body)
+    assert response.status_code == 422, response.text
@@ -0,0 +1,84 @@
+"""产品工艺路线索引和按产品组合数量换算的单日岗位需求"""
+
+import numpy as np
+import pytest
+
+from models import TaskData
+from tools import ParsedDataset, SchedulingEngine
+from tools.routing_index import ProductRoutingIndex
+from tools.skill_matrix import SkillMatrix
+
+TASKS = [
+    TaskData(产成品编码="P1", 岗位编码="A", 需求人数=2, 工作中心="总装", 箱型="HL"),
+    TaskData(产成品编码="P1", 岗位编码="B", 需求人数=1, 工作中心="总装"),
+    TaskData(产成品编码="P1", 岗位编码="A", 需求人数=1, 工作中心="底板"),
+    TaskData(产成品编码="P2", 岗位编码="A", 需求人数=1, 工作中心="总装", 箱型="DC"),
+    TaskData(产成品编码="P2", 岗位编码="C", 需求人数=3, 工作中心="东冷"),
+]
+
+
+@pytest.fixture
+def index():
+    return ProductRoutingIndex(TASKS)
+
+
+def test_routing_merges_duplicate_positions(index):
+    assert index.routing("P1") == {
+        "product_code": "P1",
+        "box_type": "HL",
+        "work_centers": ["总装", "底板"],
+        "positions": {"A": 3, "B": 1}
+    }
+    assert index.routing("P9") is None
+    assert "P2" in index and len(index) == 2
+
+
+def test_daily_demands_use_stated_headcount_without_reference(index):
+    demands = index.daily_demands([{"P1": 1}, {"P1": 500, "P2": 60}, {"P2": 0}])
+    assert demands == [{"A": 3, "B": 1}, {"A": 4, "B": 1, "C": 3}, {}]
+
+
+def test_daily_demands_scale_with_reference_quantity(index):
+    demands = index.daily_demands([{"P1": 180}, {"P1": 90, "P2": 60}, {"P9": 100, "P2": 0}, {}], 180)
+    assert demands[0] == {"A": 3, "B": 1}
+    # A: 3×0.5 + 1/3 = 1.83 -> 2；B: 0.5 -> 1；C: 3/3 = 1（浮点误差不多算1人）
+    assert demands[1] == {"A": 2, "B": 1, "C": 1}
+    assert demands[2] == {}
+    assert demands[3] == {}
+
+
+def test_demand_matrix_rounds_up(index):
+    quantities = index.quantity_matrix([{"P1": 1}])
+    np.testing.assert_array_equal(index.demand_matrix(quantities, 180), [[1, 1, 0]])
+    with pytest.raises(ValueError):
+        index.demand_matrix(quantities, 0)
+
+
+def test_peak_product_demand_takes_max_per_position(index):
+    assert index.peak_product_demand({"P1": 180, "P2": 360}, 180) == {"A": 3, "B": 1, "C": 6}
+    assert index.peak_product_demand({"P1": 180, "P2": 360}) == {"A": 3, "B": 1, "C": 3}
+    assert index.peak_product_demand({"P1": -5}) == {}
+
+
+def _dataset():
+    matrix = SkillMatrix(
+        worker_ids=["W1"], names=["员工1"], teams=[None], position_codes=["A"], levels=np.array([[3]])
+    )
+    return ParsedDataset(dataset_id="d", tasks=TASKS, positions=[], skill_matrix=matrix)
+
+
+def test_mix_demand_combines_stated_demand_by_default():
+    engine = SchedulingEngine()
+    dataset = _dataset()
+    mix = {"P1": 180, "P2": 90, "P3": 50}
+    assert engine._build_mix_demand(dataset, mix, "sum") == {"A": 4, "B": 1, "C": 3}
+    assert engine._build_mix_demand(dataset, mix, "shared") == {"A": 3, "B": 1, "C": 3}
+    assert engine._build_mix_demand(dataset, {"P1": 0}, "sum") == {}
+
+
+def test_mix_demand_scales_with_reference_quantity():
+    engine = SchedulingEngine()
+    dataset = _dataset()
+    mix = {"P1": 180, "P2": 90, "P3": 50}
+    assert engine._build_mix_demand(dataset, mix, "sum", 180) == {"A": 4, "B": 1, "C": 2}
+    assert engine._build_mix_demand(dataset, mix, "shared", 180) == {"A": 3, "B": 1, "C": 2}
@@ -0,0 +1,56 @@
+"""流式接口的执行器准入：输出期间占用名额，排队已满时返回503"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app, production_engine, scheduling_engine
+from router import base
+from tools.executor import EngineExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = EngineExecutor(
+        {"scheduling": scheduling_engine, "production": production_engine}, max_workers=1, max_queue=0
+    )
+    previous = base.engine_executor
+    base.init_engine_executor(executor)
+    yield executor
+    base.init_engine_executor(previous)
+    executor.shutdown()
+
+
+def _request():
+    return {
+        "orders": [
+            {"order_id": f"O{i}", "customer_name": "客户", "product_code": "P1", "quantity": 100,
+             "due_date": "2025-01-10", "order_date": "2025-01-01"}
+            for i in range(3)
+        ],
+        "start_date": "2025-01-06"
+    }
+
+
+def test_stream_holds_slot_until_output_finishes(executor):
+    with TestClient(app).stream("POST", "/production/multi-plan/stream", json=_request()) as response:
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert lines[-1]["type"] == "summary"
+    metrics = executor.metrics()
+    assert metrics["running"] == 0
+    assert metrics["completed"] == 1
+
+
+def test_stream_rejected_when_executor_is_full(executor):
+    slot = asyncio.run(executor.acquire_slot())
+    try:
+        response = TestClient(app).post("/production/multi-plan/stream", json=_request())
+    finally:
+        slot.release()
+
+    assert response.status_code == 503
+    assert executor.metrics()["rejected"] == 1
@@ -0,0 +1,115 @@
+"""流式接口的输出格式：NDJSON 逐行结果 + 汇总行，SSE 事件名取行类型"""
+
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app, dataset_store
+from models import PositionData, TaskData
+from tools import ParsedDataset
+from tools.skill_matrix import SkillMatrix
+
+ORDERS = [
+    {"order_id": f"O{i}", "customer_name": "客户", "product_code": "P1", "quantity": 100,
+     "due_date": "2025-01-10", "order_date": "2025-01-01"}
+    for i in range(3)
+]
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def dataset_id():
+    dataset = ParsedDataset(
+        dataset_id="stream-test",
+        tasks=[TaskData(产成品编码="P1", 岗位编码="A", 需求人数=1, 工作中心="总装")],
+        positions=[PositionData(工作中心="总装", 岗位编码="A", 岗位技能等级=2)],
+        skill_matrix=SkillMatrix(
+            worker_ids=["W1", "W2"], names=["员工1", "员工2"], teams=["A", "A"],
+            position_codes=["A"], levels=np.array([[3], [2]])
+        )
+    )
+    dataset_store.put(dataset)
+    yield dataset.dataset_id
+    dataset_store.remove(dataset.dataset_id)
+
+
+def _ndjson(response):
+    return [json.loads(line) for line in response.iter_lines() if line]
+
+
+def _sse(response):
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        event, data = block.split("\n")
+        assert event.startswith("event: ") and data.startswith("data: ")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_week_stream_ndjson_days_then_summary(client, dataset_id):
+    response = client.post("/scheduling/week/stream", json={
+        "start_date": "2025/01/08", "product_code": "P1", "dataset_id": dataset_id,
+        "use_employee_status": False
+    })
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = _ndjson(response)
+    days, summary = lines[:-1], lines[-1]
+    assert {line["type"] for line in days} == {"day"}
+    assert days[0]["date"] == "2025/01/06"
+    assert all(day["week_start"] == "2025/01/06" for day in days)
+    assert summary["type"] == "summary"
+    assert summary["dataset_id"] == dataset_id
+    assert summary["total_days"] == len(days)
+    assert summary["total_results"] == sum(len(day["assigned_workers"]) for day in days)
+
+
+def test_week_stream_sse_via_accept_header(client, dataset_id):
+    response = client.post(
+        "/scheduling/week/stream",
+        json={"start_date": "2025/01/06", "product_code": "P1", "dataset_id": dataset_id,
+              "use_employee_status": False},
+        headers={"Accept": "text/event-stream"}
+    )
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _sse(response)
+    assert [name for name, _ in events[:-1]] == ["day"] * (len(events) - 1)
+    assert events[-1][0] == "summary"
+    assert all(name == data["type"] for name, data in events)
+
+
+def test_multi_plan_stream_matches_non_streamed_result(client):
+    request = {"orders": ORDERS, "start_date": "2025-01-06"}
+    full = client.post("/production/multi-plan", json=request).json()
+    lines = _ndjson(client.post("/production/multi-plan/stream", json=request))
+
+    plans, summary = lines[:-1], lines[-1]
+    assert [line["index"] for line in plans] == list(range(len(plans)))
+    # 基准方案在前；非流式接口的优化方案另行排序，这里只比较集合
+    assert plans[0]["plan"]["plan_id"] == full["baseline_plan"]["plan_id"]
+    assert {line["plan"]["plan_id"] for line in plans[1:]} == {plan["plan_id"] for plan in full["optimized_plans"]}
+    assert summary["type"] == "summary"
+    assert summary["recommended_plan_id"] == full["recommended_plan"]["plan_id"]
+
+
+def test_multi_plan_stream_sse_format_param(client):
+    response = client.post(
+        "/production/multi-plan/stream?format=sse", json={"orders": ORDERS, "start_date": "2025-01-06"}
+    )
+    events = _sse(response)
+    assert {name for name, _ in events[:-1]} == {"plan"}
+    assert events[-1][0] == "summary"
+
+
+def test_unknown_stream_format_rejected(client):
+    response = client.post(
+        "/production/multi-plan/stream?format=xml", json={"orders": ORDERS, "start_date": "2025-01-06"}
+    )
+    assert response.status_code == 400
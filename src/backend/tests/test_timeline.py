@@ -0,0 +1,56 @@
+"""空闲时间轴和工作日历"""
+
+import pytest
+
+from tools.timeline import DAY_SECONDS, SHIFT_START_SECONDS, DayCalendar, FreeTimeline
+
+
+def _windows(timeline):
+    return list(zip(timeline._starts, timeline._ends))
+
+
+def test_reserve_splits_and_trims_windows():
+    timeline = FreeTimeline([(100, 200), (0, 50), (60, 60)])
+    assert _windows(timeline) == [(0, 50), (100, 200)]
+
+    timeline.reserve(120, 150)
+    assert _windows(timeline) == [(0, 50), (100, 120), (150, 200)]
+    timeline.reserve(0, 10)
+    timeline.reserve(180, 200)
+    assert _windows(timeline) == [(10, 50), (100, 120), (150, 180)]
+    assert timeline.free_seconds() == 40 + 20 + 30
+
+
+@pytest.mark.parametrize("start, end", [(40, 60), (50, 60), (120, 110), (-5, 5)])
+def test_reserve_outside_free_window_rejected(start, end):
+    timeline = FreeTimeline([(0, 50), (100, 200)])
+    with pytest.raises(ValueError):
+        timeline.reserve(start, end)
+    assert _windows(timeline) == [(0, 50), (100, 200)]
+
+
+def test_find_free_respects_earliest_and_min_length():
+    timeline = FreeTimeline([(0, 50), (100, 120), (150, 300)])
+    assert timeline.find_free(0) == (0, 50)
+    assert timeline.find_free(30) == (30, 50)
+    assert timeline.find_free(60) == (100, 120)
+    assert timeline.find_free(110, min_length=20) == (150, 300)
+    assert timeline.find_free(0, min_length=100) == (150, 300)
+    assert timeline.find_free(300) is None
+
+
+def test_day_calendar_windows_follow_capacity_and_takt():
+    calendar = DayCalendar({"2025-01-07": 100, "2025-01-06": 200}, {100: 414.0, 200: 207.0})
+    assert calendar.dates == ["2025-01-06", "2025-01-07"]
+    assert calendar.windows == [
+        (SHIFT_START_SECONDS, SHIFT_START_SECONDS + 41400),
+        (DAY_SECONDS + SHIFT_START_SECONDS, DAY_SECONDS + SHIFT_START_SECONDS + 41400),
+    ]
+    assert calendar.available_seconds() == 2 * 41400
+    end_of_day_one = calendar.windows[0][1]
+    assert calendar.day_of(end_of_day_one) == 0
+    assert calendar.clock(end_of_day_one) == "19:30"
+    # 开班前（次日零点之后、8点之前）仍属于前一个工作日，时刻按24小时以后计
+    assert calendar.day_of(DAY_SECONDS + 3600) == 0
+    assert calendar.clock(DAY_SECONDS + 3600) == "25:00"
+    assert calendar.timeline().free_seconds() == calendar.available_seconds()
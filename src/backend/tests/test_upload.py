@@ -0,0 +1,60 @@
+"""Excel上传：文件解析和数据集构建都在引擎执行器中执行"""
+
+import io
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app, dataset_store, production_engine, scheduling_engine
+from router import base
+from tools.executor import EngineExecutor
+
+pytest.importorskip("openpyxl")
+
+
+@pytest.fixture
+def executor():
+    executor = EngineExecutor({"scheduling": scheduling_engine, "production": production_engine})
+    previous = base.engine_executor
+    base.init_engine_executor(executor)
+    yield executor
+    base.init_engine_executor(previous)
+    executor.shutdown()
+
+
+def _xlsx(rows):
+    buffer = io.BytesIO()
+    pd.DataFrame(rows[1:], columns=rows[0]).to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def _files(sku_rows, position_rows, skill_rows):
+    return {
+        "sku_file": ("sku.xlsx", _xlsx(sku_rows)),
+        "position_file": ("position.xlsx", _xlsx(position_rows)),
+        "skill_file": ("skill.xlsx", _xlsx(skill_rows)),
+    }
+
+
+def test_upload_parses_in_executor(executor):
+    sku = [[f"c{i}" for i in range(18)], ["HL", "", "", "总装", "GW001"] + [""] * 11 + [3, "HL"]]
+    positions = [[f"c{i}" for i in range(13)], ["", "", "总装", "", "", "GW001"] + [""] * 6 + [3]]
+    skills = [["姓名", "工号", "班组", "GW001"], ["员工1", "W1", "A", 3]]
+
+    response = TestClient(app).post("/upload/excel?include_rows=false", files=_files(sku, positions, skills))
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["sku_rows"], body["position_rows"], body["skill_rows"]) == (2, 2, 2)
+    # 文件解析一次 + 数据集构建一次
+    assert executor.metrics()["completed"] == 2
+    assert dataset_store.remove(body["dataset_id"])
+
+
+def test_unreadable_file_rejected(executor):
+    files = {name: (f"{name}.xlsx", b"not an excel file") for name in ("sku_file", "position_file", "skill_file")}
+    response = TestClient(app).post("/upload/excel", files=files)
+
+    assert response.status_code == 400
+    assert executor.metrics()["failed"] == 1
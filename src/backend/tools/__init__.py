@@ -5,8 +5,12 @@
 
 from .paiban import SchedulingEngine
 from .paichan import ProductionSchedulingEngine
+from .dataset import ParsedDataset
+from .availability import AvailabilityIndex
 
 __all__ = [
     "SchedulingEngine",
-    "ProductionSchedulingEngine"
+    "ProductionSchedulingEngine",
+    "ParsedDataset",
+    "AvailabilityIndex"
 ]
@@ -0,0 +1,120 @@
+"""
+最优指派模块
+把单日排班建模为“员工 × 岗位空位”的最小费用二部图匹配，避免贪心算法中前面的岗位占用后面岗位需要的高技能员工
+"""
+
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+from .skill_index import SchedulingIndex
+
+# 费用权重（稀疏矩阵中0值表示无边，因此所有费用均为正数）
+BASE_COST = 1                 # 每条边的基础费用
+UNDER_SKILL_COST = 100        # 技能等级每低于要求1级的费用
+OVER_SKILL_COST = 1           # 技能等级每高于要求1级的费用（避免浪费高技能员工）
+TEAM_MISMATCH_COST = 10       # 员工不属于岗位主班组的费用
+UNFILLED_COST = 10000         # 空位无人可排的费用，需大于任何真实边的费用
+
+# 每个岗位最多保留的候选人数 = 需求人数 × 倍数 + 余量，控制图规模
+CANDIDATE_FACTOR = 4
+CANDIDATE_SLACK = 32
+
+
+def _preferred_team(teams: np.ndarray, qualified: np.ndarray) -> int:
+    """岗位主班组：满足技能要求的候选人最多的班组（以班组排序编号表示）"""
+    pool = teams[qualified] if qualified.any() else teams
+    if pool.size == 0:
+        return -1
+    return int(np.bincount(pool).argmax())
+
+
+def solve_day_assignment(
+    demand: Dict[str, int],
+    index: SchedulingIndex,
+    assigned_workers: Set[str]
+) -> Dict[str, List[Tuple[int, int]]]:
+    """求解单日最优指派
+
+    返回 岗位编码 -> [(员工行号, 技能等级)]，assigned_workers 会被就地更新。
+    """
+    matrix = index.skill_matrix
+    # 工号重复时只保留第一条记录，避免同一员工被匹配到多个空位
+    available = np.zeros(len(matrix), dtype=bool)
+    available[list(matrix.worker_lookup.values())] = True
+    available &= np.array(
+        [worker_id not in assigned_workers for worker_id in matrix.worker_ids], dtype=bool
+    )
+
+    slot_positions: List[str] = []
+    edge_rows: List[np.ndarray] = []
+    edge_cols: List[np.ndarray] = []
+    edge_costs: List[np.ndarray] = []
+
+    for post_code, required_people in demand.items():
+        requirement = index.get_requirement(post_code)
+        if requirement is None:
+            continue
+
+        rows, levels = index.get_postings(post_code)
+        keep = available[rows]
+        rows, levels = rows[keep], levels[keep]
+
+        required_level = requirement.岗位技能等级
+        teams = index.team_rank[rows]
+        preferred = _preferred_team(teams, levels >= required_level)
+        costs = (
+            BASE_COST
+            + UNDER_SKILL_COST * np.maximum(required_level - levels, 0)
+            + OVER_SKILL_COST * np.maximum(levels - required_level, 0)
+            + TEAM_MISMATCH_COST * (teams != preferred)
+        )
+
+        # 只保留费用最低的若干候选人，保证图是稀疏的
+        limit = required_people * CANDIDATE_FACTOR + CANDIDATE_SLACK
+        if rows.size > limit:
+            best = np.argpartition(costs, limit - 1)[:limit]
+            rows, costs = rows[best], costs[best]
+
+        for _ in range(required_people):
+            slot = len(slot_positions)
+            slot_positions.append(post_code)
+            edge_rows.append(np.full(rows.size, slot, dtype=np.int64))
+            edge_cols.append(rows)
+            edge_costs.append(costs)
+
+    selections: Dict[str, List[Tuple[int, int]]] = {
+        post_code: [] for post_code in demand if index.get_requirement(post_code)
+    }
+    slot_count = len(slot_positions)
+    if slot_count == 0:
+        return selections
+
+    # 每个空位配一个专属的“空缺”列，保证总能找到完美匹配
+    worker_count = len(matrix)
+    slots = np.arange(slot_count, dtype=np.int64)
+    edge_rows.append(slots)
+    edge_cols.append(worker_count + slots)
+    edge_costs.append(np.full(slot_count, UNFILLED_COST, dtype=np.int64))
+
+    graph = coo_matrix(
+        (np.concatenate(edge_costs).astype(np.float64),
+         (np.concatenate(edge_rows), np.concatenate(edge_cols))),
+        shape=(slot_count, worker_count + slot_count)
+    ).tocsr()
+    slot_ind, col_ind = min_weight_full_bipartite_matching(graph)
+
+    for slot, col in zip(slot_ind.tolist(), col_ind.tolist()):
+        if col >= worker_count:
+            continue
+        post_code = slot_positions[slot]
+        selections[post_code].append((col, int(matrix.position_levels(post_code)[col])))
+        assigned_workers.add(matrix.worker_ids[col])
+
+    # 岗位内按（班组, 技能等级降序）排列，与贪心模式的输出顺序一致
+    for post_code, selected in selections.items():
+        selected.sort(key=lambda x: (int(index.team_rank[x[0]]), -x[1]))
+
+    return selections
@@ -0,0 +1,185 @@
+"""
+人员可用性索引模块
+把请假信息和员工状态记录（请假/休息/辞职）统一为按天的日期区间，用中心区间树回答
+“某天哪些员工不可用”“某段日期内每天不可用的员工”等查询，单次查询约 O(log n + k)
+"""
+
+import bisect
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from models import EmployeeStatusRecord, LeaveInfo
+
+# 未填写结束日期（如辞职）的记录视为一直不可用
+OPEN_END_ORDINAL = date(9999, 12, 31).toordinal()
+
+DateLike = Union[str, date, datetime]
+
+
+def to_ordinal(value: DateLike) -> int:
+    """日期 -> 序数，兼容 2025/01/06、2025-01-06、2025/1/6 及带时间的写法"""
+    if isinstance(value, datetime):
+        return value.toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    text = str(value).strip().split(" ")[0].replace("/", "-")
+    year, month, day = (int(part) for part in text.split("-"))
+    return date(year, month, day).toordinal()
+
+
+class _Interval:
+    """闭区间 [start, end]（日期序数）"""
+    __slots__ = ("start", "end", "worker_id", "payload")
+
+    def __init__(self, start: int, end: int, worker_id: str, payload: Any):
+        self.start = start
+        self.end = end
+        self.worker_id = worker_id
+        self.payload = payload
+
+
+class _Node:
+    """中心区间树节点：保存所有包含 center 的区间，分别按起点升序、终点降序排列"""
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, intervals: List[_Interval]):
+        points = sorted(p for interval in intervals for p in (interval.start, interval.end))
+        self.center = points[len(points) // 2]
+        left = [i for i in intervals if i.end < self.center]
+        right = [i for i in intervals if i.start > self.center]
+        overlapping = [i for i in intervals if i.start <= self.center <= i.end]
+        self.by_start = sorted(overlapping, key=lambda i: i.start)
+        self.by_end = sorted(overlapping, key=lambda i: i.end, reverse=True)
+        self.left = _Node(left) if left else None
+        self.right = _Node(right) if right else None
+
+
+class AvailabilityIndex:
+    """员工不可用日期区间索引（构建后只读，可在进程间传递）"""
+
+    def __init__(self, intervals: Iterable[Tuple[DateLike, Optional[DateLike], str, Any]] = ()):
+        """intervals: (开始日期, 结束日期（None 表示一直有效）, 工号, 附带数据)"""
+        items = []
+        for start, end, worker_id, payload in intervals:
+            start_ordinal = to_ordinal(start)
+            end_ordinal = to_ordinal(end) if end else OPEN_END_ORDINAL
+            if end_ordinal < start_ordinal:
+                start_ordinal, end_ordinal = end_ordinal, start_ordinal
+            items.append(_Interval(start_ordinal, end_ordinal, str(worker_id), payload))
+
+        self._root = _Node(items) if items else None
+        self._count = len(items)
+
+        # 工号 -> 按起点排序的区间（同一员工的区间判断只需二分查找）
+        self._by_worker: Dict[str, List[_Interval]] = {}
+        for interval in sorted(items, key=lambda i: i.start):
+            self._by_worker.setdefault(interval.worker_id, []).append(interval)
+        # 同一员工区间终点的前缀最大值，用于二分后判断是否覆盖
+        self._worker_starts = {w: [i.start for i in v] for w, v in self._by_worker.items()}
+        self._worker_max_end: Dict[str, List[int]] = {}
+        for worker_id, intervals_of_worker in self._by_worker.items():
+            running, prefix = -1, []
+            for interval in intervals_of_worker:
+                running = max(running, interval.end)
+                prefix.append(running)
+            self._worker_max_end[worker_id] = prefix
+
+    @classmethod
+    def build(
+        cls,
+        leaves: Sequence[LeaveInfo] = (),
+        status_records: Sequence[EmployeeStatusRecord] = ()
+    ) -> "AvailabilityIndex":
+        """由请假信息和员工状态记录构建索引"""
+        intervals: List[Tuple[DateLike, Optional[DateLike], str, Any]] = []
+        for leave in leaves:
+            intervals.append((leave.请假日期, leave.结束日期 or leave.请假日期, leave.工号, leave))
+        for record in status_records:
+            intervals.append((record.start_date, record.end_date, record.employee_id, record))
+        return cls(intervals)
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ---- 查询 ----
+
+    def _stab(self, point: int) -> List[_Interval]:
+        """包含 point 的全部区间"""
+        hits: List[_Interval] = []
+        node = self._root
+        while node is not None:
+            if point < node.center:
+                for interval in node.by_start:
+                    if interval.start > point:
+                        break
+                    hits.append(interval)
+                node = node.left
+            elif point > node.center:
+                for interval in node.by_end:
+                    if interval.end < point:
+                        break
+                    hits.append(interval)
+                node = node.right
+            else:
+                hits.extend(node.by_start)
+                break
+        return hits
+
+    def _overlapping(self, start: int, end: int) -> List[_Interval]:
+        """与 [start, end] 有交集的全部区间"""
+        hits: List[_Interval] = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if end < node.center:
+                for interval in node.by_start:
+                    if interval.start > end:
+                        break
+                    hits.append(interval)
+                if node.left:
+                    stack.append(node.left)
+            elif start > node.center:
+                for interval in node.by_end:
+                    if interval.end < start:
+                        break
+                    hits.append(interval)
+                if node.right:
+                    stack.append(node.right)
+            else:
+                hits.extend(node.by_start)
+                if node.left:
+                    stack.append(node.left)
+                if node.right:
+                    stack.append(node.right)
+        return hits
+
+    def unavailable_on(self, day: DateLike) -> Set[str]:
+        """某天不可用的员工工号"""
+        return {interval.worker_id for interval in self._stab(to_ordinal(day))}
+
+    def records_on(self, day: DateLike) -> List[Any]:
+        """某天生效的请假/状态记录（构建时附带的数据）"""
+        return [interval.payload for interval in self._stab(to_ordinal(day))]
+
+    def is_unavailable(self, worker_id: str, day: DateLike) -> bool:
+        """某员工某天是否不可用"""
+        starts = self._worker_starts.get(str(worker_id))
+        if not starts:
+            return False
+        point = to_ordinal(day)
+        i = bisect.bisect_right(starts, point) - 1
+        return i >= 0 and self._worker_max_end[str(worker_id)][i] >= point
+
+    def unavailable_between(self, start: DateLike, end: DateLike) -> Dict[str, Set[str]]:
+        """[start, end] 内每天不可用的员工，键为 YYYY-MM-DD 格式的日期"""
+        start_ordinal, end_ordinal = to_ordinal(start), to_ordinal(end)
+        days: List[Set[str]] = [set() for _ in range(max(end_ordinal - start_ordinal + 1, 0))]
+        for interval in self._overlapping(start_ordinal, end_ordinal):
+            for offset in range(max(interval.start, start_ordinal) - start_ordinal,
+                                min(interval.end, end_ordinal) - start_ordinal + 1):
+                days[offset].add(interval.worker_id)
+        first_day = date.fromordinal(start_ordinal) if days else None
+        return {
+            (first_day + timedelta(days=offset)).strftime("%Y-%m-%d"): workers
+            for offset, workers in enumerate(days)
+        }
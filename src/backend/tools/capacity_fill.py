@@ -0,0 +1,57 @@
+"""
+产能填充模块
+按日期顺序把订单数量填入每日剩余产能；用并查集跳过已满的日期，
+N 个订单在 D 天上的填充总代价约为 O(N + D)
+"""
+
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+
+class CapacityFiller:
+    """每日剩余产能 + “下一个有空余产能的日期”并查集"""
+
+    def __init__(self, daily_capacities: Dict[str, int]):
+        # 日期只排序、解析一次
+        self.dates: List[str] = sorted(daily_capacities)
+        self.ordinals: List[int] = [
+            datetime.strptime(date, "%Y-%m-%d").toordinal() for date in self.dates
+        ]
+        self.remaining: List[int] = [daily_capacities[date] for date in self.dates]
+        self.used: List[int] = [0] * len(self.dates)
+
+        # _next[i] 指向 i 之后（含 i）第一个可能有空余产能的日期下标，len(dates) 为哨兵
+        count = len(self.dates)
+        self._next: List[int] = list(range(count + 1))
+        for i in range(count):
+            if self.remaining[i] <= 0:
+                self._next[i] = i + 1
+
+    def _find(self, i: int) -> int:
+        """查找 i 之后第一个有空余产能的日期（路径压缩）"""
+        root = i
+        while self._next[root] != root:
+            root = self._next[root]
+        while self._next[i] != root:
+            self._next[i], i = root, self._next[i]
+        return root
+
+    def fill(self, quantity: int) -> List[Tuple[int, int]]:
+        """从最早有空余产能的日期开始填入 quantity，返回 [(日期下标, 安排数量)]"""
+        allocations: List[Tuple[int, int]] = []
+        count = len(self.dates)
+        i = self._find(0)
+
+        while quantity > 0 and i < count:
+            amount = min(quantity, self.remaining[i])
+            allocations.append((i, amount))
+            self.remaining[i] -= amount
+            self.used[i] += amount
+            quantity -= amount
+
+            if self.remaining[i] <= 0:
+                # 当天已满，之后的查找直接跳过
+                self._next[i] = i + 1
+                i = self._find(i + 1)
+
+        return allocations
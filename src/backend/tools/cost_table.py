@@ -0,0 +1,61 @@
+"""
+产能成本表模块
+把产能配置预计算为“产能 -> 单日能耗成本/人效成本”的查找数组，
+配置档位之间线性插值，支持一次查表批量计算多个方案的成本
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+ENERGY_PRICE = 1.0    # 能耗成本 = 能耗 × 1 ¥/kWh
+LABOR_PRICE = 360.0   # 人效成本 = 人效 × 360 ¥/人
+
+
+class CapacityCostTable:
+    """单日成本查找表
+
+    下标为整数产能（0 .. 最大配置档位），取值为该产能下的单日能耗成本和人效成本。
+    配置档位之间线性插值；低于最低档位或高于最高档位时取最近档位的成本。
+    """
+
+    def __init__(self, capacity_config: Dict[int, Dict[str, float]]):
+        levels = np.array(sorted(capacity_config), dtype=np.float64)
+        energy = np.array([capacity_config[int(c)]["能耗"] * ENERGY_PRICE for c in levels])
+        labor = np.array([capacity_config[int(c)]["人效"] * LABOR_PRICE for c in levels])
+
+        self.max_capacity = int(levels[-1])
+        grid = np.arange(self.max_capacity + 1, dtype=np.float64)
+        self.energy_cost = np.interp(grid, levels, energy)
+        self.labor_cost = np.interp(grid, levels, labor)
+
+    def lookup(self, capacities: np.ndarray) -> np.ndarray:
+        """产能 -> 查找表下标"""
+        return np.clip(np.rint(capacities).astype(np.int64), 0, self.max_capacity)
+
+    def level_costs(self, capacities: Sequence[int]) -> np.ndarray:
+        """各产能的单日总成本"""
+        index = self.lookup(np.asarray(capacities))
+        return self.energy_cost[index] + self.labor_cost[index]
+
+    def evaluate(self, capacity_rows: List[Sequence[int]]) -> Dict[str, np.ndarray]:
+        """批量计算多个方案的成本（各方案天数可以不同），一次查表同时得到总成本和明细"""
+        lengths = np.array([len(row) for row in capacity_rows], dtype=np.int64)
+        flat = np.concatenate([np.asarray(row, dtype=np.float64) for row in capacity_rows]) \
+            if lengths.sum() else np.zeros(0)
+        index = self.lookup(flat)
+
+        # 按方案分段求和（空方案的成本为0）
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        nonempty = lengths > 0
+        energy = np.zeros(len(capacity_rows))
+        labor = np.zeros(len(capacity_rows))
+        if nonempty.any():
+            energy[nonempty] = np.add.reduceat(self.energy_cost[index], offsets[nonempty])
+            labor[nonempty] = np.add.reduceat(self.labor_cost[index], offsets[nonempty])
+
+        return {
+            "energy_cost": energy,
+            "labor_cost": labor,
+            "total_cost": energy + labor
+        }
@@ -0,0 +1,49 @@
+"""
+数据集模块
+封装已解析的SKU、岗位和技能矩阵数据，供排班排产引擎重复使用
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from models import TaskData, PositionData
+from .routing_index import ProductRoutingIndex
+from .skill_index import SchedulingIndex
+from .skill_matrix import SkillMatrix
+
+
+@dataclass
+class ParsedDataset:
+    """已解析的排班基础数据集"""
+    dataset_id: str
+    tasks: List[TaskData]
+    positions: List[PositionData]
+    skill_matrix: SkillMatrix
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    _index: Optional[SchedulingIndex] = field(default=None, init=False, repr=False)
+    _routing_index: Optional[ProductRoutingIndex] = field(default=None, init=False, repr=False)
+
+    @property
+    def index(self) -> SchedulingIndex:
+        """排班查询索引（首次使用时构建，之后复用）"""
+        if self._index is None:
+            self._index = SchedulingIndex(self.positions, self.skill_matrix)
+        return self._index
+
+    @property
+    def routing_index(self) -> ProductRoutingIndex:
+        """产品工艺路线索引（首次使用时由SKU数据构建，之后复用）"""
+        if self._routing_index is None:
+            self._routing_index = ProductRoutingIndex(self.tasks)
+        return self._routing_index
+
+    def summary(self) -> dict:
+        """数据集概要信息"""
+        return {
+            "dataset_id": self.dataset_id,
+            "sku_records": len(self.tasks),
+            "position_records": len(self.positions),
+            "skill_records": len(self.skill_matrix),
+            "created_at": self.created_at
+        }
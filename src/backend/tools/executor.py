@@ -0,0 +1,176 @@
+"""
+引擎执行器模块
+把同步的（CPU密集型）引擎调用派发到线程池或进程池执行，避免阻塞 asyncio 事件循环；
+并发数和排队长度有上限，并提供队列深度等运行指标
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+# 进程池模式下，每个工作进程在启动时预先创建的引擎实例
+_worker_engines: Dict[str, Any] = {}
+
+
+def _init_worker(engine_types: Dict[str, type]):
+    """进程池初始化：在工作进程内预热引擎"""
+    global _worker_engines
+    _worker_engines = {name: engine_type() for name, engine_type in engine_types.items()}
+
+
+def _call_worker_engine(engine_name: str, method: str, args: tuple, kwargs: dict) -> Any:
+    """在工作进程内调用引擎方法"""
+    return getattr(_worker_engines[engine_name], method)(*args, **kwargs)
+
+
+class EngineBusyError(RuntimeError):
+    """排队的引擎调用超过上限"""
+
+
+class EngineExecutor:
+    """引擎调用执行器
+
+    mode="thread": 线程池执行，直接使用主进程中的引擎实例（numpy/scipy 计算会释放 GIL）；
+    mode="process": 进程池执行，每个工作进程持有预热的引擎实例，参数和结果需可序列化。
+    同时运行的调用不超过 max_workers，等待中的调用不超过 max_queue，超出时抛出 EngineBusyError。
+    """
+
+    def __init__(
+        self,
+        engines: Dict[str, Any],
+        mode: str = "thread",
+        max_workers: int = 4,
+        max_queue: int = 32
+    ):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"不支持的执行模式: {mode}")
+
+        self.engines = engines
+        self.mode = mode
+        self.max_workers = max(max_workers, 1)
+        self.max_queue = max(max_queue, 0)
+
+        self._pool: Executor
+        if mode == "process":
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=({name: type(engine) for name, engine in engines.items()},)
+            )
+        else:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="engine")
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._running = 0
+        self._waiting = 0
+        self._stats = {
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_waiting": 0,
+            "total_wait_seconds": 0.0,
+            "total_run_seconds": 0.0
+        }
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    def _submit(self, engine_name: str, method: str, args: tuple, kwargs: dict):
+        if self.mode == "process":
+            return self._pool.submit(_call_worker_engine, engine_name, method, args, kwargs)
+        return self._pool.submit(getattr(self.engines[engine_name], method), *args, **kwargs)
+
+    async def _acquire(self) -> float:
+        """排队等待执行名额（排队已满时抛出 EngineBusyError），返回开始执行的时间"""
+        semaphore = self._get_semaphore()
+
+        with self._lock:
+            if semaphore.locked() and self._waiting >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise EngineBusyError(
+                    f"计算任务排队已满（运行中 {self._running}，排队 {self._waiting}），请稍后重试"
+                )
+            self._waiting += 1
+            self._stats["max_waiting"] = max(self._stats["max_waiting"], self._waiting)
+
+        queued_at = time.perf_counter()
+        try:
+            await semaphore.acquire()
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        started_at = time.perf_counter()
+        with self._lock:
+            self._running += 1
+            self._stats["total_wait_seconds"] += started_at - queued_at
+        return started_at
+
+    def _release(self, started_at: float, failed: bool):
+        """归还执行名额并记录运行指标"""
+        with self._lock:
+            self._stats["failed" if failed else "completed"] += 1
+            self._running -= 1
+            self._stats["total_run_seconds"] += time.perf_counter() - started_at
+        self._get_semaphore().release()
+
+    async def run(self, engine_name: str, method: str, *args, **kwargs) -> Any:
+        """在执行器中调用 engines[engine_name].method(*args, **kwargs) 并等待结果"""
+        started_at = await self._acquire()
+        failed = True
+        try:
+            result = await asyncio.wrap_future(self._submit(engine_name, method, args, kwargs))
+            failed = False
+            return result
+        finally:
+            self._release(started_at, failed)
+
+    async def acquire_slot(self) -> "EngineSlot":
+        """占用一个执行名额，直到返回的 EngineSlot 被释放
+
+        用于在请求线程中逐步计算的流式响应：与 run 共用并发上限、排队上限和运行指标。
+        """
+        return EngineSlot(self, await self._acquire())
+
+    def metrics(self) -> Dict[str, Any]:
+        """执行器运行指标"""
+        with self._lock:
+            finished = self._stats["completed"] + self._stats["failed"]
+            return {
+                "mode": self.mode,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": self._waiting,
+                "max_queue_depth": self._stats["max_waiting"],
+                "completed": self._stats["completed"],
+                "failed": self._stats["failed"],
+                "rejected": self._stats["rejected"],
+                "avg_wait_ms": round(self._stats["total_wait_seconds"] * 1000 / finished, 2) if finished else 0,
+                "avg_run_ms": round(self._stats["total_run_seconds"] * 1000 / finished, 2) if finished else 0
+            }
+
+    def shutdown(self, wait: bool = True):
+        """关闭线程池/进程池"""
+        self._pool.shutdown(wait=wait)
+
+
+class EngineSlot:
+    """执行器名额（acquire_slot 的返回值），release 可重复调用，只生效一次；需在事件循环线程中释放"""
+
+    def __init__(self, executor: EngineExecutor, started_at: float):
+        self._executor = executor
+        self._started_at = started_at
+        self._released = False
+        self.failed = False
+
+    def release(self):
+        if self._released:
+            return
+        self._released = True
+        self._executor._release(self._started_at, self.failed)
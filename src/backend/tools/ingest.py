@@ -0,0 +1,144 @@
+"""
+数据导入模块
+以列式（向量化）方式把Excel/表格数据转换为排班引擎使用的数据记录
+"""
+
+from typing import List, Any, Optional
+import io
+
+import numpy as np
+import pandas as pd
+from pydantic import TypeAdapter
+
+from models import TaskData, PositionData
+from .skill_matrix import SkillMatrix
+
+# 优先使用 calamine 引擎读取Excel（Rust实现，速度明显快于openpyxl）；
+# 未安装时退回 pandas 默认引擎（openpyxl 只读模式）
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE: Optional[str] = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
+_task_list_adapter = TypeAdapter(List[TaskData])
+_position_list_adapter = TypeAdapter(List[PositionData])
+
+
+def read_excel_frame(contents: bytes) -> pd.DataFrame:
+    """读取Excel文件内容并规整单元格取值"""
+    df = pd.read_excel(io.BytesIO(contents), engine=EXCEL_ENGINE)
+    df.columns = [str(c) for c in df.columns]
+    return normalize_frame(df)
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """按列规整取值：空值统一为None，整数值的浮点列还原为整数
+
+    按列位置处理，标题重复或为空（如多个空白标题单元格）的列各自保留，后续按 iloc 取列的位置不变。
+    """
+    if df.shape[1] == 0:
+        return df.astype(object)
+
+    columns = []
+    for i in range(df.shape[1]):
+        series = df.iloc[:, i]
+        if pd.api.types.is_float_dtype(series):
+            values = series.to_numpy()
+            finite = values[~np.isnan(values)]
+            # 含空单元格的整数列会被pandas读成浮点数（如 3.0），这里还原为整数
+            if finite.size and np.all(finite == np.floor(finite)):
+                series = series.astype("Int64")
+        series = series.astype(object)
+        columns.append(series.where(series.notna(), None))
+    result = pd.concat(columns, axis=1, ignore_index=True)
+    result.columns = df.columns
+    return result
+
+
+def frame_to_rows(df: pd.DataFrame) -> List[List[Any]]:
+    """转换为带标题行的二维列表"""
+    return [df.columns.tolist()] + df.to_numpy(dtype=object).tolist()
+
+
+def frame_from_rows(raw_data: List[List[Any]], min_columns: int = 0) -> pd.DataFrame:
+    """把带标题行的二维列表转换为DataFrame，列数不足 min_columns 的行被丢弃"""
+    headers = [str(h) for h in raw_data[0]]
+    rows = [row for row in raw_data[1:] if len(row) >= min_columns]
+    width = max([len(headers)] + [len(row) for row in rows])
+    columns = headers + [f"列{i + 1}" for i in range(len(headers), width)]
+    return normalize_frame(pd.DataFrame(rows, columns=columns))
+
+
+def _text_column(series: pd.Series) -> pd.Series:
+    """文本列：空值和假值（空串、0）转换为空字符串"""
+    values = series.astype(object)
+    empty = values.isna() | values.isin(["", 0, False])
+    return values.astype(str).where(~empty, "")
+
+
+def _level_column(series: pd.Series) -> pd.Series:
+    """等级/人数列：非负整数保留，其余取0"""
+    numbers = pd.to_numeric(series, errors="coerce")
+    valid = numbers.notna() & (numbers >= 0) & (numbers == np.floor(numbers))
+    return numbers.where(valid, 0).astype(np.int64)
+
+
+def tasks_from_frame(df: pd.DataFrame) -> List[TaskData]:
+    """SKU表 -> 任务记录（产成品编码第1列、工作中心第4列、岗位编码第5列、需求人数第17列、箱型第18列）"""
+    if df.shape[1] < 17 or df.empty:
+        return []
+
+    records = pd.DataFrame({
+        "产成品编码": _text_column(df.iloc[:, 0]),
+        "岗位编码": _text_column(df.iloc[:, 4]),
+        "需求人数": _level_column(df.iloc[:, 16]),
+        "工作中心": _text_column(df.iloc[:, 3]),
+        "箱型": _text_column(df.iloc[:, 17]) if df.shape[1] > 17 else ""
+    })
+    records = records[(records["产成品编码"] != "") & (records["岗位编码"] != "")]
+    return _task_list_adapter.validate_python(records.to_dict("records"))
+
+
+def positions_from_frame(df: pd.DataFrame) -> List[PositionData]:
+    """岗位表 -> 岗位记录（工作中心第3列、岗位编码第6列、岗位技能等级第13列）"""
+    if df.shape[1] < 13 or df.empty:
+        return []
+
+    records = pd.DataFrame({
+        "工作中心": _text_column(df.iloc[:, 2]),
+        "岗位编码": _text_column(df.iloc[:, 5]),
+        "岗位技能等级": _level_column(df.iloc[:, 12])
+    })
+    records = records[(records["工作中心"] != "") & (records["岗位编码"] != "")]
+    return _position_list_adapter.validate_python(records.to_dict("records"))
+
+
+def skill_matrix_from_frame(df: pd.DataFrame) -> SkillMatrix:
+    """技能矩阵表 -> 紧凑技能矩阵（除姓名、工号、班组外的列均视为岗位技能等级）"""
+    headers = [str(h) for h in df.columns]
+    # 与逐行解析保持一致：同名列以最后一列为准
+    positions = {header: i for i, header in enumerate(headers)}
+
+    def text(header: str) -> pd.Series:
+        if header in positions:
+            return _text_column(df.iloc[:, positions[header]])
+        return pd.Series("", index=df.index, dtype=object)
+
+    names = text("姓名")
+    worker_ids = text("工号")
+    teams = text("班组")
+    skill_headers = [h for h in positions if h not in ("姓名", "工号", "班组")]
+
+    keep = ((names != "") & (worker_ids != "")).to_numpy()
+    levels = np.zeros((int(keep.sum()), len(skill_headers)), dtype=np.int64)
+    for j, header in enumerate(skill_headers):
+        levels[:, j] = _level_column(df.iloc[:, positions[header]]).to_numpy()[keep]
+
+    return SkillMatrix(
+        worker_ids=worker_ids[keep].tolist(),
+        names=names[keep].tolist(),
+        teams=[team or None for team in teams[keep].tolist()],
+        position_codes=skill_headers,
+        levels=levels
+    )
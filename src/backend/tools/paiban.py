@@ -3,13 +3,22 @@
 实现按岗位排班的核心算法逻辑
 """
 
-from typing import List, Dict, Set, Optional, Union, Any, Tuple
+from typing import List, Dict, Set, Optional, Union, Any, Tuple, Iterator
 from models import (
     SchedulingResult, TaskData, PositionData, SkillMatrixData, 
     PositionGroup, PerformanceMetrics, PositionMatchData, TrainingPlan,
     LowEfficiencyPosition, OptimizationSuggestion, LeaveInfo, 
     AdjustmentSuggestion, TeamWorkload
 )
+from .dataset import ParsedDataset
+from .skill_index import SchedulingIndex
+from .skill_matrix import SkillMatrix
+from .assignment import solve_day_assignment
+from .availability import AvailabilityIndex
+from .ingest import (
+    frame_from_rows, read_excel_frame, tasks_from_frame, positions_from_frame, skill_matrix_from_frame
+)
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import math
@@ -24,174 +33,166 @@ class SchedulingEngine:
         """处理SKU数据"""
         if not raw_data or len(raw_data) < 2:
             return []
-        
-        results = []
-        for row in raw_data[1:]:  # 跳过标题行
-            if len(row) >= 17:
-                task = TaskData(
-                    产成品编码=str(row[0]) if row[0] else "",
-                    岗位编码=str(row[4]) if row[4] else "",
-                    需求人数=int(row[16]) if row[16] and str(row[16]).isdigit() else 0,
-                    工作中心=str(row[3]) if len(row) > 3 and row[3] else "",  # 工作中心通常在第4列
-                    箱型=str(row[17]) if len(row) > 17 and row[17] else ""  # 新增：箱型在第18列
-                )
-                if task.产成品编码 and task.岗位编码:
-                    results.append(task)
-        return results
+        return tasks_from_frame(frame_from_rows(raw_data, min_columns=17))
     
     def process_position_data(self, raw_data: List[List[Any]]) -> List[PositionData]:
         """处理岗位数据"""
         if not raw_data or len(raw_data) < 2:
             return []
-        
-        results = []
-        for row in raw_data[1:]:  # 跳过标题行
-            if len(row) >= 13:
-                position = PositionData(
-                    工作中心=str(row[2]) if row[2] else "",
-                    岗位编码=str(row[5]) if row[5] else "",
-                    岗位技能等级=int(row[12]) if row[12] and str(row[12]).isdigit() else 0
-                )
-                if position.工作中心 and position.岗位编码:
-                    results.append(position)
-        return results
+        return positions_from_frame(frame_from_rows(raw_data, min_columns=13))
     
-    def process_skill_matrix(self, raw_data: List[List[Any]]) -> List[SkillMatrixData]:
+    def process_skill_matrix(self, raw_data: List[List[Any]]) -> SkillMatrix:
         """处理技能矩阵数据"""
         if not raw_data or len(raw_data) < 2:
-            return []
-        
-        headers = [str(h) for h in raw_data[0]]
-        results = []
+            return SkillMatrix.from_records([])
         
-        for row in raw_data[1:]:
-            if len(row) < len(headers):
-                continue
-                
-            skill_data = SkillMatrixData(
-                姓名="",
-                工号="",
-                班组=None,
-                skills={}
-            )
-            
-            for i, header in enumerate(headers):
-                if i < len(row):
-                    value = row[i]
-                    if header == "姓名":
-                        skill_data.姓名 = str(value) if value else ""
-                    elif header == "工号":
-                        skill_data.工号 = str(value) if value else ""
-                    elif header == "班组":
-                        skill_data.班组 = str(value) if value else None
-                    else:
-                        # 技能等级数据
-                        skill_level = int(value) if value and str(value).isdigit() else 0
-                        skill_data.skills[header] = skill_level
-            
-            if skill_data.姓名 and skill_data.工号:
-                results.append(skill_data)
-        
-        return results
+        # 列数不足标题行的数据行视为无效行，超出标题行的列忽略
+        header_count = len(raw_data[0])
+        df = frame_from_rows(raw_data, min_columns=header_count)
+        return skill_matrix_from_frame(df.iloc[:, :header_count])
+    
+    def build_dataset(
+        self,
+        sku_data: List[List[Any]],
+        position_data: List[List[Any]],
+        skill_data: List[List[Any]],
+        dataset_id: str = ""
+    ) -> ParsedDataset:
+        """一次性解析三张基础数据表"""
+        return ParsedDataset(
+            dataset_id=dataset_id,
+            tasks=self.process_sku_data(sku_data),
+            positions=self.process_position_data(position_data),
+            skill_matrix=self.process_skill_matrix(skill_data)
+        )
+    
+    def read_excel_frames(self, contents: List[bytes]) -> List[pd.DataFrame]:
+        """读取多个Excel文件内容（CPU密集，由引擎执行器调用）"""
+        return [read_excel_frame(content) for content in contents]
+    
+    def build_dataset_from_frames(
+        self,
+        sku_frame: pd.DataFrame,
+        position_frame: pd.DataFrame,
+        skill_frame: pd.DataFrame,
+        dataset_id: str = ""
+    ) -> ParsedDataset:
+        """直接从Excel读取的DataFrame构建数据集，不经过逐行列表转换"""
+        return ParsedDataset(
+            dataset_id=dataset_id,
+            tasks=tasks_from_frame(sku_frame),
+            positions=positions_from_frame(position_frame),
+            skill_matrix=skill_matrix_from_frame(skill_frame)
+        )
     
     def perform_day_scheduling(
         self, 
         target_date: str, 
         product_code: str,
-        sku_data: List[List[Any]],
-        position_data: List[List[Any]],
-        skill_data: List[List[Any]],
-        weekly_assigned_workers: List[str] = None
+        sku_data: List[List[Any]] = None,
+        position_data: List[List[Any]] = None,
+        skill_data: List[List[Any]] = None,
+        weekly_assigned_workers: List[str] = None,
+        dataset: Optional[ParsedDataset] = None,
+        solver: str = "greedy",
+        availability: Optional[AvailabilityIndex] = None,
+        product_mix: Optional[Dict[str, int]] = None,
+        mix_mode: str = "sum",
+        reference_quantity: Optional[int] = None
     ) -> Tuple[List[SchedulingResult], List[PositionGroup]]:
-        """执行单日排班"""
+        """执行单日排班（传入已解析的数据集时跳过解析）
+
+        solver: "greedy" 按岗位顺序贪心分配；"optimal" 全局最小费用指派
+        availability: 人员可用性索引，当天不可用（请假/休息/辞职）的员工不参与排班
+        product_mix: 当天生产的产品组合（产成品编码 -> 生产数量），提供时忽略 product_code，
+            合并各产品的岗位需求后对同一员工池一次性分配
+        reference_quantity: SKU表中需求人数对应的日产量，指定时产品组合的岗位需求按生产数量成比例换算
+        """
         
         # 处理数据
-        table1 = self.process_sku_data(sku_data)
-        dole_positions = self.process_position_data(position_data)
-        skill_matrix = self.process_skill_matrix(skill_data)
+        if dataset is None:
+            dataset = self.build_dataset(sku_data, position_data, skill_data)
         
-        # 筛选当天任务
-        today_tasks = []
-        task_dict = {}
+        if product_mix:
+            demand = self._build_mix_demand(dataset, product_mix, mix_mode, reference_quantity)
+        else:
+            demand = self._build_position_demand(dataset.tasks, product_code)
         
-        for item in table1:
+        # 已分配员工集合
+        assigned_workers = set(weekly_assigned_workers or [])
+        unavailable = availability.unavailable_on(target_date) if availability else None
+        return self._assign_positions(target_date, demand, dataset.index, assigned_workers, solver, unavailable)
+    
+    def _build_position_demand(self, tasks: List[TaskData], product_code: str) -> Dict[str, int]:
+        """汇总指定产品的岗位需求人数（岗位编码 -> 需求人数）"""
+        demand: Dict[str, int] = {}
+        for item in tasks:
             if item.产成品编码 == product_code:
-                key = item.岗位编码
-                if key in task_dict:
-                    task_dict[key].需求人数 += item.需求人数
-                else:
-                    task_dict[key] = TaskData(
-                        产成品编码=item.产成品编码,
-                        岗位编码=item.岗位编码,
-                        需求人数=item.需求人数
-                    )
+                demand[item.岗位编码] = demand.get(item.岗位编码, 0) + item.需求人数
+        return {post_code: count for post_code, count in demand.items() if count > 0}
+    
+    def _build_mix_demand(
+        self,
+        dataset: ParsedDataset,
+        product_mix: Dict[str, int],
+        mix_mode: str = "sum",
+        reference_quantity: Optional[int] = None
+    ) -> Dict[str, int]:
+        """按产品组合换算岗位需求人数（与排产排班集成使用同一工艺路线索引）
+
+        数量不大于0的产品不排班。未指定 reference_quantity 时各产品按SKU表中的需求人数计；
+        指定时需求人数按 生产数量 / reference_quantity 成比例向上取整。
+        mix_mode="sum": 各产品分别配置人员，同一岗位按各产品需求合计；
+        mix_mode="shared": 各产品分时共用岗位，同一岗位取各产品需求的最大值。
+        """
+        if mix_mode not in ("sum", "shared"):
+            raise ValueError(f"不支持的产品组合模式: {mix_mode}")
         
-        today_tasks = [task for task in task_dict.values() if task.需求人数 > 0]
+        routing_index = dataset.routing_index
+        if mix_mode == "sum":
+            return routing_index.daily_demands([product_mix], reference_quantity)[0]
+        return routing_index.peak_product_demand(product_mix, reference_quantity)
+    
+    def _assign_positions(
+        self,
+        target_date: str,
+        demand: Dict[str, int],
+        index: SchedulingIndex,
+        assigned_workers: Set[str],
+        solver: str = "greedy",
+        unavailable: Optional[Set[str]] = None
+    ) -> Tuple[List[SchedulingResult], List[PositionGroup]]:
+        """按岗位需求分配员工，assigned_workers 会被就地更新；unavailable 中的员工当天不参与排班"""
+        excluded = assigned_workers | unavailable if unavailable else assigned_workers
+        if solver == "greedy":
+            selections = self._select_workers_greedy(demand, index, excluded)
+        elif solver == "optimal":
+            selections = solve_day_assignment(demand, index, excluded)
+        else:
+            raise ValueError(f"不支持的排班求解模式: {solver}")
+        if excluded is not assigned_workers:
+            assigned_workers.update(
+                index.skill_matrix.worker_ids[row] for assigned in selections.values() for row, _ in assigned
+            )
         
-        # 已分配员工集合
-        assigned_workers = set(weekly_assigned_workers or [])
+        matrix = index.skill_matrix
         results = []
         groups = []
         
-        for task in today_tasks:
-            post_code = task.岗位编码
-            required_people = task.需求人数
-            
-            # 查找技能要求
-            skill_req = next((pos for pos in dole_positions if pos.岗位编码 == post_code), None)
-            if not skill_req:
-                continue
-                
+        for post_code, assigned in selections.items():
+            skill_req = index.get_requirement(post_code)
             required_skill_level = skill_req.岗位技能等级
             work_center = skill_req.工作中心
             
-            # 获取可用员工
-            available_workers = [
-                worker for worker in skill_matrix 
-                if worker.工号 not in assigned_workers
-            ]
-            
-            # 筛选有该岗位技能的员工并排序
-            skilled_workers = []
-            for worker in available_workers:
-                skill_level = worker.skills.get(post_code, 0)
-                if isinstance(skill_level, int) and skill_level > 0:
-                    skilled_workers.append((worker, skill_level))
-            
-            # 排序：优先班组，然后技能等级
-            skilled_workers.sort(key=lambda x: (
-                x[0].班组 or "zzz",  # 班组排序，无班组排到最后
-                -x[1]  # 技能等级降序
-            ))
-            
-            # 分配员工
-            assigned = []
-            
-            # 优先分配满足要求的员工
-            for worker, skill_level in skilled_workers:
-                if len(assigned) >= required_people:
-                    break
-                if skill_level >= required_skill_level:
-                    assigned.append((worker, skill_level))
-                    assigned_workers.add(worker.工号)
-            
-            # 如果还有空位，分配技能等级较低的员工
-            for worker, skill_level in skilled_workers:
-                if len(assigned) >= required_people:
-                    break
-                if worker.工号 not in assigned_workers and skill_level < required_skill_level:
-                    assigned.append((worker, skill_level))
-                    assigned_workers.add(worker.工号)
-            
             # 生成排班结果
             position_results = []
-            for worker, skill_level in assigned:
+            for row, skill_level in assigned:
                 result = SchedulingResult(
                     岗位编码=post_code,
-                    姓名=worker.姓名,
-                    工号=worker.工号,
+                    姓名=matrix.names[row],
+                    工号=matrix.worker_ids[row],
                     技能等级=skill_level,
-                    班组=worker.班组 or "",
+                    班组=matrix.teams[row] or "",
                     工作中心=work_center,
                     日期=target_date
                 )
@@ -205,7 +206,7 @@ class SchedulingEngine:
                 工作中心=work_center,
                 班组=position_results[0].班组 if position_results else "",
                 技能等级=f"{required_skill_level}级",
-                需求人数=required_people,
+                需求人数=demand[post_code],
                 已排人数=len(position_results),
                 员工列表=position_results
             )
@@ -213,6 +214,52 @@ class SchedulingEngine:
         
         return results, groups
     
+    def _select_workers_greedy(
+        self,
+        demand: Dict[str, int],
+        index: SchedulingIndex,
+        assigned_workers: Set[str]
+    ) -> Dict[str, List[Tuple[int, int]]]:
+        """贪心分配：按岗位顺序依次挑选员工，返回 岗位编码 -> [(员工行号, 技能等级)]"""
+        matrix = index.skill_matrix
+        selections = {}
+        
+        for post_code, required_people in demand.items():
+            # 查找技能要求
+            skill_req = index.get_requirement(post_code)
+            if not skill_req:
+                continue
+                
+            required_skill_level = skill_req.岗位技能等级
+            
+            # 有该岗位技能的员工（已按班组、技能等级降序排好）
+            skilled_workers = index.get_candidates(post_code)
+            
+            # 分配员工
+            assigned = []
+            
+            # 优先分配满足要求的员工
+            for row, skill_level in skilled_workers:
+                if len(assigned) >= required_people:
+                    break
+                worker_id = matrix.worker_ids[row]
+                if skill_level >= required_skill_level and worker_id not in assigned_workers:
+                    assigned.append((row, skill_level))
+                    assigned_workers.add(worker_id)
+            
+            # 如果还有空位，分配技能等级较低的员工
+            for row, skill_level in skilled_workers:
+                if len(assigned) >= required_people:
+                    break
+                worker_id = matrix.worker_ids[row]
+                if worker_id not in assigned_workers and skill_level < required_skill_level:
+                    assigned.append((row, skill_level))
+                    assigned_workers.add(worker_id)
+            
+            selections[post_code] = assigned
+        
+        return selections
+    
     def calculate_position_matching(self, groups: List[PositionGroup]) -> Dict[str, Any]:
         """计算人岗匹配度"""
         if not groups:
@@ -414,20 +461,23 @@ class SchedulingEngine:
         self, 
         groups: List[PositionGroup], 
         leaves: List[LeaveInfo],
-        skill_matrix: List[SkillMatrixData],
-        current_date: str
+        skill_matrix: SkillMatrix,
+        current_date: str,
+        availability: Optional[AvailabilityIndex] = None
     ) -> List[TeamWorkload]:
-        """计算班组负荷情况 - 重新设计，区分在岗和空闲人员"""
+        """计算班组负荷情况 - 重新设计，区分在岗和空闲人员
+
+        availability: 人员可用性索引（为空时由 leaves 构建）
+        """
         team_map = {}
         
         # 先收集所有在岗人员（已分配到具体岗位的人员）
         on_duty_workers = set()
-        leave_workers = set()
         
         # 收集请假人员
-        for leave in leaves:
-            if leave.请假日期 == current_date:
-                leave_workers.add(leave.工号)
+        if availability is None:
+            availability = AvailabilityIndex.build(leaves)
+        leave_workers = availability.unavailable_on(current_date) if current_date else set()
         
         # 收集在岗人员（分配到岗位且未请假的人员）
         for group in groups:
@@ -463,55 +513,56 @@ class SchedulingEngine:
                 team["技能分布"][skill_level] = team["技能分布"].get(skill_level, 0) + 1
         
         # 查找空闲人员（有技能但未分配到任何岗位的人员）
-        for skill_data in skill_matrix:
-            worker_id = skill_data.工号
+        skill_matrix = SkillMatrix.from_records(skill_matrix)
+        busy_workers = leave_workers | on_duty_workers
+        idle_rows = [
+            i for i, worker_id in enumerate(skill_matrix.worker_ids)
+            if worker_id not in busy_workers
+        ]
+        
+        # 一次性计算空闲人员中技能等级≥2的岗位
+        support_rows, support_cols = np.nonzero(skill_matrix.levels[idle_rows] >= 2)
+        support_by_row: Dict[int, List[int]] = {}
+        for r, c in zip(support_rows.tolist(), support_cols.tolist()):
+            support_by_row.setdefault(idle_rows[r], []).append(c)
+        
+        for i in idle_rows:
+            columns = support_by_row.get(i)
+            # 只有多技能人员才被认为是可调配的
+            if not columns:
+                continue
             
-            # 如果该员工未请假且未分配到任何岗位，则为空闲人员
-            if worker_id not in leave_workers and worker_id not in on_duty_workers:
-                # 根据技能矩阵推断所属班组（简化处理）
-                team_name = "备用班组"  # 默认班组，实际应用中可以更精确
-                
-                # 尝试从已有班组中推断
-                for team in team_map.keys():
-                    if team != "备用班组":
-                        team_name = team
-                        break
-                
-                if team_name not in team_map:
-                    team_map[team_name] = {
-                        "班组": team_name,
-                        "总人数": 0,
-                        "在岗人数": 0,
-                        "请假人数": 0,
-                        "技能分布": {},
-                        "负荷率": 0.0,
-                        "可调配人员": []
-                    }
-                
-                # 分析该员工的技能
-                support_positions = []
-                skill_distribution = {}
-                
-                if hasattr(skill_data, 'skills') and skill_data.skills:
-                    for skill_name, skill_level in skill_data.skills.items():
-                        if isinstance(skill_level, int) and skill_level >= 2:
-                            support_positions.append(skill_name)
-                            skill_distribution[skill_name] = skill_level
-                elif hasattr(skill_data, '技能等级分布') and skill_data.技能等级分布:
-                    for skill_name, skill_level in skill_data.技能等级分布.items():
-                        if isinstance(skill_level, int) and skill_level >= 2:
-                            support_positions.append(skill_name)
-                            skill_distribution[skill_name] = skill_level
-                
-                # 只有多技能人员才被认为是可调配的
-                if len(support_positions) >= 1:
-                    team_map[team_name]["可调配人员"].append({
-                        "工号": worker_id,
-                        "姓名": getattr(skill_data, '姓名', f'员工{worker_id}'),
-                        "可支援岗位": support_positions,
-                        "技能等级分布": skill_distribution,
-                        "状态": "空闲"
-                    })
+            # 根据技能矩阵推断所属班组（简化处理）
+            team_name = "备用班组"  # 默认班组，实际应用中可以更精确
+            
+            # 尝试从已有班组中推断
+            for team in team_map.keys():
+                if team != "备用班组":
+                    team_name = team
+                    break
+            
+            if team_name not in team_map:
+                team_map[team_name] = {
+                    "班组": team_name,
+                    "总人数": 0,
+                    "在岗人数": 0,
+                    "请假人数": 0,
+                    "技能分布": {},
+                    "负荷率": 0.0,
+                    "可调配人员": []
+                }
+            
+            row_levels = skill_matrix.levels[i]
+            skill_distribution = {
+                skill_matrix.position_codes[c]: int(row_levels[c]) for c in columns
+            }
+            team_map[team_name]["可调配人员"].append({
+                "工号": skill_matrix.worker_ids[i],
+                "姓名": skill_matrix.names[i],
+                "可支援岗位": list(skill_distribution.keys()),
+                "技能等级分布": skill_distribution,
+                "状态": "空闲"
+            })
         
         # 计算负荷率
         for team_name, team in team_map.items():
@@ -527,71 +578,132 @@ class SchedulingEngine:
         self,
         start_date: str,
         product_code: str,
-        sku_data: List[List[Any]],
-        position_data: List[List[Any]],
-        skill_data: List[List[Any]]
+        sku_data: List[List[Any]] = None,
+        position_data: List[List[Any]] = None,
+        skill_data: List[List[Any]] = None,
+        dataset: Optional[ParsedDataset] = None,
+        solver: str = "greedy",
+        weeks: int = 1,
+        availability: Optional[AvailabilityIndex] = None
     ) -> Dict[str, Tuple[List[SchedulingResult], List[PositionGroup]]]:
-        """生成一周排班"""
+        """生成一周排班（weeks>1 时连续生成多周）"""
+        if dataset is None:
+            dataset = self.build_dataset(sku_data, position_data, skill_data)
+        
         weekly_schedule = {}
+        for date_str, results, groups in self.iter_roster(
+            start_date, product_code, dataset, weeks=weeks, solver=solver, availability=availability
+        ):
+            weekly_schedule[date_str] = (results, groups)
+        
+        return weekly_schedule
+    
+    def iter_roster(
+        self,
+        start_date: str,
+        product_code: str,
+        dataset: ParsedDataset,
+        weeks: int = 1,
+        horizon: str = "week",
+        solver: str = "greedy",
+        replan_from: Optional[str] = None,
+        carry_assigned_workers: Optional[List[str]] = None,
+        availability: Optional[AvailabilityIndex] = None
+    ) -> Iterator[Tuple[str, List[SchedulingResult], List[PositionGroup]]]:
+        """逐日生成排班周期内的排班结果，每算完一天立即返回
+
+        岗位需求和索引在各天之间共享；同一周内已排班的员工在后续日期中增量排除，每周一重新开始。
+        replan_from: 只重排该日期及之后的日期，carry_assigned_workers 为该日期所在周此前已排班的员工。
+        availability: 人员可用性索引，整个周期每天不可用的员工一次区间查询得到。
+        """
+        demand = self._build_position_demand(dataset.tasks, product_code)
+        index = dataset.index
+        replan_dt = datetime.strptime(replan_from, "%Y/%m/%d") if replan_from else None
+        horizon_dates = self.get_horizon_dates(start_date, weeks, horizon)
+        unavailable_by_day = availability.unavailable_between(
+            horizon_dates[0], horizon_dates[-1]
+        ) if availability and horizon_dates else {}
         
+        assigned_workers_weekly: Set[str] = set()
+        current_monday = None
+        started = False
+        
+        for date in horizon_dates:
+            monday = date - timedelta(days=date.weekday())
+            if monday != current_monday:
+                current_monday = monday
+                assigned_workers_weekly = set()
+            
+            if replan_dt and date < replan_dt:
+                continue
+            if not started:
+                started = True
+                assigned_workers_weekly = set(carry_assigned_workers or [])
+            
+            date_str = date.strftime("%Y/%m/%d")
+            
+            # 执行单日排班（就地更新本周已分配员工）
+            results, groups = self._assign_positions(
+                date_str, demand, index, assigned_workers_weekly, solver,
+                unavailable_by_day.get(date.strftime("%Y-%m-%d"))
+            )
+            yield date_str, results, groups
+    
+    def get_horizon_dates(self, start_date: str, weeks: int = 1, horizon: str = "week") -> List[datetime]:
+        """计算排班周期内的日期
+
+        horizon="week": 从开始日期所在周的周一起连续 weeks 周；
+        horizon="month": 开始日期所在自然月的每一天。
+        """
         # 解析开始日期
         start_dt = datetime.strptime(start_date, "%Y/%m/%d")
         
+        if horizon == "month":
+            first_day = start_dt.replace(day=1)
+            next_month = (first_day + timedelta(days=32)).replace(day=1)
+            return [first_day + timedelta(days=i) for i in range((next_month - first_day).days)]
+        if horizon != "week":
+            raise ValueError(f"不支持的排班周期: {horizon}")
+        
         # 计算一周的日期（从周一开始）
         weekday = start_dt.weekday()  # 0=Monday, 6=Sunday
         monday = start_dt - timedelta(days=weekday)
         
-        week_dates = [monday + timedelta(days=i) for i in range(7)]
-        
-        assigned_workers_weekly = set()
-        
-        for date in week_dates:
-            date_str = date.strftime("%Y/%m/%d")
-            
-            # 执行单日排班
-            results, groups = self.perform_day_scheduling(
-                date_str,
-                product_code,
-                sku_data,
-                position_data,
-                skill_data,
-                list(assigned_workers_weekly)
-            )
-            
-            weekly_schedule[date_str] = (results, groups)
-            
-            # 更新已分配员工列表
-            for result in results:
-                assigned_workers_weekly.add(result.工号)
-        
-        return weekly_schedule
+        return [monday + timedelta(days=i) for i in range(7 * max(weeks, 1))]
     
     def generate_adjustment_suggestions(
         self,
         groups: List[PositionGroup], 
         leaves: List[LeaveInfo], 
         workloads: List[TeamWorkload],
-        skill_matrix: List[SkillMatrixData],
-        current_date: str
+        skill_matrix: SkillMatrix,
+        current_date: str,
+        availability: Optional[AvailabilityIndex] = None
     ) -> List[AdjustmentSuggestion]:
         """生成调整建议 - 基于岗位技能需求和空闲人员匹配"""
         suggestions = []
+        if availability is None:
+            availability = AvailabilityIndex.build(leaves)
         
         # 分析受请假影响的岗位及其缺口
         affected_positions = {}
+        groups_by_code = {g.岗位编码: g for g in groups}
+        positions_by_worker = self._positions_by_worker(groups)
         
-        for leave in leaves:
-            if leave.请假日期 == current_date:
-                for position_code in leave.影响岗位:
-                    group = next((g for g in groups if g.岗位编码 == position_code), None)
-                    if group:
-                        if position_code not in affected_positions:
-                            affected_positions[position_code] = {
-                                "group": group,
-                                "leave_workers": [],
-                                "required_skill_level": int(group.技能等级.replace("级", "")) if group.技能等级 else 3
-                            }
-                        affected_positions[position_code]["leave_workers"].append(leave.工号)
+        for leave in (availability.records_on(current_date) if current_date else []):
+            worker_id = leave.工号 if isinstance(leave, LeaveInfo) else leave.employee_id
+            leave_positions = getattr(leave, "影响岗位", None) or positions_by_worker.get(worker_id, [])
+            for position_code in leave_positions:
+                group = groups_by_code.get(position_code)
+                if group:
+                    if position_code not in affected_positions:
+                        affected_positions[position_code] = {
+                            "group": group,
+                            "leave_workers": [],
+                            "required_skill_level": int(group.技能等级.replace("级", "")) if group.技能等级 else 3
+                        }
+                    if worker_id not in affected_positions[position_code]["leave_workers"]:
+                        affected_positions[position_code]["leave_workers"].append(worker_id)
         
         # 为每个受影响的岗位寻找替代人员
         for position_code, data in affected_positions.items():
@@ -608,9 +720,9 @@ class SchedulingEngine:
                 
                 for workload in workloads:
                     for available_worker in workload.可调配人员:
-                        # 检查是否具备该岗位的技能
+                        # 检查是否具备该岗位的技能（技能等级分布只包含2级及以上的岗位，未列出按0级计）
                         worker_skill_level = available_worker["技能等级分布"].get(position_code, 0)
-                        
+
                         if worker_skill_level >= required_skill - 1:  # 允许技能等级稍低
                             suitable_candidates.append({
                                 "worker": available_worker,
@@ -674,7 +786,7 @@ class SchedulingEngine:
                 else:
                     # 没有合适的替代人员，生成加班建议
                     overtime_suggestion = self._generate_overtime_suggestion(
-                        group, shortage, leaves, current_date
+                        group, shortage, availability, current_date
                     )
                     if overtime_suggestion:
                         suggestions.append(overtime_suggestion)
@@ -682,6 +794,122 @@ class SchedulingEngine:
         # 按优先级排序
         return sorted(suggestions, key=lambda x: x.优先级, reverse=True)
     
+    def _positions_by_worker(self, groups: List[PositionGroup]) -> Dict[str, List[str]]:
+        """工号 -> 排班结果中该员工所在的岗位编码"""
+        positions: Dict[str, List[str]] = {}
+        for group in groups:
+            for worker in group.员工列表:
+                positions.setdefault(worker.工号, []).append(group.岗位编码)
+        return positions
+    
+    def patch_day_schedule(
+        self,
+        groups: List[PositionGroup],
+        leaves: List[LeaveInfo],
+        skill_matrix: SkillMatrix,
+        current_date: str,
+        excluded_workers: Optional[List[str]] = None,
+        availability: Optional[AvailabilityIndex] = None
+    ) -> Dict[str, Any]:
+        """批量请假后增量修补单日排班
+
+        一次确定全部受影响的岗位，只修改这些岗位组：移除当天不可用的员工，从空闲员工中按
+        （满足技能要求, 同班组, 技能等级）优先补位；补不满的岗位生成加班补偿建议。
+        excluded_workers: 不可调入的员工（如本周其他日期已排班的员工）。
+        返回修补后的全部岗位组、各受影响岗位的变更明细和汇总。
+        """
+        skill_matrix = SkillMatrix.from_records(skill_matrix)
+        if availability is None:
+            availability = AvailabilityIndex.build(leaves)
+        unavailable = availability.unavailable_on(current_date)
+        
+        # 受影响的岗位：显式指定的影响岗位 + 排班中不可用员工所在的岗位
+        positions_by_worker = self._positions_by_worker(groups)
+        affected_codes: Set[str] = set()
+        for worker_id in unavailable:
+            affected_codes.update(positions_by_worker.get(worker_id, []))
+        for leave in leaves:
+            if leave.影响岗位 and availability.is_unavailable(leave.工号, current_date):
+                affected_codes.update(leave.影响岗位)
+        
+        # 可补位的空闲员工：未排班、当天可用、未被排除
+        busy = set(positions_by_worker) | unavailable | set(excluded_workers or [])
+        free = np.ones(len(skill_matrix), dtype=bool)
+        free &= np.array([worker_id not in busy for worker_id in skill_matrix.worker_ids], dtype=bool)
+        team_names = np.array([team or "" for team in skill_matrix.teams], dtype=object)
+        
+        patched_groups: List[PositionGroup] = []
+        diff: List[Dict[str, Any]] = []
+        suggestions: List[AdjustmentSuggestion] = []
+        
+        for group in groups:
+            if group.岗位编码 not in affected_codes:
+                patched_groups.append(group)
+                continue
+            
+            required_skill = int(group.技能等级.replace("级", "")) if group.技能等级 else 3
+            removed = [worker for worker in group.员工列表 if worker.工号 in unavailable]
+            remaining = [worker for worker in group.员工列表 if worker.工号 not in unavailable]
+            shortage = max(0, group.需求人数 - len(remaining))
+            
+            # 补位：允许技能等级低一级，满足要求者优先，其次同班组、技能等级高者
+            added: List[SchedulingResult] = []
+            if shortage > 0:
+                levels = skill_matrix.position_levels(group.岗位编码).astype(np.int16)
+                rows = np.flatnonzero(free & (levels >= max(required_skill - 1, 1)))
+                order = np.lexsort((
+                    rows,
+                    -levels[rows],
+                    team_names[rows] != group.班组,
+                    levels[rows] < required_skill
+                ))
+                for row in rows[order][:shortage].tolist():
+                    free[row] = False
+                    added.append(SchedulingResult(
+                        岗位编码=group.岗位编码,
+                        姓名=skill_matrix.names[row],
+                        工号=skill_matrix.worker_ids[row],
+                        技能等级=int(levels[row]),
+                        班组=skill_matrix.teams[row] or "",
+                        工作中心=group.工作中心,
+                        日期=current_date
+                    ))
+            
+            workers = remaining + added
+            patched = group.model_copy(update={"员工列表": workers, "已排人数": len(workers)})
+            patched_groups.append(patched)
+            unfilled = max(0, group.需求人数 - len(workers))
+            diff.append({
+                "岗位编码": group.岗位编码,
+                "班组": group.班组,
+                "需求人数": group.需求人数,
+                "原已排人数": group.已排人数,
+                "已排人数": len(workers),
+                "移除人员": removed,
+                "新增人员": added,
+                "缺口": unfilled
+            })
+            
+            if unfilled > 0:
+                overtime_suggestion = self._generate_overtime_suggestion(
+                    patched, unfilled, availability, current_date
+                )
+                if overtime_suggestion:
+                    suggestions.append(overtime_suggestion)
+        
+        return {
+            "groups": patched_groups,
+            "diff": diff,
+            "suggestions": suggestions,
+            "summary": {
+                "不可用人数": len(unavailable),
+                "受影响岗位数": len(diff),
+                "移除人数": sum(len(d["移除人员"]) for d in diff),
+                "补位人数": sum(len(d["新增人员"]) for d in diff),
+                "剩余缺口": sum(d["缺口"] for d in diff)
+            }
+        }
+    
     def _generate_implementation_advice(
         self, position_code: str, candidates: List[Dict], 
         source_team: str, target_team: str
@@ -699,7 +927,7 @@ class SchedulingEngine:
     
     def _generate_internal_team_adjustment(
         self, group: PositionGroup, workloads: List[TeamWorkload], 
-        shortage: int, skill_matrix: List[SkillMatrixData]
+        shortage: int, skill_matrix: SkillMatrix
     ) -> Optional[AdjustmentSuggestion]:
         """生成班组内调整建议"""
         team_workload = next((w for w in workloads if w.班组 == group.班组), None)
@@ -744,7 +972,7 @@ class SchedulingEngine:
     
     def _generate_cross_team_adjustment(
         self, group: PositionGroup, workloads: List[TeamWorkload], 
-        shortage: int, skill_matrix: List[SkillMatrixData]
+        shortage: int, skill_matrix: SkillMatrix
     ) -> Optional[AdjustmentSuggestion]:
         """生成跨班组调整建议"""
         other_teams = [w for w in workloads if w.班组 != group.班组 and w.负荷率 < 90]
@@ -799,13 +1027,12 @@ class SchedulingEngine:
     
     def _generate_overtime_suggestion(
         self, group: PositionGroup, shortage: int, 
-        leaves: List[LeaveInfo], current_date: str
+        availability: AvailabilityIndex, current_date: str
     ) -> Optional[AdjustmentSuggestion]:
         """生成加班补偿建议"""
         remaining_workers = [
             worker for worker in group.员工列表
-            if not any(leave.工号 == worker.工号 and leave.请假日期 == current_date 
-                      for leave in leaves)
+            if not availability.is_unavailable(worker.工号, current_date)
         ]
         
         if not remaining_workers:
@@ -855,7 +1082,7 @@ class SchedulingEngine:
     
     def analyze_leave_impact(
         self, groups: List[PositionGroup], leave_info: LeaveInfo,
-        skill_matrix: List[SkillMatrixData]
+        skill_matrix: SkillMatrix
     ) -> Dict[str, Any]:
         """分析请假对排班的影响"""
         impact_analysis = {
@@ -864,8 +1091,10 @@ class SchedulingEngine:
             "suggested_actions": []
         }
         
-        for position in leave_info.影响岗位:
-            group = next((g for g in groups if g.岗位编码 == position), None)
+        groups_by_code = {g.岗位编码: g for g in groups}
+        affected = leave_info.影响岗位 or self._positions_by_worker(groups).get(leave_info.工号, [])
+        for position in affected:
+            group = groups_by_code.get(position)
             if group:
                 # 计算影响
                 remaining_capacity = (group.已排人数 - 1) / group.需求人数 if group.需求人数 > 0 else 0
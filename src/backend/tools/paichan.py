@@ -3,17 +3,99 @@
 实现多客户排产和产能优化的核心算法逻辑
 """
 
-from typing import List, Dict, Optional, Union, Any, Tuple
+from typing import List, Dict, Optional, Union, Any, Tuple, Iterator, NamedTuple
 from models import (
     CustomerOrder, CapacityPlan, ProductionScheduleResult, 
     CapacityOptimizationPlan, MultiPlanProductionRequest,
     MultiPlanProductionResponse, ProductionToSchedulingRequest,
     ProductionToSchedulingResponse, WorkCenterScheduleResult, WorkCenterProductionPlan
 )
+from .dataset import ParsedDataset
+from .capacity_fill import CapacityFiller
+from .cost_table import CapacityCostTable
+from .changeover_sequencing import sequence_orders, sequence_changeover_minutes
+from .timeline import DayCalendar, FreeTimeline
+from .plan_search import PlanEvaluator, CapacityPlanSearch, resolve_search_levels, select_spread
+from .parallel import effective_workers, imap_chunked
 from datetime import datetime, timedelta
+import heapq
 import itertools
 import uuid
 
+import numpy as np
+
+# 推荐方案综合评分的默认权重：成本0.4，完成率0.3，产能利用率0.3
+DEFAULT_SCORE_WEIGHTS: Dict[str, float] = {"cost": 0.4, "completion": 0.3, "utilization": 0.3}
+
+# 共享进程池的工作进程内复用的引擎实例（按需创建，不随请求重建）
+_worker_engines: Dict[str, Any] = {}
+
+
+def _evaluate_plan_chunk(
+    shared: Tuple[Dict[int, Dict[str, float]], List[CustomerOrder], List[CustomerOrder], Dict[str, float]],
+    plans_with_costs: List[Tuple[CapacityPlan, Dict[str, float]]]
+) -> List["CapacityOptimizationPlan"]:
+    """在工作进程内评估一块产能方案及其已批量算好的成本明细（共享数据：产能配置、订单、已排序订单、成本参数）"""
+    capacity_config, orders, sorted_orders, cost_params = shared
+    engine = _worker_engines.get("production")
+    if engine is None:
+        engine = _worker_engines["production"] = ProductionSchedulingEngine()
+    engine.capacity_config = capacity_config
+    return [
+        engine.calculate_production_schedule(
+            orders, plan, cost_params, sorted_orders=sorted_orders, cost_breakdown=costs
+        )
+        for plan, costs in plans_with_costs
+    ]
+
+
+class _PlanStats(NamedTuple):
+    """方案汇总指标（流式输出方案后只保留这些字段用于推荐和对比）"""
+    plan_id: str
+    plan_name: str
+    total_cost: float
+    completion_rate: float
+    capacity_utilization: float
+    is_baseline: bool
+
+
+def _schedule_integration_day(
+    scheduling_engine: Any,
+    dataset: ParsedDataset,
+    solver: str,
+    date: str,
+    demand: Dict[str, int]
+) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """按当天岗位需求排班并计算性能指标，返回 (日期, 排班结果, 错误信息)"""
+    try:
+        assigned_workers = set()
+        results, groups = scheduling_engine._assign_positions(
+            date.replace("-", "/"), demand, dataset.index, assigned_workers, solver
+        )
+        return date, {
+            "results": results,
+            "groups": groups,
+            "performance_metrics": {
+                "人岗匹配度": scheduling_engine.calculate_position_matching(groups),
+                "工时利用率": scheduling_engine.calculate_work_hour_efficiency(groups)
+            }
+        }, None
+    except Exception as e:
+        return date, None, str(e)
+
+
+def _schedule_integration_chunk(
+    shared: Tuple[ParsedDataset, str],
+    days: List[Tuple[str, Dict[str, int]]]
+) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """在工作进程内排一块日期（共享数据：岗位和技能数据集、求解模式）"""
+    dataset, solver = shared
+    scheduling_engine = _worker_engines.get("scheduling")
+    if scheduling_engine is None:
+        from .paiban import SchedulingEngine
+        scheduling_engine = _worker_engines["scheduling"] = SchedulingEngine()
+    return [_schedule_integration_day(scheduling_engine, dataset, solver, *day) for day in days]
+
 class ProductionSchedulingEngine:
     """多客户排产算法引擎"""
     
@@ -41,6 +123,10 @@ class ProductionSchedulingEngine:
             260: {"节拍": 318, "能耗": 760, "定员": 1230, "人效": 4.73}
         }
         
+        # 产能成本查找表，按需由 capacity_config 构建（见 cost_table）
+        self._cost_table: Optional[CapacityCostTable] = None
+        self._cost_table_source: Optional[Dict[int, Dict[str, float]]] = None
+        
         # 转产时间配置（基于用户提供的转产时间表格数据）
         self.changeover_time_config = {
             "HL": {
@@ -69,6 +155,24 @@ class ProductionSchedulingEngine:
             }
         }
         
+        # 各箱型的工艺路线：按工序先后排列，同一工序内的工作中心并行生产，全部完成后才能进入下一工序
+        self.routing_config = {
+            "HL": [
+                ["前框", "T地板"],
+                ["顶板发泡", "侧板发泡", "底架发泡"],
+                ["总装"],
+                ["涂装"],
+                ["内装修"]
+            ],
+            "20尺小箱": [
+                ["内侧板线", "外侧板线", "底架线", "T地板线", "前框线", "后框线"],
+                ["顶板发泡", "侧板发泡", "底架发泡"],
+                ["总装线"],
+                ["涂装线"],
+                ["完工线"]
+            ]
+        }
+        
         # 产品编码到箱型的映射（基于用户提供的基础箱型库数据）
         self.product_to_box_type = {
             "C1B010000036": "HL",
@@ -187,41 +291,79 @@ class ProductionSchedulingEngine:
         
         return plans
     
+    def search_capacity_plans(
+        self,
+        orders: List[CustomerOrder],
+        working_dates: List[str],
+        baseline_capacity: int,
+        variation: int,
+        time_budget: float = 2.0,
+        max_plans: int = 10,
+        search_levels: Optional[List[int]] = None,
+        seed: int = 0
+    ) -> Tuple[List[CapacityPlan], Dict[str, Any]]:
+        """搜索产能方案：每天从可选档位中选择产能，返回 Pareto 方案（按成本升序）和搜索统计"""
+        levels = resolve_search_levels(
+            list(self.capacity_config.keys()), baseline_capacity, variation, search_levels
+        )
+        evaluator = PlanEvaluator(
+            self.sort_orders(orders), working_dates, np.array(levels), self.cost_table.level_costs(levels)
+        )
+        search = CapacityPlanSearch(evaluator, time_budget=time_budget, seed=seed)
+        plan_levels, scores = search.run()
+        
+        baseline_cost = float(evaluator.level_costs[
+            int(np.argmin(np.abs(evaluator.levels - baseline_capacity)))
+        ]) * len(evaluator.working_dates)
+        
+        plans = []
+        for rank, i in enumerate(select_spread(len(plan_levels), max_plans)):
+            capacities = evaluator.capacities(plan_levels[i]).tolist()
+            plans.append(CapacityPlan(
+                plan_id=f"search_{rank}",
+                plan_name=f"搜索方案{rank + 1}(产能{min(capacities)}-{max(capacities)})",
+                daily_capacities=dict(zip(evaluator.working_dates, capacities)),
+                is_baseline=False,
+                cost_coefficient=round(float(scores["total_cost"][i]) / baseline_cost, 4) if baseline_cost else 1.0
+            ))
+        
+        summary = {
+            "levels": levels,
+            "evaluations": search.evaluations,
+            "pareto_size": len(plan_levels),
+            "returned_plans": len(plans),
+            "time_budget": time_budget
+        }
+        return plans, summary
+    
     def calculate_production_schedule(
         self, 
         orders: List[CustomerOrder], 
         capacity_plan: CapacityPlan,
-        cost_params: Dict[str, float]
+        cost_params: Dict[str, float],
+        sorted_orders: Optional[List[CustomerOrder]] = None,
+        cost_breakdown: Optional[Dict[str, float]] = None
     ) -> CapacityOptimizationPlan:
-        """计算特定产能方案的排产结果"""
+        """计算特定产能方案的排产结果（sorted_orders、cost_breakdown 为多方案共享计算时传入的已排序订单和成本明细）"""
         
-        # 按优先级和交期排序订单
-        sorted_orders = sorted(orders, key=lambda x: (
-            -x.priority,  # 优先级降序
-            x.due_date,   # 交期升序
-            x.order_date  # 订单日期升序
-        ))
+        if sorted_orders is None:
+            sorted_orders = self.sort_orders(orders)
         
         scheduled_results = []
-        daily_capacity_used = {date: 0 for date in capacity_plan.daily_capacities.keys()}
+        filler = CapacityFiller(capacity_plan.daily_capacities)
+        # 交期只解析一次（相同交期共享）
+        due_ordinals: Dict[str, int] = {}
         
         for order in sorted_orders:
-            # 寻找最早可安排的日期
-            remaining_quantity = order.quantity
-            current_results = []
+            due_ordinal = due_ordinals.get(order.due_date)
+            if due_ordinal is None:
+                due_ordinal = datetime.strptime(order.due_date, "%Y-%m-%d").toordinal()
+                due_ordinals[order.due_date] = due_ordinal
             
-            for date in sorted(capacity_plan.daily_capacities.keys()):
-                if remaining_quantity <= 0:
-                    break
-                
-                available_capacity = capacity_plan.daily_capacities[date] - daily_capacity_used[date]
-                if available_capacity <= 0:
-                    continue
-                
-                # 安排生产
-                quantity_to_schedule = min(remaining_quantity, available_capacity)
-                
-                result = ProductionScheduleResult(
+            # 从最早有空余产能的日期开始安排生产
+            for i, quantity_to_schedule in filler.fill(order.quantity):
+                date = filler.dates[i]
+                scheduled_results.append(ProductionScheduleResult(
                     order_id=order.order_id,
                     customer_name=order.customer_name,
                     product_code=order.product_code,
@@ -229,28 +371,17 @@ class ProductionSchedulingEngine:
                     scheduled_date=date,
                     capacity_used=quantity_to_schedule,
                     completion_date=date,
-                    delay_days=max(0, (datetime.strptime(date, "%Y-%m-%d") - 
-                                     datetime.strptime(order.due_date, "%Y-%m-%d")).days)
-                )
-                
-                current_results.append(result)
-                daily_capacity_used[date] += quantity_to_schedule
-                remaining_quantity -= quantity_to_schedule
-            
-            scheduled_results.extend(current_results)
+                    delay_days=max(0, filler.ordinals[i] - due_ordinal)
+                ))
         
         # 计算方案指标
         total_orders = len(orders)
         completed_orders = len(set(r.order_id for r in scheduled_results))
         
-        total_cost = self._calculate_total_cost(
-            scheduled_results, capacity_plan, cost_params
-        )
-        
-        # 计算成本明细
-        cost_breakdown = self._calculate_cost_breakdown(
-            scheduled_results, capacity_plan, cost_params
-        )
+        # 计算成本明细（已批量计算时直接使用）
+        if cost_breakdown is None:
+            cost_breakdown = self._calculate_cost_breakdown(capacity_plan)
+        total_cost = cost_breakdown["total_cost"]
         
         completion_rate = completed_orders / total_orders if total_orders > 0 else 0
         
@@ -289,74 +420,111 @@ class ProductionSchedulingEngine:
             }
         )
     
-    def _calculate_total_cost(
+    def sort_orders(self, orders: List[CustomerOrder]) -> List[CustomerOrder]:
+        """按优先级和交期排序订单"""
+        return sorted(orders, key=lambda x: (
+            -x.priority,  # 优先级降序
+            x.due_date,   # 交期升序
+            x.order_date  # 订单日期升序
+        ))
+    
+    def evaluate_capacity_plans(
         self,
-        results: List[ProductionScheduleResult],
-        capacity_plan: CapacityPlan,
-        cost_params: Dict[str, float]
-    ) -> float:
-        """计算总成本 - 根据新的公式：能耗成本=能耗×1 ¥/kWh，人效成本=人效×360 ¥/人"""
-        total_energy_cost = 0
-        total_labor_cost = 0
-        
-        # 计算每日的能耗成本和人效成本
-        for date, capacity in capacity_plan.daily_capacities.items():
-            if capacity in self.capacity_config:
-                config = self.capacity_config[capacity]
-                # 能耗成本 = 能耗 × 1 ¥/kWh
-                energy_cost = config["能耗"] * 1.0
-                # 人效成本 = 人效 × 360 ¥/人  
-                labor_cost = config["人效"] * 360.0
-                
-                total_energy_cost += energy_cost
-                total_labor_cost += labor_cost
-            else:
-                # 如果没有匹配的产能配置，使用线性插值或基准值
-                baseline_config = self.capacity_config.get(180, {"能耗": 658, "人效": 4.8})
-                energy_cost = baseline_config["能耗"] * 1.0
-                labor_cost = baseline_config["人效"] * 360.0
-                
-                total_energy_cost += energy_cost
-                total_labor_cost += labor_cost
+        orders: List[CustomerOrder],
+        capacity_plans: List[CapacityPlan],
+        cost_params: Dict[str, float],
+        workers: int = 0
+    ) -> List[CapacityOptimizationPlan]:
+        """评估多个产能方案，结果顺序与 capacity_plans 一致
+
+        各方案的成本明细先用成本查找表批量算出；workers > 1 时在共享进程池中按块并行评估，
+        实际进程数不超过进程池大小（CPU 核数）。
+        """
+        sorted_orders = self.sort_orders(orders)
+        plan_costs = self.calculate_plan_costs(capacity_plans)
+        workers = effective_workers(workers, len(capacity_plans))
         
-        # 总成本 = 能耗成本 + 人效成本（去掉延误罚金）
-        return total_energy_cost + total_labor_cost
+        if workers <= 1:
+            return [
+                self.calculate_production_schedule(
+                    orders, plan, cost_params, sorted_orders=sorted_orders, cost_breakdown=costs
+                )
+                for plan, costs in zip(capacity_plans, plan_costs)
+            ]
+        
+        return list(imap_chunked(
+            _evaluate_plan_chunk,
+            (self.capacity_config, orders, sorted_orders, cost_params),
+            list(zip(capacity_plans, plan_costs)),
+            workers
+        ))
+    
+    @property
+    def cost_table(self) -> CapacityCostTable:
+        """产能成本查找表（产能配置被替换时重新构建）"""
+        if self._cost_table_source is not self.capacity_config:
+            self._cost_table = CapacityCostTable(self.capacity_config)
+            self._cost_table_source = self.capacity_config
+        return self._cost_table
+    
+    def calculate_plan_costs(self, capacity_plans: List[CapacityPlan]) -> List[Dict[str, float]]:
+        """批量计算方案成本明细：能耗成本=能耗×1 ¥/kWh，人效成本=人效×360 ¥/人（不含延误罚金）
+
+        未配置的产能在相邻配置档位之间线性插值。
+        """
+        costs = self.cost_table.evaluate(
+            [list(plan.daily_capacities.values()) for plan in capacity_plans]
+        )
+        return [
+            {
+                "energy_cost": float(costs["energy_cost"][i]),
+                "labor_cost": float(costs["labor_cost"][i]),
+                "total_cost": float(costs["total_cost"][i])
+            }
+            for i in range(len(capacity_plans))
+        ]
+    
+    def _calculate_cost_breakdown(self, capacity_plan: CapacityPlan) -> Dict[str, float]:
+        """计算单个方案的成本明细"""
+        return self.calculate_plan_costs([capacity_plan])[0]
     
-    def _calculate_cost_breakdown(
+    def _build_capacity_plans(
         self,
-        results: List[ProductionScheduleResult],
-        capacity_plan: CapacityPlan,
-        cost_params: Dict[str, float]
-    ) -> Dict[str, float]:
-        """计算成本明细"""
-        total_energy_cost = 0
-        total_labor_cost = 0
-        
-        # 计算每日的能耗成本和人效成本
-        for date, capacity in capacity_plan.daily_capacities.items():
-            if capacity in self.capacity_config:
-                config = self.capacity_config[capacity]
-                # 能耗成本 = 能耗 × 1 ¥/kWh
-                energy_cost = config["能耗"] * 1.0
-                # 人效成本 = 人效 × 360 ¥/人  
-                labor_cost = config["人效"] * 360.0
-                
-                total_energy_cost += energy_cost
-                total_labor_cost += labor_cost
-            else:
-                # 如果没有匹配的产能配置，使用基准值
-                baseline_config = self.capacity_config.get(180, {"能耗": 658, "人效": 4.8})
-                energy_cost = baseline_config["能耗"] * 1.0
-                labor_cost = baseline_config["人效"] * 360.0
-                
-                total_energy_cost += energy_cost
-                total_labor_cost += labor_cost
+        request: MultiPlanProductionRequest
+    ) -> Tuple[List[CapacityPlan], Optional[Dict[str, Any]]]:
+        """生成产能方案：预置的六种方案，或在可选档位上搜索 Pareto 方案（返回方案和搜索摘要）"""
+        working_dates = self.get_working_dates(request.start_date)
         
-        return {
-            "energy_cost": total_energy_cost,
-            "labor_cost": total_labor_cost,
-            "total_cost": total_energy_cost + total_labor_cost
-        }
+        if request.plan_mode == "search":
+            baseline_level = min(
+                self.capacity_config, key=lambda c: abs(c - request.baseline_capacity)
+            )
+            searched_plans, search_summary = self.search_capacity_plans(
+                request.orders,
+                working_dates,
+                request.baseline_capacity,
+                request.capacity_variation,
+                time_budget=request.search_time_budget,
+                max_plans=request.search_max_plans,
+                search_levels=request.search_levels,
+                seed=request.search_seed
+            )
+            capacity_plans = [CapacityPlan(
+                plan_id="baseline",
+                plan_name=f"基准方案(产能{baseline_level})",
+                daily_capacities={date: baseline_level for date in working_dates},
+                is_baseline=True,
+                cost_coefficient=1.0
+            )] + searched_plans
+            return capacity_plans, search_summary
+        if request.plan_mode == "preset":
+            capacity_plans = self.generate_capacity_plans(
+                working_dates, 
+                request.baseline_capacity, 
+                request.capacity_variation
+            )
+            return capacity_plans, None
+        raise ValueError(f"不支持的方案生成模式: {request.plan_mode}")
     
     def multi_plan_production_scheduling(
         self, 
@@ -364,27 +532,20 @@ class ProductionSchedulingEngine:
     ) -> MultiPlanProductionResponse:
         """多方案排产优化"""
         
-        # 获取工作日
-        working_dates = self.get_working_dates(request.start_date)
+        capacity_plans, search_summary = self._build_capacity_plans(request)
         
-        # 生成产能方案
-        capacity_plans = self.generate_capacity_plans(
-            working_dates, 
-            request.baseline_capacity, 
-            request.capacity_variation
+        # 计算各方案排产结果（可并行）
+        evaluated_plans = self.evaluate_capacity_plans(
+            request.orders,
+            capacity_plans,
+            request.cost_params,
+            workers=request.evaluation_workers
         )
         
-        # 计算各方案排产结果
         baseline_plan = None
         optimized_plans = []
         
-        for capacity_plan in capacity_plans:
-            optimization_plan = self.calculate_production_schedule(
-                request.orders, 
-                capacity_plan, 
-                request.cost_params
-            )
-            
+        for capacity_plan, optimization_plan in zip(capacity_plans, evaluated_plans):
             if capacity_plan.is_baseline:
                 baseline_plan = optimization_plan
             else:
@@ -393,15 +554,22 @@ class ProductionSchedulingEngine:
         # 按总成本排序优化方案
         optimized_plans.sort(key=lambda x: x.total_cost)
         
-        # 选择推荐方案（综合成本和完成率）
+        # 一次性汇总各方案指标并计算综合评分
+        plan_summary = self._summarize_plans(
+            [baseline_plan] + optimized_plans, request.score_weights
+        )
+        
+        # 选择推荐方案（综合成本、完成率和产能利用率）
         recommended_plan = self._select_recommended_plan(
-            baseline_plan, optimized_plans
+            baseline_plan, optimized_plans, plan_summary
         )
         
         # 生成对比指标
         comparison_metrics = self._generate_comparison_metrics(
-            baseline_plan, optimized_plans, recommended_plan
+            baseline_plan, optimized_plans, recommended_plan, plan_summary
         )
+        if search_summary is not None:
+            comparison_metrics["search_summary"] = search_summary
         
         return MultiPlanProductionResponse(
             baseline_plan=baseline_plan,
@@ -410,121 +578,208 @@ class ProductionSchedulingEngine:
             comparison_metrics=comparison_metrics
         )
     
+    def iter_capacity_plan_evaluations(
+        self,
+        orders: List[CustomerOrder],
+        capacity_plans: List[CapacityPlan],
+        cost_params: Dict[str, float],
+        workers: int = 0
+    ) -> Iterator[CapacityOptimizationPlan]:
+        """逐个评估产能方案，每评估完一个立即返回，顺序与 capacity_plans 一致
+
+        workers > 1 时在共享进程池中按块并行评估，同时在途的方案数有上限，结果不会在消费端之前堆积。
+        """
+        sorted_orders = self.sort_orders(orders)
+        plan_costs = self.calculate_plan_costs(capacity_plans)
+        workers = effective_workers(workers, len(capacity_plans))
+        
+        if workers <= 1:
+            for plan, costs in zip(capacity_plans, plan_costs):
+                yield self.calculate_production_schedule(
+                    orders, plan, cost_params, sorted_orders=sorted_orders, cost_breakdown=costs
+                )
+            return
+        
+        yield from imap_chunked(
+            _evaluate_plan_chunk,
+            (self.capacity_config, orders, sorted_orders, cost_params),
+            list(zip(capacity_plans, plan_costs)),
+            workers
+        )
+    
+    def iter_multi_plan_production(
+        self,
+        request: MultiPlanProductionRequest
+    ) -> Iterator[Tuple[str, Any]]:
+        """多方案排产优化的流式版本：逐个返回 ("plan", 方案排产结果)，最后返回 ("summary", 推荐和对比指标)
+
+        已返回的方案只保留成本、完成率和产能利用率等汇总指标，内存占用不随方案明细（排产天数、订单数）增长。
+        推荐方案和对比指标与 multi_plan_production_scheduling 的结果一致。
+        """
+        capacity_plans, search_summary = self._build_capacity_plans(request)
+        
+        stats: List[_PlanStats] = []
+        evaluations = self.iter_capacity_plan_evaluations(
+            request.orders, capacity_plans, request.cost_params, workers=request.evaluation_workers
+        )
+        for capacity_plan, plan in zip(capacity_plans, evaluations):
+            stats.append(_PlanStats(
+                plan.plan_id, plan.plan_name, plan.total_cost,
+                plan.completion_rate, plan.capacity_utilization, capacity_plan.is_baseline
+            ))
+            yield "plan", plan
+        
+        baseline_plan = next((s for s in stats if s.is_baseline), None)
+        if baseline_plan is None:
+            raise ValueError("产能方案中缺少基准方案")
+        optimized_plans = sorted((s for s in stats if not s.is_baseline), key=lambda s: s.total_cost)
+        
+        plan_summary = self._summarize_plans([baseline_plan] + optimized_plans, request.score_weights)
+        recommended_plan = self._select_recommended_plan(baseline_plan, optimized_plans, plan_summary)
+        comparison_metrics = self._generate_comparison_metrics(
+            baseline_plan, optimized_plans, recommended_plan, plan_summary
+        )
+        if search_summary is not None:
+            comparison_metrics["search_summary"] = search_summary
+        
+        yield "summary", {
+            "baseline_plan_id": baseline_plan.plan_id,
+            "optimized_plan_ids": [s.plan_id for s in optimized_plans],
+            "recommended_plan_id": recommended_plan.plan_id,
+            "comparison_metrics": comparison_metrics
+        }
+    
+    def _summarize_plans(
+        self,
+        all_plans: List[CapacityOptimizationPlan],
+        score_weights: Optional[Dict[str, float]] = None
+    ) -> Dict[str, np.ndarray]:
+        """一次遍历收集各方案指标，并计算综合评分
+
+        成本评分按全部方案的最低/最高成本归一化（越低越好，转换为0-1分数），只计算一次。
+        """
+        weights = dict(DEFAULT_SCORE_WEIGHTS)
+        if score_weights:
+            unknown = set(score_weights) - set(weights)
+            if unknown:
+                raise ValueError(f"不支持的评分权重: {', '.join(sorted(unknown))}")
+            weights.update(score_weights)
+        
+        costs = np.array([p.total_cost for p in all_plans], dtype=np.float64)
+        completion = np.array([p.completion_rate for p in all_plans], dtype=np.float64)
+        utilization = np.array([p.capacity_utilization for p in all_plans], dtype=np.float64)
+        
+        max_cost, min_cost = costs.max(), costs.min()
+        if max_cost > min_cost:
+            cost_score = 1 - (costs - min_cost) / (max_cost - min_cost)
+        else:
+            cost_score = np.ones(len(all_plans))
+        
+        scores = (
+            cost_score * weights["cost"]
+            + completion * weights["completion"]
+            + utilization * weights["utilization"]
+        )
+        return {
+            "costs": costs,
+            "completion": completion,
+            "utilization": utilization,
+            "scores": scores
+        }
+    
     def _select_recommended_plan(
         self, 
         baseline_plan: CapacityOptimizationPlan,
-        optimized_plans: List[CapacityOptimizationPlan]
+        optimized_plans: List[CapacityOptimizationPlan],
+        summary: Optional[Dict[str, np.ndarray]] = None
     ) -> CapacityOptimizationPlan:
-        """选择推荐方案"""
+        """选择推荐方案（综合评分最高，同分时取靠前的方案）"""
         if not optimized_plans:
             return baseline_plan
         
-        # 综合评分：成本权重0.4，完成率权重0.3，产能利用率权重0.3
-        def calculate_score(plan: CapacityOptimizationPlan) -> float:
-            # 成本评分（越低越好，转换为0-1分数）
-            max_cost = max(p.total_cost for p in [baseline_plan] + optimized_plans)
-            min_cost = min(p.total_cost for p in [baseline_plan] + optimized_plans)
-            cost_score = 1 - (plan.total_cost - min_cost) / (max_cost - min_cost) if max_cost > min_cost else 1
-            
-            # 完成率评分
-            completion_score = plan.completion_rate
-            
-            # 产能利用率评分
-            utilization_score = plan.capacity_utilization
-            
-            return cost_score * 0.4 + completion_score * 0.3 + utilization_score * 0.3
-        
         all_plans = [baseline_plan] + optimized_plans
-        best_plan = max(all_plans, key=calculate_score)
+        if summary is None:
+            summary = self._summarize_plans(all_plans)
         
-        return best_plan
+        return all_plans[int(np.argmax(summary["scores"]))]
     
     def _generate_comparison_metrics(
         self,
         baseline_plan: CapacityOptimizationPlan,
         optimized_plans: List[CapacityOptimizationPlan],
-        recommended_plan: CapacityOptimizationPlan
+        recommended_plan: CapacityOptimizationPlan,
+        summary: Optional[Dict[str, np.ndarray]] = None,
+        top_k: int = 10
     ) -> Dict[str, Any]:
         """生成对比指标"""
         all_plans = [baseline_plan] + optimized_plans
+        if summary is None:
+            summary = self._summarize_plans(all_plans)
+        
+        costs = summary["costs"]
+        scores = summary["scores"]
+        
+        # 综合评分前 top_k 的方案（部分排序）
+        top_indices = heapq.nlargest(min(top_k, len(all_plans)), range(len(all_plans)), key=lambda i: scores[i])
         
         return {
             "cost_comparison": {
                 "baseline_cost": baseline_plan.total_cost,
-                "best_cost": min(p.total_cost for p in all_plans),
-                "worst_cost": max(p.total_cost for p in all_plans),
+                "best_cost": float(costs.min()),
+                "worst_cost": float(costs.max()),
                 "recommended_cost": recommended_plan.total_cost,
                 "cost_saving": baseline_plan.total_cost - recommended_plan.total_cost
             },
             "performance_comparison": {
                 "baseline_completion_rate": baseline_plan.completion_rate,
-                "best_completion_rate": max(p.completion_rate for p in all_plans),
+                "best_completion_rate": float(summary["completion"].max()),
                 "recommended_completion_rate": recommended_plan.completion_rate,
                 "baseline_utilization": baseline_plan.capacity_utilization,
-                "best_utilization": max(p.capacity_utilization for p in all_plans),
+                "best_utilization": float(summary["utilization"].max()),
                 "recommended_utilization": recommended_plan.capacity_utilization
             },
             "plan_summary": {
                 "total_plans": len(all_plans),
-                "baseline_rank": sorted(all_plans, key=lambda x: x.total_cost).index(baseline_plan) + 1,
+                # 基准方案排在同成本方案之前
+                "baseline_rank": int((costs < baseline_plan.total_cost).sum()) + 1,
                 "recommended_plan_id": recommended_plan.plan_id,
                 "recommended_plan_name": recommended_plan.plan_name
-            }
+            },
+            "score_ranking": [
+                {
+                    "plan_id": all_plans[i].plan_id,
+                    "plan_name": all_plans[i].plan_name,
+                    "score": round(float(scores[i]), 4)
+                }
+                for i in top_indices
+            ]
         }
     
     def integrate_production_to_scheduling(
         self, 
-        request: ProductionToSchedulingRequest
+        request: ProductionToSchedulingRequest,
+        dataset: Optional[ParsedDataset] = None
     ) -> ProductionToSchedulingResponse:
-        """集成排产到排班"""
-        from .paiban import SchedulingEngine
-        
-        scheduling_engine = SchedulingEngine()
+        """集成排产到排班（传入数据集时复用已解析的岗位和技能矩阵数据）
+
+        排班失败的日期及错误信息记录在 integration_metrics["failed_days"] 中。
+        """
         daily_schedules = {}
         integration_metrics = {
             "total_production_days": len(request.production_schedule),
             "total_scheduling_days": 0,
-            "integration_success_rate": 0.0
+            "integration_success_rate": 0.0,
+            "failed_days": []
         }
         
         successful_days = 0
         
-        for date, production_results in request.production_schedule.items():
-            try:
-                # 根据排产结果确定当日产品需求
-                total_quantity = sum(r.quantity for r in production_results)
-                primary_product = production_results[0].product_code if production_results else ""
-                
-                # 执行排班（这里需要模拟SKU数据）
-                # 实际应用中需要根据排产结果动态生成SKU需求
-                mock_sku_data = self._generate_mock_sku_data(production_results)
-                
-                results, groups = scheduling_engine.perform_day_scheduling(
-                    target_date=date.replace("-", "/"),
-                    product_code=primary_product,
-                    sku_data=mock_sku_data,
-                    position_data=request.position_data,
-                    skill_data=request.skill_data
-                )
-                
-                # 计算性能指标
-                position_matching = scheduling_engine.calculate_position_matching(groups)
-                work_hour_efficiency = scheduling_engine.calculate_work_hour_efficiency(groups)
-                
-                daily_schedules[date] = {
-                    "results": results,
-                    "groups": groups,
-                    "performance_metrics": {
-                        "人岗匹配度": position_matching,
-                        "工时利用率": work_hour_efficiency
-                    }
-                }
-                
-                successful_days += 1
-                
-            except Exception as e:
-                print(f"排班失败 - 日期: {date}, 错误: {str(e)}")
+        for date, schedule, error in self.iter_integrated_schedules(request, dataset):
+            if error is not None:
+                integration_metrics["failed_days"].append({"date": date, "detail": error})
                 continue
+            daily_schedules[date] = schedule
+            successful_days += 1
         
         integration_metrics["total_scheduling_days"] = successful_days
         integration_metrics["integration_success_rate"] = (
@@ -538,8 +793,71 @@ class ProductionSchedulingEngine:
             integration_metrics=integration_metrics
         )
     
+    def iter_integrated_schedules(
+        self,
+        request: ProductionToSchedulingRequest,
+        dataset: Optional[ParsedDataset] = None
+    ) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """按日期顺序逐日返回 (日期, 排班结果, 错误信息)
+
+        SKU、岗位和技能数据只解析一次；各天按当天全部产品的排产数量由工艺路线索引换算岗位需求，彼此独立排班。
+        request.scheduling_workers > 1 时在共享进程池中按块并行排各天（进程数不超过进程池大小），
+        结果仍按日期顺序逐个返回。
+        """
+        from .paiban import SchedulingEngine
+        
+        scheduling_engine = SchedulingEngine()
+        if dataset is None:
+            dataset = scheduling_engine.build_dataset(
+                request.sku_data, request.position_data, request.skill_data
+            )
+        
+        days = list(zip(
+            request.production_schedule.keys(),
+            self._daily_position_demands(
+                list(request.production_schedule.values()), dataset, request.reference_quantity
+            )
+        ))
+        workers = effective_workers(request.scheduling_workers, len(days))
+        
+        if workers <= 1:
+            for date, demand in days:
+                yield _schedule_integration_day(scheduling_engine, dataset, request.solver, date, demand)
+            return
+        
+        # 按日期顺序返回，已完成的日期可以先输出；在途天数有上限，结果不会在消费端之前堆积
+        yield from imap_chunked(_schedule_integration_chunk, (dataset, request.solver), days, workers)
+    
+    def _daily_position_demands(
+        self,
+        daily_results: List[List[ProductionScheduleResult]],
+        dataset: ParsedDataset,
+        reference_quantity: Optional[int] = None
+    ) -> List[Dict[str, int]]:
+        """各天全部产品的岗位需求人数（岗位编码 -> 需求人数）
+
+        SKU数据中有工艺路线的产品由工艺路线索引一次性换算（整个计划期一次矩阵运算）：
+        指定 reference_quantity 时按当天数量成比例换算，否则按SKU表中的需求人数计；
+        SKU数据中没有的产品使用模拟工艺路线。
+        """
+        routing_index = dataset.routing_index
+        daily_quantities = []
+        for production_results in daily_results:
+            quantities: Dict[str, int] = {}
+            for result in production_results:
+                quantities[result.product_code] = quantities.get(result.product_code, 0) + result.quantity
+            daily_quantities.append(quantities)
+        
+        demands = routing_index.daily_demands(daily_quantities, reference_quantity)
+        for demand, production_results in zip(demands, daily_results):
+            unknown = [r for r in production_results if r.product_code not in routing_index]
+            for row in self._generate_mock_sku_data(unknown)[1:]:  # 跳过标题行
+                post_code, required_workers = row[4], row[6]
+                demand[post_code] = demand.get(post_code, 0) + required_workers
+        return demands
+    
     def _generate_mock_sku_data(self, production_results: List[ProductionScheduleResult]) -> List[List[Any]]:
-        """根据排产结果生成模拟SKU数据"""
+        """根据排产结果生成模拟SKU数据（SKU数据中没有工艺路线的产品使用）"""
         # 这是一个简化的模拟数据生成
         # 实际应用中需要根据产品编码查询真实的工艺路线
         
@@ -585,112 +903,531 @@ class ProductionSchedulingEngine:
         self, 
         orders: List[CustomerOrder], 
         capacity_plan: CapacityPlan,
-        sku_data: List[List[Any]] = None
+        sku_data: List[List[Any]] = None,
+        sequencing: str = "priority",
+        sequencing_window_days: int = 7,
+        timing: str = "capacity"
     ) -> Dict[str, "WorkCenterScheduleResult"]:
-        """按工作中心计算排产计划"""
-        from models import WorkCenterScheduleResult, WorkCenterProductionPlan
+        """按工作中心计算排产计划
+
+        sequencing="priority": 各工作中心按（优先级, 交期, 下单日期）顺序生产；
+        sequencing="changeover": 在优先级相同、交期处于同一 sequencing_window_days 天窗口内的订单中，
+        按箱型成批并重新排序以减少转产，效率指标中的"节省转产时间"为相对 priority 顺序节省的转产分钟数，
+        按订单顺序中每次箱型切换计一次转产（时间轴口径）计算，不受 timing 模式下产能折算方式的影响。
+        timing="capacity": 按每日产能数量排产（转产时间折算为产能）；
+        timing="timeline": 按节拍和精确的转产分钟数在时间轴上排产，给出真实的开始/结束时刻。
+        """
+        from models import WorkCenterScheduleResult
+        
+        if sequencing not in ("priority", "changeover"):
+            raise ValueError(f"不支持的排序模式: {sequencing}")
+        if timing == "capacity":
+            fill = self._fill_work_center
+        elif timing == "timeline":
+            calendar = self.build_day_calendar(capacity_plan)
+            fill = lambda wc, wc_orders, plan, dates: self._schedule_work_center_timeline(wc, wc_orders, calendar)
+        else:
+            raise ValueError(f"不支持的计时模式: {timing}")
         
         # 按优先级和交期排序订单
-        sorted_orders = sorted(orders, key=lambda x: (
-            -x.priority,  # 优先级降序
-            x.due_date,   # 交期升序
-            x.order_date  # 订单日期升序
-        ))
+        sorted_orders = self.sort_orders(orders)
         
-        # 工作中心生产状态跟踪
-        work_center_schedules = {}
-        work_center_last_box_type = {}  # 记录每个工作中心的最后箱型
+        # 产品 -> 工作中心索引只构建一次；日期只排序一次
+        work_center_index = self._build_work_center_index(sku_data) if sku_data else None
+        dates = sorted(capacity_plan.daily_capacities.keys())
         
+        # 各工作中心的待生产订单（工作中心按首次出现顺序）
+        work_center_orders: Dict[str, List[CustomerOrder]] = {}
         for order in sorted_orders:
+            for work_center in self._get_work_centers_for_product(order.product_code, sku_data, work_center_index):
+                work_center_orders.setdefault(work_center, []).append(order)
+        
+        # 转换为返回格式
+        result = {}
+        for work_center, wc_orders in work_center_orders.items():
+            # 先确定生产顺序，每个工作中心只填充一次
+            sequenced = wc_orders
+            if sequencing == "changeover":
+                sequenced = sequence_orders(
+                    wc_orders, work_center, self.get_box_type_for_product, self.get_changeover_time,
+                    window_days=sequencing_window_days
+                )
+            
+            schedule_data = fill(work_center, sequenced, capacity_plan, dates)
+            efficiency_metrics = self._calculate_work_center_efficiency(schedule_data)
+            
+            if sequencing == "changeover":
+                # capacity 模式只在当天第一个计划上计转产，两种顺序的差值不能反映排序的效果，
+                # 因此按两种顺序各自的箱型切换计算转产时间
+                efficiency_metrics["节省转产时间"] = (
+                    sequence_changeover_minutes(
+                        wc_orders, work_center, self.get_box_type_for_product, self.get_changeover_time
+                    )
+                    - sequence_changeover_minutes(
+                        sequenced, work_center, self.get_box_type_for_product, self.get_changeover_time
+                    )
+                )
+            
+            result[work_center] = WorkCenterScheduleResult(
+                work_center=work_center,
+                daily_plans=schedule_data["daily_plans"],
+                total_changeover_time=schedule_data["total_changeover_time"],
+                efficiency_metrics=efficiency_metrics
+            )
+        
+        return result
+    
+    def _fill_work_center(
+        self,
+        work_center: str,
+        wc_orders: List[CustomerOrder],
+        capacity_plan: CapacityPlan,
+        dates: List[str]
+    ) -> Dict[str, Any]:
+        """按给定顺序把订单排入单个工作中心的每日产能（每个订单按全部数量排产）"""
+        schedule_data = {
+            "daily_plans": {},
+            "total_changeover_time": 0,
+            "efficiency_metrics": {}
+        }
+        daily_plans = schedule_data["daily_plans"]
+        daily_used: Dict[str, int] = {}  # 日期 -> 已排数量
+        first_open_day = 0  # 第一个未排满日期的下标（之前的日期均已排满）
+        last_box_type = ""  # 工作中心的最后箱型
+        
+        for order in wc_orders:
             product_code = order.product_code
             box_type = self.get_box_type_for_product(product_code)
             remaining_quantity = order.quantity
             
-            # 从SKU数据中获取该产品的工作中心信息
-            work_centers = self._get_work_centers_for_product(product_code, sku_data)
+            # 计算转产时间
+            changeover_time = self.get_changeover_time(last_box_type, box_type, work_center)
             
-            for work_center in work_centers:
-                if work_center not in work_center_schedules:
-                    work_center_schedules[work_center] = {
-                        "daily_plans": {},
-                        "total_changeover_time": 0,
-                        "efficiency_metrics": {}
-                    }
+            # 跳过已排满的日期
+            while (first_open_day < len(dates) and daily_plans.get(dates[first_open_day])
+                   and daily_used[dates[first_open_day]] >= capacity_plan.daily_capacities[dates[first_open_day]]):
+                first_open_day += 1
+            
+            # 在可用日期中安排生产
+            for date in itertools.islice(dates, first_open_day, None):
+                if remaining_quantity <= 0:
+                    break
                 
-                # 计算转产时间
-                last_box_type = work_center_last_box_type.get(work_center, "")
-                changeover_time = self.get_changeover_time(last_box_type, box_type, work_center)
+                if date not in daily_plans:
+                    daily_plans[date] = []
+                    daily_used[date] = 0
                 
-                # 在可用日期中安排生产
-                for date in sorted(capacity_plan.daily_capacities.keys()):
-                    if remaining_quantity <= 0:
-                        break
-                    
-                    if date not in work_center_schedules[work_center]["daily_plans"]:
-                        work_center_schedules[work_center]["daily_plans"][date] = []
-                    
-                    # 计算当日可用产能（考虑转产时间）
-                    daily_capacity = capacity_plan.daily_capacities[date]
-                    used_capacity = sum(p.quantity for p in work_center_schedules[work_center]["daily_plans"][date])
-                    available_capacity = daily_capacity - used_capacity
-                    
-                    # 如果需要转产，减少可用产能
-                    if changeover_time > 0 and not work_center_schedules[work_center]["daily_plans"][date]:
-                        # 假设每分钟转产时间相当于减少1个单位产能
-                        available_capacity -= changeover_time // 60
-                        work_center_schedules[work_center]["total_changeover_time"] += changeover_time
-                    
-                    if available_capacity <= 0:
-                        continue
-                    
-                    # 安排生产
-                    quantity_to_schedule = min(remaining_quantity, available_capacity)
-                    
-                    production_plan = WorkCenterProductionPlan(
-                        work_center=work_center,
-                        date=date,
-                        box_type=box_type,
-                        start_time="08:00",  # 简化处理
-                        end_time="16:00",    # 简化处理
-                        quantity=quantity_to_schedule,
-                        product_code=product_code,
-                        changeover_time=changeover_time if not work_center_schedules[work_center]["daily_plans"][date] else 0
-                    )
-                    
-                    work_center_schedules[work_center]["daily_plans"][date].append(production_plan)
-                    remaining_quantity -= quantity_to_schedule
-                    work_center_last_box_type[work_center] = box_type
-                    changeover_time = 0  # 后续同日生产不再需要转产时间
+                # 计算当日可用产能（考虑转产时间）
+                available_capacity = capacity_plan.daily_capacities[date] - daily_used[date]
+                
+                # 如果需要转产，减少可用产能
+                if changeover_time > 0 and not daily_plans[date]:
+                    # 假设每分钟转产时间相当于减少1个单位产能
+                    available_capacity -= changeover_time // 60
+                    schedule_data["total_changeover_time"] += changeover_time
+                
+                if available_capacity <= 0:
+                    continue
+                
+                # 安排生产
+                quantity_to_schedule = min(remaining_quantity, available_capacity)
+                
+                production_plan = WorkCenterProductionPlan(
+                    work_center=work_center,
+                    date=date,
+                    box_type=box_type,
+                    start_time="08:00",  # 简化处理
+                    end_time="16:00",    # 简化处理
+                    quantity=quantity_to_schedule,
+                    product_code=product_code,
+                    changeover_time=changeover_time if not daily_plans[date] else 0
+                )
+                
+                daily_plans[date].append(production_plan)
+                daily_used[date] += quantity_to_schedule
+                remaining_quantity -= quantity_to_schedule
+                last_box_type = box_type
+                changeover_time = 0  # 后续同日生产不再需要转产时间
         
-        # 转换为返回格式
-        result = {}
-        for work_center, schedule_data in work_center_schedules.items():
-            result[work_center] = WorkCenterScheduleResult(
+        return schedule_data
+    
+    def get_takt_seconds(self, capacity: int) -> float:
+        """产能档位对应的节拍（秒/台），未配置的档位在相邻档位之间线性插值"""
+        levels = sorted(self.capacity_config)
+        return float(np.interp(capacity, levels, [self.capacity_config[c]["节拍"] for c in levels]))
+    
+    def build_day_calendar(self, capacity_plan: CapacityPlan) -> DayCalendar:
+        """按产能方案构建工作日历（每天工作 产能 × 节拍 秒）"""
+        capacities = set(capacity_plan.daily_capacities.values())
+        return DayCalendar(
+            capacity_plan.daily_capacities,
+            {capacity: self.get_takt_seconds(capacity) for capacity in capacities}
+        )
+    
+    def _place_on_timeline(
+        self,
+        timeline: FreeTimeline,
+        calendar: DayCalendar,
+        earliest: int,
+        work_center: str,
+        product_code: str,
+        box_type: str,
+        quantity: int,
+        changeover_minutes: int
+    ) -> Dict[str, Any]:
+        """从 earliest 起在时间轴上安排一个订单：先转产，再按当天节拍连续生产，窗口用完后顺延到下一个工作日"""
+        plans: List[WorkCenterProductionPlan] = []
+        changeover_seconds = 0
+        production_seconds = 0
+        cursor = earliest
+        start = None
+        
+        # 转产：占用精确的转产分钟数，可跨越工作日
+        pending = changeover_minutes * 60
+        while pending > 0:
+            window = timeline.find_free(cursor)
+            if window is None:
+                break
+            window_start, window_end = window
+            used = min(pending, window_end - window_start)
+            timeline.reserve(window_start, window_start + used)
+            start = window_start if start is None else start
+            changeover_seconds += used
+            pending -= used
+            cursor = window_start + used
+        
+        # 生产：按当天节拍计算可生产数量
+        remaining_quantity = quantity
+        while remaining_quantity > 0 and pending <= 0:
+            window = timeline.find_free(cursor)
+            if window is None:
+                break
+            window_start, window_end = window
+            day = calendar.day_of(window_start)
+            takt = calendar.takt[day]
+            units = min(remaining_quantity, int((window_end - window_start) // takt))
+            if units <= 0:
+                # 当天剩余时间不足以生产一台，顺延到下一个空闲窗口
+                cursor = window_end
+                continue
+            
+            segment_end = min(window_end, window_start + int(-(-units * takt // 1)))
+            timeline.reserve(window_start, segment_end)
+            start = window_start if start is None else start
+            production_seconds += segment_end - window_start
+            cursor = segment_end
+            
+            date = calendar.day_dates[day]
+            plans.append(WorkCenterProductionPlan(
                 work_center=work_center,
-                daily_plans=schedule_data["daily_plans"],
-                total_changeover_time=schedule_data["total_changeover_time"],
-                efficiency_metrics=self._calculate_work_center_efficiency(schedule_data)
+                date=date,
+                box_type=box_type,
+                start_time=calendar.clock(window_start),
+                end_time=calendar.clock(segment_end),
+                quantity=units,
+                product_code=product_code,
+                changeover_time=changeover_minutes if not plans else 0
+            ))
+            remaining_quantity -= units
+        
+        return {
+            "plans": plans,
+            "start": start if start is not None else cursor,
+            "end": cursor,
+            "changeover_seconds": changeover_seconds,
+            "production_seconds": production_seconds,
+            "remaining_quantity": remaining_quantity
+        }
+    
+    def _schedule_work_center_timeline(
+        self,
+        work_center: str,
+        wc_orders: List[CustomerOrder],
+        calendar: DayCalendar
+    ) -> Dict[str, Any]:
+        """按给定顺序在单个工作中心的时间轴上排产
+
+        每个订单先占用转产时间（精确分钟数），再按当天节拍连续生产，当天窗口用完后顺延到下一个工作日。
+        生产计划的开始/结束时刻为生产时段（不含转产），转产分钟数记在该订单的第一段生产计划上。
+        """
+        timeline = calendar.timeline()
+        daily_plans: Dict[str, List[WorkCenterProductionPlan]] = {}
+        changeover_seconds = 0
+        production_seconds = 0
+        unscheduled_quantity = 0
+        cursor = 0
+        last_box_type = ""
+        
+        for order in wc_orders:
+            if order.quantity <= 0:
+                continue
+            box_type = self.get_box_type_for_product(order.product_code)
+            placement = self._place_on_timeline(
+                timeline, calendar, cursor, work_center, order.product_code, box_type, order.quantity,
+                self.get_changeover_time(last_box_type, box_type, work_center)
             )
+            for plan in placement["plans"]:
+                daily_plans.setdefault(plan.date, []).append(plan)
+            changeover_seconds += placement["changeover_seconds"]
+            production_seconds += placement["production_seconds"]
+            unscheduled_quantity += placement["remaining_quantity"]
+            cursor = placement["end"]
+            if placement["plans"]:
+                last_box_type = box_type
         
-        return result
+        available_seconds = calendar.available_seconds()
+        busy_seconds = production_seconds + changeover_seconds
+        return {
+            "daily_plans": daily_plans,
+            "total_changeover_time": changeover_seconds // 60,
+            "efficiency_metrics": {
+                "生产效率": production_seconds / busy_seconds if busy_seconds > 0 else 0,
+                "转产时间占比": changeover_seconds / busy_seconds if busy_seconds > 0 else 0,
+                "总生产时间": round(production_seconds / 60, 1),
+                "总转产时间": round(changeover_seconds / 60, 1),
+                "时间利用率": busy_seconds / available_seconds if available_seconds > 0 else 0,
+                "空闲时间": round((available_seconds - busy_seconds) / 60, 1),
+                "未排数量": unscheduled_quantity
+            }
+        }
     
-    def _get_work_centers_for_product(self, product_code: str, sku_data: List[List[Any]] = None) -> List[str]:
-        """根据产品编码和SKU数据获取相关工作中心"""
+    def get_routing(
+        self,
+        product_code: str,
+        sku_data: List[List[Any]] = None,
+        work_center_index: Optional[Dict[str, List[str]]] = None
+    ) -> List[List[str]]:
+        """产品的工艺路线（工序列表，每个工序为并行的工作中心）
+
+        有箱型工艺路线时按路线排序，提供SKU数据时只保留SKU中该产品涉及的工作中心，
+        SKU中有但路线中没有的工作中心作为最后一道工序；没有工艺路线时按SKU工作中心顺序逐个串行。
+        """
+        work_centers = self._get_work_centers_for_product(product_code, sku_data, work_center_index)
+        routing = self.routing_config.get(self.get_box_type_for_product(product_code))
+        if not routing:
+            return [[work_center] for work_center in work_centers]
+        if not sku_data:
+            return [list(stage) for stage in routing]
+        
+        selected = set(work_centers)
+        stages = [[wc for wc in stage if wc in selected] for stage in routing]
+        stages = [stage for stage in stages if stage]
+        routed = {wc for stage in stages for wc in stage}
+        extra = [wc for wc in work_centers if wc not in routed]
+        if extra:
+            stages.append(extra)
+        return stages
+    
+    def calculate_flow_shop_schedule(
+        self,
+        orders: List[CustomerOrder],
+        capacity_plan: CapacityPlan,
+        sku_data: List[List[Any]] = None,
+        buffer_minutes: int = 30,
+        sequencing: str = "priority",
+        sequencing_window_days: int = 7
+    ) -> Dict[str, Any]:
+        """多工序流水车间排产
+
+        订单按工艺路线依次经过各工序，上一工序的全部工作中心完成后，间隔 buffer_minutes（转运/缓冲）才能开始下一工序。
+        采用事件驱动的列表调度：每个工作中心维护待加工队列，工作中心空闲时从已就绪的工序中派工
+        （默认按订单优先顺序；转产感知模式下同一交期分段内优先派与上一箱型相同的订单），
+        在时间轴上排产后，一个工序的全部工作中心完工即把下一工序放入相应队列。
+        同一遍计算中统计各工作中心的利用率和排队等待时间，用于识别瓶颈。
+        """
+        from models import WorkCenterScheduleResult
+        
+        if sequencing not in ("priority", "changeover"):
+            raise ValueError(f"不支持的排序模式: {sequencing}")
+        
+        sorted_orders = self.sort_orders(orders)
+        calendar = self.build_day_calendar(capacity_plan)
+        work_center_index = self._build_work_center_index(sku_data) if sku_data else None
+        
+        routings = [self.get_routing(order.product_code, sku_data, work_center_index) for order in sorted_orders]
+        box_types = [self.get_box_type_for_product(order.product_code) for order in sorted_orders]
+        due_buckets = [
+            (-order.priority, datetime.strptime(order.due_date, "%Y-%m-%d").toordinal() // max(sequencing_window_days, 1))
+            for order in sorted_orders
+        ]
+        buffer_seconds = max(buffer_minutes, 0) * 60
+        
+        timelines: Dict[str, FreeTimeline] = {}
+        states: Dict[str, Dict[str, Any]] = {}  # 工作中心 -> 空闲时刻、最后箱型、待加工队列、统计
+        job_start: Dict[int, int] = {}
+        job_finish: Dict[int, int] = {}
+        job_blocked: Dict[int, str] = {}
+        stage_pending: Dict[int, int] = {}  # 订单 -> 当前工序尚未完成的工作中心数
+        stage_finish: Dict[int, int] = {}  # 订单 -> 当前工序已完成部分的最晚完工时刻
+        events: List[Tuple[int, int, str]] = []  # (时刻, 序号, 工作中心)：工作中心可能可以开工
+        counter = itertools.count()
+        
+        def release(job: int, stage: int, ready: int):
+            """工序就绪：加入该工序各工作中心的待加工队列"""
+            stage_pending[job] = len(routings[job][stage])
+            stage_finish[job] = ready
+            for work_center in routings[job][stage]:
+                if work_center not in states:
+                    timelines[work_center] = calendar.timeline()
+                    states[work_center] = {
+                        "free_at": 0, "last_box_type": "", "queue": [], "daily_plans": {},
+                        "changeover_seconds": 0, "production_seconds": 0, "queue_seconds": 0,
+                        "operations": 0
+                    }
+                states[work_center]["queue"].append((ready, job, stage))
+                heapq.heappush(events, (max(ready, states[work_center]["free_at"]), next(counter), work_center))
+        
+        for job, routing in enumerate(routings):
+            if routing and sorted_orders[job].quantity > 0:
+                release(job, 0, 0)
+        
+        while events:
+            now, _, work_center = heapq.heappop(events)
+            state = states[work_center]
+            if state["free_at"] > now or not state["queue"]:
+                continue
+            
+            ready_ops = [op for op in state["queue"] if op[0] <= now]
+            if not ready_ops:
+                heapq.heappush(events, (min(op[0] for op in state["queue"]), next(counter), work_center))
+                continue
+            
+            # 派工：默认取优先顺序最靠前的订单；转产感知模式下，同一交期分段内优先取与上一箱型相同的订单
+            chosen = min(ready_ops, key=lambda op: op[1])
+            if sequencing == "changeover":
+                same_type = [
+                    op for op in ready_ops
+                    if box_types[op[1]] == state["last_box_type"] and due_buckets[op[1]] == due_buckets[chosen[1]]
+                ]
+                if same_type:
+                    chosen = min(same_type, key=lambda op: op[1])
+            state["queue"].remove(chosen)
+            ready, job, stage = chosen
+            order = sorted_orders[job]
+            box_type = box_types[job]
+            
+            state["queue_seconds"] += now - ready
+            placement = self._place_on_timeline(
+                timelines[work_center], calendar, now, work_center, order.product_code, box_type,
+                order.quantity, self.get_changeover_time(state["last_box_type"], box_type, work_center)
+            )
+            for plan in placement["plans"]:
+                state["daily_plans"].setdefault(plan.date, []).append(plan)
+            state["changeover_seconds"] += placement["changeover_seconds"]
+            state["production_seconds"] += placement["production_seconds"]
+            state["operations"] += 1
+            state["free_at"] = placement["end"]
+            if placement["plans"]:
+                state["last_box_type"] = box_type
+            if state["queue"]:
+                heapq.heappush(events, (state["free_at"], next(counter), work_center))
+            
+            job_start[job] = min(job_start.get(job, placement["start"]), placement["start"])
+            stage_finish[job] = max(stage_finish[job], placement["end"])
+            if placement["remaining_quantity"] > 0:
+                job_blocked.setdefault(job, work_center)
+            
+            stage_pending[job] -= 1
+            if stage_pending[job] > 0 or job in job_blocked:
+                # 工序未全部完成，或排产周期内无法完成（后续工序不再安排）
+                continue
+            if stage + 1 < len(routings[job]):
+                release(job, stage + 1, stage_finish[job] + buffer_seconds)
+            else:
+                job_finish[job] = stage_finish[job]
+        
+        # 工作中心结果与瓶颈识别
+        available_seconds = calendar.available_seconds()
+        work_center_schedules = {}
+        bottleneck = None
+        for work_center, state in states.items():
+            busy_seconds = state["production_seconds"] + state["changeover_seconds"]
+            utilization = busy_seconds / available_seconds if available_seconds > 0 else 0
+            work_center_schedules[work_center] = WorkCenterScheduleResult(
+                work_center=work_center,
+                daily_plans=state["daily_plans"],
+                total_changeover_time=state["changeover_seconds"] // 60,
+                efficiency_metrics={
+                    "生产效率": state["production_seconds"] / busy_seconds if busy_seconds > 0 else 0,
+                    "转产时间占比": state["changeover_seconds"] / busy_seconds if busy_seconds > 0 else 0,
+                    "总生产时间": round(state["production_seconds"] / 60, 1),
+                    "总转产时间": round(state["changeover_seconds"] / 60, 1),
+                    "时间利用率": utilization,
+                    "空闲时间": round((available_seconds - busy_seconds) / 60, 1),
+                    "排队等待时间": round(state["queue_seconds"] / 60, 1),
+                    "工序数": state["operations"]
+                }
+            )
+            key = (utilization, state["queue_seconds"])
+            if bottleneck is None or key > bottleneck[0]:
+                bottleneck = (key, work_center)
+        
+        # 订单完工情况
+        order_completions = []
+        for job, order in enumerate(sorted_orders):
+            finish = job_finish.get(job)
+            start = job_start.get(job)
+            completion = {
+                "order_id": order.order_id,
+                "product_code": order.product_code,
+                "due_date": order.due_date,
+                "completed": finish is not None,
+                "blocked_work_center": job_blocked.get(job)
+            }
+            if start is not None:
+                completion["start"] = calendar.to_datetime(start).strftime("%Y-%m-%d %H:%M")
+            if finish is not None:
+                finish_date = calendar.to_datetime(finish)
+                completion["finish"] = finish_date.strftime("%Y-%m-%d %H:%M")
+                completion["delay_days"] = max(
+                    0, (finish_date.date() - datetime.strptime(order.due_date, "%Y-%m-%d").date()).days
+                )
+            order_completions.append(completion)
+        
+        completed = [c for c in order_completions if c["completed"]]
+        return {
+            "work_center_schedules": work_center_schedules,
+            "order_completions": order_completions,
+            "bottleneck": {
+                "work_center": bottleneck[1],
+                "时间利用率": bottleneck[0][0],
+                "排队等待时间": round(bottleneck[0][1] / 60, 1)
+            } if bottleneck else None,
+            "makespan_minutes": round(
+                (max(job_finish.values()) - min(job_start[job] for job in job_finish)) / 60, 1
+            ) if job_finish else 0,
+            "completed_orders": len(completed),
+            "on_time_orders": sum(1 for c in completed if c["delay_days"] == 0)
+        }
+    
+    def _build_work_center_index(self, sku_data: List[List[Any]] = None) -> Dict[str, List[str]]:
+        """遍历一次SKU数据，构建 产品编码 -> 工作中心列表（按首次出现顺序）"""
+        index: Dict[str, Dict[str, None]] = {}
+        for row in (sku_data or [])[1:]:  # 跳过标题行
+            if len(row) >= 4 and row[3]:
+                index.setdefault(str(row[0]), {})[str(row[3])] = None
+        return {product_code: list(centers) for product_code, centers in index.items()}
+    
+    def _get_work_centers_for_product(
+        self,
+        product_code: str,
+        sku_data: List[List[Any]] = None,
+        work_center_index: Optional[Dict[str, List[str]]] = None
+    ) -> List[str]:
+        """根据产品编码和SKU数据获取相关工作中心（可传入预先构建的索引）"""
         if not sku_data:
             # 默认工作中心
             return ["前框", "T地板", "总装", "涂装"]
         
-        work_centers = set()
-        for row in sku_data[1:]:  # 跳过标题行
-            if len(row) >= 4 and str(row[0]) == product_code:
-                work_center = str(row[3]) if row[3] else ""
-                if work_center:
-                    work_centers.add(work_center)
-        
-        return list(work_centers) if work_centers else ["默认工作中心"]
+        if work_center_index is None:
+            work_center_index = self._build_work_center_index(sku_data)
+        return work_center_index.get(product_code) or ["默认工作中心"]
     
     def _calculate_work_center_efficiency(self, schedule_data: Dict) -> Dict[str, float]:
-        """计算工作中心效率指标"""
+        """计算工作中心效率指标（时间轴排产已给出由时间轴统计的指标时直接使用）"""
+        if schedule_data.get("efficiency_metrics"):
+            return dict(schedule_data["efficiency_metrics"])
+        
         total_production_time = 0
         total_changeover_time = schedule_data["total_changeover_time"]
         
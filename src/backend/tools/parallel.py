@@ -0,0 +1,85 @@
+"""
+共享进程池模块
+方案评估、排产排班集成等可并行的计算共用一个按需创建的进程池：进程数不超过 CPU 核数，
+并发请求的任务在同一个池中排队，不会为每个请求各自创建进程。
+"""
+
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional, Sequence
+
+# 共享进程池的最大进程数（默认等于 CPU 核数），可在主应用中通过 init_shared_pool 调整
+max_pool_workers: int = os.cpu_count() or 1
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def init_shared_pool(max_workers: int):
+    """设置共享进程池的最大进程数（不超过 CPU 核数），需在首次使用进程池之前调用"""
+    global max_pool_workers
+    max_pool_workers = max(1, min(max_workers, os.cpu_count() or 1))
+
+
+def effective_workers(requested: int, task_count: int) -> int:
+    """实际并行度：不超过请求的进程数、任务数和共享进程池大小
+
+    在子进程内（如引擎执行器的进程模式）返回0，由调用方串行计算，避免每个工作进程再各自创建进程池。
+    """
+    if multiprocessing.parent_process() is not None:
+        return 0
+    return max(0, min(requested, task_count, max_pool_workers))
+
+
+def shared_pool() -> ProcessPoolExecutor:
+    """获取共享进程池（首次调用时创建）"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max_pool_workers)
+        return _pool
+
+
+def shutdown_shared_pool(wait: bool = True):
+    """关闭共享进程池（之后再次使用时会重新创建）"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield list(items[start:start + size])
+
+
+def imap_chunked(
+    fn: Callable[[Any, List[Any]], List[Any]],
+    shared: Any,
+    items: Sequence[Any],
+    workers: int
+) -> Iterator[Any]:
+    """在共享进程池中按块并行计算 fn(shared, chunk)，按 items 的顺序逐个返回结果
+
+    共享数据随每个块传递一次（块数约为 workers×4），不依赖进程初始化，因此不同请求可以共用进程池；
+    同时在途的块不超过 workers×2，已完成但未被取走的结果不会随任务数增长而堆积。
+    """
+    pool = shared_pool()
+    chunk_size = max(1, len(items) // (workers * 4))
+    window = workers * 2
+    pending = deque()
+    try:
+        for chunk in _chunks(items, chunk_size):
+            pending.append(pool.submit(fn, shared, chunk))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # 消费端提前结束（如客户端断开流式连接）时取消尚未开始的块
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,213 @@
+"""
+产能方案搜索模块
+在“每天选择一个产能档位”的方案空间中做局部搜索，用向量化的评估内核批量打分，
+在时间预算内返回成本、按时完成率、产能利用率三个目标上的 Pareto 方案集
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models import CustomerOrder
+
+# 评估时 方案数 × 订单数 的分块上限，控制中间矩阵的内存占用
+EVAL_CHUNK_CELLS = 4_000_000
+
+
+class PlanEvaluator:
+    """批量评估产能方案
+
+    排产规则与 calculate_production_schedule 一致：订单按既定顺序、从最早有空余产能的日期开始填充。
+    这等价于“前 k 个订单的累计需求占用累计产能的前 Q_k 个单位”，因此只需累计和与查找即可得到：
+      - 完成率：有数量被安排的订单数 / 订单总数
+      - 按时完成率：全部数量在交期当天或之前排完的订单数 / 订单总数
+      - 产能利用率：已安排数量 / 总产能
+    """
+
+    def __init__(
+        self,
+        sorted_orders: List[CustomerOrder],
+        working_dates: List[str],
+        levels: np.ndarray,
+        level_costs: np.ndarray
+    ):
+        self.working_dates = sorted(working_dates)
+        self.levels = np.asarray(levels, dtype=np.int64)
+        self.level_costs = np.asarray(level_costs, dtype=np.float64)
+
+        date_ordinals = np.array(
+            [datetime.strptime(d, "%Y-%m-%d").toordinal() for d in self.working_dates], dtype=np.int64
+        )
+        due_lookup: Dict[str, int] = {}
+        due_ordinals = np.empty(len(sorted_orders), dtype=np.int64)
+        for k, order in enumerate(sorted_orders):
+            if order.due_date not in due_lookup:
+                due_lookup[order.due_date] = datetime.strptime(order.due_date, "%Y-%m-%d").toordinal()
+            due_ordinals[k] = due_lookup[order.due_date]
+
+        quantities = np.array([max(o.quantity, 0) for o in sorted_orders], dtype=np.int64)
+        cumulative = np.cumsum(quantities)
+        positive = quantities > 0
+
+        self.order_count = len(sorted_orders)
+        self.total_demand = int(cumulative[-1]) if self.order_count else 0
+        # 有数量的订单：开始前的累计需求（单调不减），用于统计完成率
+        self._start_demand = (cumulative - quantities)[positive]
+        # 有数量的订单：完成时的累计需求，以及交期当天（含）之前最后一个工作日的下标
+        self._end_demand = cumulative[positive]
+        self._due_day = np.searchsorted(date_ordinals, due_ordinals[positive], side="right") - 1
+
+    def capacities(self, plan_levels: np.ndarray) -> np.ndarray:
+        """档位下标矩阵 [方案, 日期] -> 每日产能"""
+        return self.levels[plan_levels]
+
+    def evaluate(self, plan_levels: np.ndarray) -> Dict[str, np.ndarray]:
+        """评估一批方案，plan_levels 为 [方案数, 日期数] 的档位下标矩阵"""
+        plan_levels = np.atleast_2d(plan_levels)
+        capacity = self.capacities(plan_levels)
+        cumulative_capacity = np.cumsum(capacity, axis=1)
+        total_capacity = cumulative_capacity[:, -1] if capacity.shape[1] else np.zeros(len(capacity))
+
+        total_cost = self.level_costs[plan_levels].sum(axis=1)
+        scheduled = np.minimum(self.total_demand, total_capacity)
+        utilization = np.divide(
+            scheduled, total_capacity, out=np.zeros(len(capacity)), where=total_capacity > 0
+        )
+        completed = np.searchsorted(self._start_demand, total_capacity, side="left")
+
+        on_time = np.zeros(len(capacity), dtype=np.int64)
+        valid = self._due_day >= 0
+        if valid.any():
+            due_day = self._due_day[valid]
+            end_demand = self._end_demand[valid]
+            chunk = max(1, EVAL_CHUNK_CELLS // max(len(due_day), 1))
+            for start in range(0, len(capacity), chunk):
+                block = cumulative_capacity[start:start + chunk]
+                on_time[start:start + chunk] = (block[:, due_day] >= end_demand).sum(axis=1)
+
+        order_count = max(self.order_count, 1)
+        return {
+            "total_cost": total_cost,
+            "completion_rate": completed / order_count,
+            "on_time_rate": on_time / order_count,
+            "capacity_utilization": utilization
+        }
+
+
+def pareto_mask(total_cost: np.ndarray, on_time_rate: np.ndarray, utilization: np.ndarray) -> np.ndarray:
+    """非支配方案掩码（成本越低越好，按时完成率、利用率越高越好）"""
+    objectives = np.stack([-total_cost, on_time_rate, utilization], axis=1)
+    no_worse = (objectives[None, :, :] >= objectives[:, None, :]).all(axis=2)
+    better = (objectives[None, :, :] > objectives[:, None, :]).any(axis=2)
+    dominated = (no_worse & better).any(axis=1)
+    return ~dominated
+
+
+class CapacityPlanSearch:
+    """产能方案局部搜索
+
+    从各档位的恒定方案出发，对 Pareto 档案中的方案批量做邻域变换（单日调档、连续区间整体调档），
+    批量评估后更新档案，直到时间预算或评估次数用完。随机数种子固定，相同输入的搜索过程可复现。
+    """
+
+    def __init__(
+        self,
+        evaluator: PlanEvaluator,
+        time_budget: float = 2.0,
+        max_evaluations: int = 200_000,
+        batch_size: int = 512,
+        archive_size: int = 256,
+        seed: int = 0
+    ):
+        self.evaluator = evaluator
+        self.time_budget = time_budget
+        self.max_evaluations = max_evaluations
+        self.batch_size = batch_size
+        self.archive_size = archive_size
+        self.rng = np.random.default_rng(seed)
+        self.evaluations = 0
+
+    def _initial_plans(self) -> np.ndarray:
+        level_count = len(self.evaluator.levels)
+        day_count = len(self.evaluator.working_dates)
+        flat = np.repeat(np.arange(level_count)[:, None], day_count, axis=1)
+        random_plans = self.rng.integers(0, level_count, size=(self.batch_size, day_count))
+        return np.vstack([flat, random_plans])
+
+    def _neighbours(self, parents: np.ndarray) -> np.ndarray:
+        """由档案方案批量生成邻域方案"""
+        level_count = len(self.evaluator.levels)
+        parent_count, day_count = parents.shape
+        children = parents[self.rng.integers(0, parent_count, size=self.batch_size)].copy()
+        rows = np.arange(self.batch_size)
+        deltas = self.rng.choice([-1, 1], size=self.batch_size)
+
+        # 一半做单日调档，一半做连续区间整体调档
+        half = self.batch_size // 2
+        days = self.rng.integers(0, day_count, size=half)
+        children[rows[:half], days] += deltas[:half]
+
+        starts = self.rng.integers(0, day_count, size=self.batch_size - half)
+        lengths = self.rng.integers(1, max(day_count // 2, 1) + 1, size=self.batch_size - half)
+        columns = np.arange(day_count)
+        segment = (columns >= starts[:, None]) & (columns < (starts + lengths)[:, None])
+        children[half:] += segment * deltas[half:, None]
+
+        return np.clip(children, 0, level_count - 1)
+
+    def _trim(self, plans: np.ndarray, scores: Dict[str, np.ndarray]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """去重、保留非支配方案，超过档案容量时按成本均匀抽取"""
+        plans, unique_index = np.unique(plans, axis=0, return_index=True)
+        scores = {key: value[unique_index] for key, value in scores.items()}
+
+        keep = np.flatnonzero(pareto_mask(
+            scores["total_cost"], scores["on_time_rate"], scores["capacity_utilization"]
+        ))
+        if len(keep) > self.archive_size:
+            by_cost = keep[np.argsort(scores["total_cost"][keep], kind="stable")]
+            keep = by_cost[np.linspace(0, len(by_cost) - 1, self.archive_size).astype(np.int64)]
+        return plans[keep], {key: value[keep] for key, value in scores.items()}
+
+    def run(self) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """执行搜索，返回 Pareto 档案（档位下标矩阵，评估结果）"""
+        deadline = time.perf_counter() + self.time_budget
+        plans = self._initial_plans()
+        scores = self.evaluator.evaluate(plans)
+        self.evaluations = len(plans)
+        plans, scores = self._trim(plans, scores)
+
+        while time.perf_counter() < deadline and self.evaluations < self.max_evaluations:
+            children = self._neighbours(plans)
+            child_scores = self.evaluator.evaluate(children)
+            self.evaluations += len(children)
+            plans, scores = self._trim(
+                np.vstack([plans, children]),
+                {key: np.concatenate([scores[key], child_scores[key]]) for key in scores}
+            )
+
+        order = np.argsort(scores["total_cost"], kind="stable")
+        return plans[order], {key: value[order] for key, value in scores.items()}
+
+
+def select_spread(count: int, limit: int) -> np.ndarray:
+    """从按成本排序的 count 个方案中均匀选取至多 limit 个（包含两端）"""
+    if count <= limit:
+        return np.arange(count)
+    return np.unique(np.linspace(0, count - 1, limit).round().astype(np.int64))
+
+
+def resolve_search_levels(
+    configured_levels: List[int],
+    baseline_capacity: int,
+    variation: int,
+    search_levels: Optional[List[int]] = None
+) -> List[int]:
+    """确定可选产能档位：指定档位 > 基准产能±浮动范围内的配置档位 > 最接近基准产能的档位"""
+    if search_levels:
+        return sorted(set(search_levels))
+    levels = [c for c in sorted(configured_levels) if abs(c - baseline_capacity) <= variation]
+    if not levels:
+        levels = [min(configured_levels, key=lambda c: abs(c - baseline_capacity))]
+    return levels
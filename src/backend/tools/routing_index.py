@@ -0,0 +1,124 @@
+"""
+产品工艺路线索引模块
+由SKU表一次性构建 产品 -> 岗位/工作中心/箱型 的索引和 [产品, 岗位] 需求人数矩阵，
+把每天（或整个计划期）各产品的生产数量换算为岗位需求人数只需一次矩阵乘法
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from models import TaskData
+
+class ProductRoutingIndex:
+    """产品工艺路线索引
+
+    headcount[i, j] 为SKU表中产品 i 在岗位 j 的需求人数（同一产品同一岗位多行时相加）。
+    SKU表没有给出需求人数对应的日产量，因此换算方式由调用方决定：
+      - 不指定 reference_quantity：当天生产（数量大于0）的产品按SKU表中的需求人数计；
+      - 指定 reference_quantity（需求人数对应的日产量）：单台定员 = headcount / reference_quantity，
+        某天的岗位需求 = ceil(各产品数量 @ 单台定员)。
+    """
+
+    def __init__(self, tasks: Sequence[TaskData]):
+        self.products: List[str] = []
+        self.position_codes: List[str] = []
+        self.product_lookup: Dict[str, int] = {}
+        self.position_lookup: Dict[str, int] = {}
+        self.box_types: Dict[str, str] = {}
+        self.work_centers: Dict[str, List[str]] = {}  # 产品 -> 工作中心（按SKU表中首次出现的顺序）
+        self.position_work_center: Dict[str, str] = {}
+
+        cells: Dict[tuple, int] = {}
+        for task in tasks:
+            i = self.product_lookup.setdefault(task.产成品编码, len(self.products))
+            if i == len(self.products):
+                self.products.append(task.产成品编码)
+                self.work_centers[task.产成品编码] = []
+            j = self.position_lookup.setdefault(task.岗位编码, len(self.position_codes))
+            if j == len(self.position_codes):
+                self.position_codes.append(task.岗位编码)
+            cells[(i, j)] = cells.get((i, j), 0) + task.需求人数
+
+            if task.箱型 and task.产成品编码 not in self.box_types:
+                self.box_types[task.产成品编码] = task.箱型
+            if task.工作中心:
+                if task.工作中心 not in self.work_centers[task.产成品编码]:
+                    self.work_centers[task.产成品编码].append(task.工作中心)
+                self.position_work_center.setdefault(task.岗位编码, task.工作中心)
+
+        self.headcount = np.zeros((len(self.products), len(self.position_codes)), dtype=np.float64)
+        for (i, j), count in cells.items():
+            self.headcount[i, j] = count
+
+    def __contains__(self, product_code: str) -> bool:
+        return product_code in self.product_lookup
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def routing(self, product_code: str) -> Optional[Dict[str, Any]]:
+        """产品的工艺路线：岗位（SKU表中的需求人数）、工作中心和箱型"""
+        i = self.product_lookup.get(product_code)
+        if i is None:
+            return None
+        columns = np.flatnonzero(self.headcount[i] > 0)
+        return {
+            "product_code": product_code,
+            "box_type": self.box_types.get(product_code, ""),
+            "work_centers": list(self.work_centers[product_code]),
+            "positions": {self.position_codes[j]: int(self.headcount[i, j]) for j in columns}
+        }
+
+    def quantity_matrix(self, daily_quantities: Sequence[Dict[str, int]]) -> np.ndarray:
+        """[天, 产品] 生产数量矩阵（索引中不存在的产品忽略，数量不大于0按0计）"""
+        quantities = np.zeros((len(daily_quantities), len(self.products)), dtype=np.float64)
+        for d, day in enumerate(daily_quantities):
+            for product_code, quantity in day.items():
+                i = self.product_lookup.get(product_code)
+                if i is not None and quantity > 0:
+                    quantities[d, i] += quantity
+        return quantities
+
+    def _scale(self, quantities: np.ndarray, reference_quantity: Optional[int]) -> np.ndarray:
+        """生产数量 -> 各产品的换算系数（未指定 reference_quantity 时生产的产品为1）"""
+        if reference_quantity is None:
+            return (quantities > 0).astype(np.float64)
+        if reference_quantity <= 0:
+            raise ValueError(f"需求人数对应的日产量必须大于0: {reference_quantity}")
+        return quantities / reference_quantity
+
+    def demand_matrix(self, quantities: np.ndarray, reference_quantity: Optional[int] = None) -> np.ndarray:
+        """[天, 产品] 生产数量 -> [天, 岗位] 需求人数（向上取整）"""
+        demand = self._scale(np.atleast_2d(quantities), reference_quantity) @ self.headcount
+        # 消除浮点误差，避免整数人数被向上取整多出1人
+        return np.ceil(np.round(demand, 9)).astype(np.int64)
+
+    def peak_product_demand(
+        self,
+        product_quantities: Dict[str, int],
+        reference_quantity: Optional[int] = None
+    ) -> Dict[str, int]:
+        """各产品分别换算岗位需求人数后，同一岗位取各产品中的最大值（产品分时共用岗位）"""
+        quantities = self.quantity_matrix([product_quantities])[0]
+        rows = np.flatnonzero(quantities)
+        if rows.size == 0:
+            return {}
+        # 每个产品单独向上取整后再取最大值
+        scale = self._scale(quantities[rows], reference_quantity)
+        per_product = np.ceil(np.round(scale[:, None] * self.headcount[rows], 9)).astype(np.int64)
+        peak = per_product.max(axis=0)
+        return {self.position_codes[j]: int(peak[j]) for j in np.flatnonzero(peak)}
+
+    def daily_demands(
+        self,
+        daily_quantities: Sequence[Dict[str, int]],
+        reference_quantity: Optional[int] = None
+    ) -> List[Dict[str, int]]:
+        """各天 产品 -> 数量 换算为各天 岗位编码 -> 需求人数（一次矩阵运算）"""
+        demand = self.demand_matrix(self.quantity_matrix(daily_quantities), reference_quantity)
+        days, columns = np.nonzero(demand)
+        result: List[Dict[str, int]] = [{} for _ in range(len(daily_quantities))]
+        for d, j, count in zip(days.tolist(), columns.tolist(), demand[days, columns].tolist()):
+            result[d][self.position_codes[j]] = count
+        return result
@@ -0,0 +1,53 @@
+"""
+排班索引模块
+预先构建岗位要求映射和岗位->员工倒排表，避免每个岗位都扫描全部岗位数据和技能矩阵
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models import PositionData
+from .skill_matrix import SkillMatrix
+
+
+class SchedulingIndex:
+    """排班查询索引"""
+
+    def __init__(self, positions: List[PositionData], skill_matrix: SkillMatrix):
+        self.skill_matrix = skill_matrix
+
+        # 岗位编码 -> 岗位技能要求（同一岗位编码以第一条记录为准）
+        self.requirements: Dict[str, PositionData] = {}
+        for position in positions:
+            self.requirements.setdefault(position.岗位编码, position)
+
+        # 员工班组排序键：按班组名称排序，无班组的员工排到最后
+        team_keys = [team or "zzz" for team in skill_matrix.teams]
+        team_order = {team: rank for rank, team in enumerate(sorted(set(team_keys)))}
+        self.team_rank = np.array([team_order[t] for t in team_keys], dtype=np.int64)
+
+        # 岗位编码 -> (员工行号数组, 技能等级数组)，按需构建
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def get_requirement(self, post_code: str) -> Optional[PositionData]:
+        """获取岗位技能要求"""
+        return self.requirements.get(post_code)
+
+    def get_postings(self, post_code: str) -> Tuple[np.ndarray, np.ndarray]:
+        """具备该岗位技能的员工行号及技能等级，按（班组, 技能等级降序）排序"""
+        postings = self._postings.get(post_code)
+        if postings is None:
+            levels = self.skill_matrix.position_levels(post_code)
+            rows = np.flatnonzero(levels > 0)
+            # lexsort 稳定排序：最后一个键为主键
+            order = np.lexsort((-levels[rows].astype(np.int64), self.team_rank[rows]))
+            rows = rows[order]
+            postings = (rows, levels[rows].astype(np.int64))
+            self._postings[post_code] = postings
+        return postings
+
+    def get_candidates(self, post_code: str) -> List[Tuple[int, int]]:
+        """具备该岗位技能的员工 [(员工行号, 技能等级)]（已排序）"""
+        rows, levels = self.get_postings(post_code)
+        return list(zip(rows.tolist(), levels.tolist()))
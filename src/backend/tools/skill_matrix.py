@@ -0,0 +1,119 @@
+"""
+技能矩阵模块
+以员工表、岗位表加 int8 等级矩阵的紧凑形式存储技能矩阵，支持按岗位等级的向量化查询
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from models import SkillMatrixData
+
+# int8 可表示的最大技能等级
+MAX_SKILL_LEVEL = 127
+
+
+class SkillMatrix:
+    """数组存储的技能矩阵
+
+    levels[i, j] 为第 i 名员工在第 j 个岗位上的技能等级（0 表示不具备该技能）。
+    兼容 List[SkillMatrixData] 的只读用法：支持 len()、下标访问和迭代，按需生成行对象。
+    """
+
+    def __init__(
+        self,
+        worker_ids: List[str],
+        names: List[str],
+        teams: List[Optional[str]],
+        position_codes: List[str],
+        levels: np.ndarray
+    ):
+        self.worker_ids = worker_ids
+        self.names = names
+        self.teams = teams
+        self.position_codes = position_codes
+        self.levels = np.clip(levels, 0, MAX_SKILL_LEVEL).astype(np.int8).reshape(
+            len(worker_ids), len(position_codes)
+        )
+        self.position_lookup: Dict[str, int] = {code: j for j, code in enumerate(position_codes)}
+        # 工号 -> 行号（工号重复时以第一条记录为准）
+        self.worker_lookup: Dict[str, int] = {}
+        for i, worker_id in enumerate(worker_ids):
+            self.worker_lookup.setdefault(worker_id, i)
+
+    @classmethod
+    def from_records(cls, records: Sequence[SkillMatrixData]) -> "SkillMatrix":
+        """由逐行的技能记录构建"""
+        if isinstance(records, SkillMatrix):
+            return records
+
+        position_codes: List[str] = []
+        position_lookup: Dict[str, int] = {}
+        for record in records:
+            for code in record.skills:
+                if code not in position_lookup:
+                    position_lookup[code] = len(position_codes)
+                    position_codes.append(code)
+
+        levels = np.zeros((len(records), len(position_codes)), dtype=np.int16)
+        for i, record in enumerate(records):
+            for code, level in record.skills.items():
+                if isinstance(level, int):
+                    levels[i, position_lookup[code]] = min(max(level, 0), MAX_SKILL_LEVEL)
+
+        return cls(
+            worker_ids=[r.工号 for r in records],
+            names=[r.姓名 for r in records],
+            teams=[r.班组 for r in records],
+            position_codes=position_codes,
+            levels=levels
+        )
+
+    def __len__(self) -> int:
+        return len(self.worker_ids)
+
+    def __getitem__(self, i: int) -> SkillMatrixData:
+        return SkillMatrixData(
+            姓名=self.names[i],
+            工号=self.worker_ids[i],
+            班组=self.teams[i],
+            skills=dict(zip(self.position_codes, self.levels[i].tolist()))
+        )
+
+    def __iter__(self) -> Iterator[SkillMatrixData]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def nbytes(self) -> int:
+        """等级矩阵占用字节数"""
+        return self.levels.nbytes
+
+    def position_levels(self, post_code: str) -> np.ndarray:
+        """某岗位上全部员工的技能等级（岗位不存在时全为0）"""
+        j = self.position_lookup.get(post_code)
+        if j is None:
+            return np.zeros(len(self), dtype=np.int8)
+        return self.levels[:, j]
+
+    def qualified_mask(self, post_code: str, min_level: int = 1) -> np.ndarray:
+        """能胜任某岗位（等级 >= min_level）的员工掩码"""
+        return self.position_levels(post_code) >= max(min_level, 1)
+
+    def qualified_workers(self, post_code: str, min_level: int = 1) -> List[str]:
+        """能胜任某岗位（等级 >= min_level）的员工工号"""
+        return [self.worker_ids[i] for i in np.flatnonzero(self.qualified_mask(post_code, min_level))]
+
+    def get_level(self, worker_id: str, post_code: str) -> int:
+        """员工在某岗位上的技能等级"""
+        i = self.worker_lookup.get(worker_id)
+        j = self.position_lookup.get(post_code)
+        if i is None or j is None:
+            return 0
+        return int(self.levels[i, j])
+
+    def worker_profile(self, i: int, min_level: int = 1) -> Dict[str, int]:
+        """员工在各岗位上达到 min_level 的技能等级（岗位编码 -> 等级）"""
+        row = self.levels[i]
+        columns = np.flatnonzero(row >= max(min_level, 1))
+        return {self.position_codes[j]: int(row[j]) for j in columns}
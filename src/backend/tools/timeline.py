@@ -0,0 +1,96 @@
+"""
+时间轴模块
+以秒为单位维护工作中心的空闲时间窗口（有序、互不重叠），
+用二分查找在对数时间内回答“某时刻之后第一个空闲窗口”的查询，并支持占用任意时间段
+"""
+
+import bisect
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+# 每个工作日的开班时间（距当日零点的秒数）
+SHIFT_START_SECONDS = 8 * 3600
+DAY_SECONDS = 24 * 3600
+
+
+class FreeTimeline:
+    """空闲时间窗口集合，时间为距时间轴起点的秒数，窗口为左闭右开区间"""
+
+    def __init__(self, windows: List[Tuple[int, int]]):
+        windows = sorted((s, e) for s, e in windows if e > s)
+        self._starts: List[int] = [s for s, _ in windows]
+        self._ends: List[int] = [e for _, e in windows]
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def free_seconds(self) -> int:
+        """剩余空闲总时长"""
+        return sum(e - s for s, e in zip(self._starts, self._ends))
+
+    def find_free(self, earliest: int, min_length: int = 1) -> Optional[Tuple[int, int]]:
+        """earliest 之后（含）第一个长度不小于 min_length 的空闲时间段"""
+        i = max(bisect.bisect_right(self._starts, earliest) - 1, 0)
+        while i < len(self._starts):
+            start = max(self._starts[i], earliest)
+            if self._ends[i] - start >= min_length:
+                return start, self._ends[i]
+            i += 1
+        return None
+
+    def reserve(self, start: int, end: int):
+        """占用 [start, end)，该时间段必须完全处于某个空闲窗口内"""
+        i = bisect.bisect_right(self._starts, start) - 1
+        if i < 0 or end > self._ends[i] or start >= end:
+            raise ValueError(f"时间段 [{start}, {end}) 不在空闲窗口内")
+
+        window_start, window_end = self._starts[i], self._ends[i]
+        del self._starts[i], self._ends[i]
+        if end < window_end:
+            self._starts.insert(i, end)
+            self._ends.insert(i, window_end)
+        if window_start < start:
+            self._starts.insert(i, window_start)
+            self._ends.insert(i, start)
+
+
+class DayCalendar:
+    """工作日历：把日期和产能档位换算为时间轴上的每日工作窗口
+
+    每天从开班时间起连续工作 产能 × 节拍 秒（即该产能档位下排满的生产时长）。
+    """
+
+    def __init__(self, daily_capacities: Dict[str, int], takt_seconds: Dict[int, float]):
+        self.dates: List[str] = sorted(daily_capacities)
+        self.origin = datetime.strptime(self.dates[0], "%Y-%m-%d") if self.dates else datetime(1970, 1, 1)
+        self.windows: List[Tuple[int, int]] = []
+        self.takt: Dict[int, float] = {}  # 日偏移 -> 当天节拍（秒/台）
+        self.day_dates: Dict[int, str] = {}
+
+        for date in self.dates:
+            capacity = daily_capacities[date]
+            day = (datetime.strptime(date, "%Y-%m-%d") - self.origin).days
+            takt = takt_seconds[capacity]
+            start = day * DAY_SECONDS + SHIFT_START_SECONDS
+            self.windows.append((start, start + int(round(capacity * takt))))
+            self.takt[day] = takt
+            self.day_dates[day] = date
+
+    def timeline(self) -> FreeTimeline:
+        """新建一条空闲时间轴"""
+        return FreeTimeline(self.windows)
+
+    def available_seconds(self) -> int:
+        return sum(e - s for s, e in self.windows)
+
+    def day_of(self, seconds: int) -> int:
+        """时间点所属工作日的日偏移（工作窗口从开班时间起算，可能跨过零点）"""
+        return (seconds - SHIFT_START_SECONDS) // DAY_SECONDS
+
+    def to_datetime(self, seconds: int) -> datetime:
+        return self.origin + timedelta(seconds=seconds)
+
+    def clock(self, seconds: int) -> str:
+        """时间轴秒数 -> 所属工作日的时刻 HH:MM（跨零点时按24小时以后计，如 25:30）"""
+        offset = seconds - self.day_of(seconds) * DAY_SECONDS
+        return f"{offset // 3600:02d}:{offset % 3600 // 60:02d}"
@@ -47,6 +47,7 @@ export interface SchedulingRequest {
   sku_data: any[][]
   position_data: any[][]
   skill_data: any[][]
+  dataset_id?: string
   weekly_assigned_workers?: string[]
 }
 
@@ -62,6 +63,7 @@ export interface WeeklySchedulingRequest {
   sku_data: any[][]
   position_data: any[][]
   skill_data: any[][]
+  dataset_id?: string
 }
 
 export interface WeeklySchedulingResponse {